@@ -0,0 +1,86 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Benchmark for the registered-domain index.
+
+Builds an index of synthetic domains and measures build time, file size and
+lookup latency for registered and unregistered names:
+
+    python benchmarks/domain_index_benchmark.py --entries 10000000
+"""
+
+import argparse
+import os
+import random
+import string
+import tempfile
+import time
+
+from marketing_agency.sub_agents.domain_create.index import DomainIndex, build_index
+
+TLDS = ("com", "net", "org", "io", "co", "app", "shop")
+
+
+def synthetic_domains(count: int, seed: int) -> list[str]:
+    rng = random.Random(seed)
+    letters = string.ascii_lowercase
+    return [
+        "".join(rng.choices(letters, k=rng.randint(4, 14))) + "." + rng.choice(TLDS)
+        for _ in range(count)
+    ]
+
+
+def time_lookups(index: DomainIndex, domains: list[str]) -> tuple[float, int]:
+    start = time.perf_counter()
+    found = sum(domain in index for domain in domains)
+    return (time.perf_counter() - start) / len(domains), found
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entries", type=int, default=10_000_000)
+    parser.add_argument("--lookups", type=int, default=100_000)
+    parser.add_argument("--false-positive-rate", type=float, default=0.01)
+    args = parser.parse_args()
+
+    print(f"Generating {args.entries:,} registered domains...")
+    registered = synthetic_domains(args.entries, seed=1)
+    fresh = [f"zz{name}" for name in synthetic_domains(args.lookups, seed=2)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "registered.idx")
+        start = time.perf_counter()
+        size = build_index(registered, path, args.false_positive_rate)
+        build_seconds = time.perf_counter() - start
+
+        with DomainIndex(path) as index:
+            sample_size = min(args.lookups, len(registered))
+            hits = random.Random(3).sample(registered, sample_size)
+            hit_latency, found = time_lookups(index, hits)
+            index.table_lookups = 0
+            miss_latency, _ = time_lookups(index, fresh)
+            bloom_false_positives = index.table_lookups / len(fresh)
+
+            print(f"Entries:             {len(index):,}")
+            print(f"Build time:          {build_seconds:.1f} s")
+            print(f"Index size:          {size / 2**20:.1f} MiB "
+                  f"({size / len(index):.1f} bytes/entry)")
+            print(f"Registered lookup:   {hit_latency * 1e6:.2f} us "
+                  f"({found}/{len(hits)} found)")
+            print(f"Unregistered lookup: {miss_latency * 1e6:.2f} us "
+                  f"({bloom_false_positives:.3%} Bloom false positives)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Cold-start import cost report, based on ``python -X importtime``.
+
+Imports each module in a fresh interpreter without credentials (unless
+``--inherit-env`` is given) and prints its cumulative import time and the
+slowest packages it pulls in. With ``--compare REV`` the same is measured on
+a git revision, e.g. to see the effect of a change:
+
+    python benchmarks/import_time_report.py --compare HEAD~1 --inherit-env
+"""
+
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tarfile
+import tempfile
+from collections import defaultdict
+from pathlib import Path
+from typing import Optional
+
+ROOT = Path(__file__).resolve().parent.parent
+MODULES = ("marketing_agency", "marketing_agency.agent")
+_LINE_RE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def import_times(
+    module: str, path: Path, inherit_env: bool = False
+) -> Optional[list[tuple[int, int, str]]]:
+    """(self us, cumulative us, name) of every module imported, or None."""
+    env = dict(os.environ) if inherit_env else {"PATH": os.environ.get("PATH", "")}
+    env["PYTHONPATH"] = str(path)
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        env=env,
+        cwd=path,
+        check=False,
+    )
+    if result.returncode:
+        return None
+    return [
+        (int(match[1]), int(match[2]), match[4])
+        for match in map(_LINE_RE.match, result.stderr.splitlines())
+        if match
+    ]
+
+
+def report(path: Path, label: str, args: argparse.Namespace) -> None:
+    print(f"== {label}")
+    for module in MODULES:
+        runs = [
+            import_times(module, path, args.inherit_env)
+            for _ in range(args.repeat)
+        ]
+        if any(run is None for run in runs):
+            print(f"{module:<28} import fails")
+            continue
+        total = statistics.median(
+            next(cumulative for _, cumulative, name in run if name == module)
+            for run in runs
+        )
+        by_package = defaultdict(int)
+        for self_us, _, name in runs[0]:
+            by_package[name.split(".")[0]] += self_us
+        print(f"{module:<28} {total / 1000:8.1f} ms")
+        for package, self_us in sorted(
+            by_package.items(), key=lambda item: -item[1]
+        )[: args.top]:
+            print(f"    {package:<24} {self_us / 1000:8.1f} ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--compare", metavar="REV")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=5)
+    parser.add_argument(
+        "--inherit-env",
+        action="store_true",
+        help="keep the current environment, e.g. credentials",
+    )
+    args = parser.parse_args()
+
+    if args.compare:
+        with tempfile.TemporaryDirectory() as tmp:
+            archive = Path(tmp) / "rev.tar"
+            subprocess.run(
+                ["git", "archive", "-o", str(archive), args.compare],
+                cwd=ROOT,
+                check=True,
+            )
+            with tarfile.open(archive) as tar:
+                tar.extractall(Path(tmp) / "tree")
+            report(Path(tmp) / "tree", args.compare, args)
+    report(ROOT, "working tree", args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,239 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Benchmark of per-agent model tiering against an all-Pro setup.
+
+Sends a sample workload for every agent through the model registry and
+reports latency and cost per agent, both for the configured tiers and with
+every agent on Pro. By default the models are simulated from list prices
+and estimated latency profiles, so routing and escalation rates and costs
+are exact while latencies are only estimates; ``--live`` calls Gemini
+instead:
+
+    python benchmarks/model_tiering_benchmark.py
+    python benchmarks/model_tiering_benchmark.py --live --repeat 3
+"""
+
+import argparse
+import asyncio
+import hashlib
+import time
+from collections import defaultdict
+from typing import AsyncGenerator
+
+from google.adk.models import BaseLlm, Gemini, LlmRequest, LlmResponse
+from google.genai import types
+
+from marketing_agency import prompt as coordinator_prompt
+from marketing_agency.shared_libraries import model_registry
+from marketing_agency.shared_libraries.context_cache import estimate_tokens
+from marketing_agency.sub_agents.domain_create import prompt as domain_prompt
+from marketing_agency.sub_agents.logo_create import prompt as logo_prompt
+from marketing_agency.sub_agents.marketing_create import prompt as marketing_prompt
+from marketing_agency.sub_agents.website_create import prompt as website_prompt
+
+# Seconds to first token, prefill seconds per 1k input tokens, output tokens
+# per second. These are rough estimates, not measurements: simulated
+# latencies only show the relative effect of routing; use --live for real
+# numbers.
+LATENCY_PROFILES = {
+    model_registry.PRO: (2.0, 0.05, 80.0),
+    model_registry.FLASH: (0.5, 0.02, 250.0),
+}
+
+BRIEFS = [
+    "Brew & Bean, a coffee shop in Zurich",
+    "Alps Bike Tours, guided mountain bike tours for families",
+    "A bakery selling sourdough bread and custom cakes",
+    "A comprehensive multi-channel marketing strategy with a budget split and "
+    "competitor analysis for a Zurich artisan bakery opening a second shop",
+]
+
+# (instruction, requests, output tokens) per agent.
+WORKLOAD = {
+    "marketing_coordinator": (
+        coordinator_prompt.MARKETING_COORDINATOR_PROMPT,
+        ["Hi, I want to launch my business online", *BRIEFS],
+        150,
+    ),
+    "domain_create_agent": (domain_prompt.DOMAIN_CREATE_PROMPT, BRIEFS, 300),
+    "logo_create_agent": (logo_prompt.LOGO_CREATE_PROMPT, BRIEFS, 80),
+    "marketing_create_agent": (
+        marketing_prompt.MARKETING_CREATE_PROMPT,
+        BRIEFS,
+        1500,
+    ),
+    "website_create_agent": (website_prompt.WEBSITE_CREATE_PROMPT, BRIEFS, 6000),
+}
+
+
+class Ledger:
+    def __init__(self):
+        self.seconds = 0.0
+        self.cost = 0.0
+
+
+class SimulatedLlm(BaseLlm):
+    """Answers instantly and books the latency the real model would have."""
+
+    tier: str
+    ledger: Ledger
+    output_tokens: int
+    failure_rate: float = 0.0
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        ttft, prefill, throughput = LATENCY_PROFILES[self.tier]
+        input_tokens = estimate_tokens(
+            str(llm_request.config.system_instruction)
+            + str(llm_request.contents)
+        )
+        digest = hashlib.sha256(str(llm_request.contents).encode()).digest()
+        failed = digest[0] / 256 < self.failure_rate
+        output_tokens = 0 if failed else self.output_tokens
+        self.ledger.seconds += (
+            ttft + prefill * input_tokens / 1000 + output_tokens / throughput
+        )
+        self.ledger.cost += model_registry.estimate_cost(
+            self.model, input_tokens, output_tokens
+        )
+        if failed:
+            yield LlmResponse(error_code="MAX_TOKENS")
+            return
+        yield LlmResponse(
+            content=types.Content(role="model", parts=[types.Part(text="ok")])
+        )
+
+
+class MeteredLlm(BaseLlm):
+    """Wraps a live model and books wall time and billed tokens."""
+
+    inner: BaseLlm
+    ledger: Ledger
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        start = time.perf_counter()
+        async for response in self.inner.generate_content_async(
+            llm_request, stream
+        ):
+            usage = response.usage_metadata
+            if usage and not response.partial:
+                self.ledger.cost += model_registry.estimate_cost(
+                    self.model,
+                    usage.prompt_token_count or 0,
+                    usage.candidates_token_count or 0,
+                )
+            yield response
+        self.ledger.seconds += time.perf_counter() - start
+
+
+def make_model(
+    tier: str, ledger: Ledger, output_tokens: int, args: argparse.Namespace
+) -> BaseLlm:
+    name = model_registry.tier_model(tier)
+    if args.live:
+        return MeteredLlm(model=name, inner=Gemini(model=name), ledger=ledger)
+    failure_rate = args.flash_failure_rate if tier == model_registry.FLASH else 0
+    return SimulatedLlm(
+        model=name,
+        tier=tier,
+        ledger=ledger,
+        output_tokens=output_tokens,
+        failure_rate=failure_rate,
+    )
+
+
+def agent_model(
+    tier: str, ledger: Ledger, output_tokens: int, args: argparse.Namespace
+) -> BaseLlm:
+    if tier != model_registry.AUTO:
+        return make_model(tier, ledger, output_tokens, args)
+    fast = make_model(model_registry.FLASH, ledger, output_tokens, args)
+    return model_registry.RoutedLlm(
+        model=fast.model,
+        fast=fast,
+        strong=make_model(model_registry.PRO, ledger, output_tokens, args),
+    )
+
+
+async def run_agent(
+    model: BaseLlm, instruction: str, requests: list[str], repeat: int
+) -> None:
+    for _ in range(repeat):
+        for text in requests:
+            llm_request = LlmRequest(
+                model=model.model,
+                contents=[types.UserContent(parts=[types.Part(text=text)])],
+                config=types.GenerateContentConfig(system_instruction=instruction),
+            )
+            async for _ in model.generate_content_async(llm_request):
+                pass
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--live", action="store_true")
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--flash-failure-rate", type=float, default=0.1)
+    args = parser.parse_args()
+
+    totals = defaultdict(float)
+    print(
+        f"{'agent':<24}{'tier':>6}{'pro s':>9}{'tiered s':>10}"
+        f"{'pro $':>9}{'tiered $':>10}{'escalated':>11}"
+    )
+    for agent_name, (instruction, requests, output_tokens) in WORKLOAD.items():
+        tier = model_registry.AGENT_TIERS[agent_name]
+        baseline, tiered = Ledger(), Ledger()
+        await run_agent(
+            make_model(model_registry.PRO, baseline, output_tokens, args),
+            instruction,
+            requests,
+            args.repeat,
+        )
+        model = agent_model(tier, tiered, output_tokens, args)
+        await run_agent(model, instruction, requests, args.repeat)
+        calls = args.repeat * len(requests)
+        escalated = (
+            model.stats().get("escalated", 0) / calls
+            if isinstance(model, model_registry.RoutedLlm)
+            else 0.0
+        )
+        print(
+            f"{agent_name:<24}{tier:>6}{baseline.seconds / calls:>9.2f}"
+            f"{tiered.seconds / calls:>10.2f}{baseline.cost / calls:>9.4f}"
+            f"{tiered.cost / calls:>10.4f}{escalated:>11.0%}"
+        )
+        totals["baseline_seconds"] += baseline.seconds
+        totals["tiered_seconds"] += tiered.seconds
+        totals["baseline_cost"] += baseline.cost
+        totals["tiered_cost"] += tiered.cost
+
+    print(
+        f"Total latency: {totals['baseline_seconds']:.1f} s -> "
+        f"{totals['tiered_seconds']:.1f} s "
+        f"({totals['tiered_seconds'] / totals['baseline_seconds'] - 1:+.0%})"
+    )
+    print(
+        f"Total cost:    ${totals['baseline_cost']:.3f} -> "
+        f"${totals['tiered_cost']:.3f} "
+        f"({totals['tiered_cost'] / totals['baseline_cost'] - 1:+.0%})"
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
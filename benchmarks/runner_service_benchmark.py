@@ -0,0 +1,115 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Micro-benchmark of per-request runner overhead, shared versus fresh.
+
+Runs one-shot requests against an agent whose model answers instantly, so
+the timings are pure framework overhead: either a new ``InMemoryRunner`` and
+session per request (as the scripts used to do) or the shared runner
+service, which still creates and deletes a session per request:
+
+    python benchmarks/runner_service_benchmark.py --requests 2000
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from typing import AsyncGenerator
+
+from google.adk.agents import LlmAgent
+from google.adk.models import BaseLlm, LlmRequest, LlmResponse
+from google.adk.runners import InMemoryRunner
+from google.genai import types
+
+from marketing_agency.runner_service import RunnerService
+
+
+class InstantLlm(BaseLlm):
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        yield LlmResponse(
+            content=types.Content(role="model", parts=[types.Part(text="ok")])
+        )
+
+
+def make_agent() -> LlmAgent:
+    return LlmAgent(
+        name="instant_agent", model=InstantLlm(model="instant"), instruction="Hi."
+    )
+
+
+def message(i: int) -> types.Content:
+    return types.UserContent(parts=[types.Part(text=f"request {i}")])
+
+
+async def fresh_runner(agent: LlmAgent, i: int) -> None:
+    runner = InMemoryRunner(agent=agent)
+    session = await runner.session_service.create_session(
+        app_name=runner.app_name, user_id="bench_user"
+    )
+    async for _ in runner.run_async(
+        user_id=session.user_id, session_id=session.id, new_message=message(i)
+    ):
+        pass
+
+
+async def measure(run, requests: int) -> list[float]:
+    timings = []
+    for i in range(requests):
+        start = time.perf_counter()
+        await run(i)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def summary(label: str, timings: list[float]) -> str:
+    timings = sorted(timings)
+    p95 = timings[int(len(timings) * 0.95)]
+    return (
+        f"{label:<10} mean {statistics.mean(timings) * 1e6:8.0f} us   "
+        f"p50 {statistics.median(timings) * 1e6:8.0f} us   p95 {p95 * 1e6:8.0f} us"
+    )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=1000)
+    args = parser.parse_args()
+
+    agent = make_agent()
+    service = RunnerService()
+
+    async def shared(i: int) -> None:
+        async for _ in service.run(agent, message(i)):
+            pass
+
+    # Warm up imports and caches before timing.
+    await measure(lambda i: fresh_runner(agent, i), 50)
+    await measure(shared, 50)
+
+    fresh = await measure(lambda i: fresh_runner(agent, i), args.requests)
+    reused = await measure(shared, args.requests)
+    print(summary("fresh", fresh))
+    print(summary("shared", reused))
+    saved = statistics.mean(fresh) - statistics.mean(reused)
+    print(
+        f"The shared runner saves {saved * 1e6:.0f} us per request "
+        f"({saved / statistics.mean(fresh):.0%})"
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,126 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Resident memory while sessions pile up, in memory versus SQLite.
+
+Every session runs turns of an agent that answers instantly with a website
+sized page stored under ``website_create_output``, and the sessions are kept,
+as on a busy server. Each session store is measured in its own interpreter,
+so the RSS figures do not mix:
+
+    python benchmarks/session_store_benchmark.py --sessions 10000
+"""
+
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from typing import AsyncGenerator
+
+from google.adk.agents import LlmAgent
+from google.adk.artifacts import InMemoryArtifactService
+from google.adk.models import BaseLlm, LlmRequest, LlmResponse
+from google.adk.runners import InMemoryRunner, Runner
+from google.genai import types
+
+from marketing_agency.sqlite_session_service import SqliteSessionService
+
+
+class WebsiteLlm(BaseLlm):
+    page_bytes: int = 30_000
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        html = "<html>" + "x" * self.page_bytes + "</html>"
+        yield LlmResponse(
+            content=types.Content(role="model", parts=[types.Part(text=html)])
+        )
+
+
+def rss_mb() -> float:
+    with open("/proc/self/statm", encoding="ascii") as statm:
+        pages = int(statm.read().split()[1])
+    return pages * os.sysconf("SC_PAGE_SIZE") / 2**20
+
+
+def make_runner(store: str, db_path: str, page_bytes: int) -> Runner:
+    agent = LlmAgent(
+        name="website_create_agent",
+        model=WebsiteLlm(model="instant", page_bytes=page_bytes),
+        instruction="Build the site.",
+        output_key="website_create_output",
+    )
+    if store == "memory":
+        return InMemoryRunner(agent=agent)
+    return Runner(
+        app_name="bench",
+        agent=agent,
+        session_service=SqliteSessionService(db_path),
+        artifact_service=InMemoryArtifactService(),
+    )
+
+
+async def measure(args: argparse.Namespace) -> None:
+    runner = make_runner(args.store, args.db, args.page_bytes)
+    step = max(1, args.sessions // 10)
+    start = time.perf_counter()
+    for i in range(1, args.sessions + 1):
+        session = await runner.session_service.create_session(
+            app_name=runner.app_name, user_id=f"user-{i % 100}"
+        )
+        for turn in range(args.turns):
+            async for _ in runner.run_async(
+                user_id=session.user_id,
+                session_id=session.id,
+                new_message=types.UserContent(
+                    parts=[types.Part(text=f"site {i} turn {turn}")]
+                ),
+            ):
+                pass
+        if i % step == 0:
+            print(f"{args.store:<7} {i:>7} sessions  {rss_mb():8.1f} MB", flush=True)
+    elapsed = time.perf_counter() - start
+    print(
+        f"{args.store:<7} {elapsed / args.sessions * 1e3:.2f} ms per session",
+        flush=True,
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=10_000)
+    parser.add_argument("--turns", type=int, default=2)
+    parser.add_argument("--page-bytes", type=int, default=30_000)
+    parser.add_argument("--store", choices=("memory", "sqlite"))
+    parser.add_argument("--db")
+    args = parser.parse_args()
+
+    if args.store:
+        asyncio.run(measure(args))
+        return
+    with tempfile.TemporaryDirectory() as tmp:
+        for store in ("memory", "sqlite"):
+            subprocess.run(
+                [sys.executable, __file__, *sys.argv[1:], "--store", store]
+                + ["--db", os.path.join(tmp, "sessions.db")],
+                check=True,
+            )
+
+
+if __name__ == "__main__":
+    main()
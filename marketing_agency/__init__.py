@@ -12,7 +12,18 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-"""Marketing_coordinator Agent assists in creating effective online content."""
+"""Marketing_coordinator Agent assists in creating effective online content.
 
+Importing the package is cheap: the agents, their ADK dependencies and API
+clients are only loaded when ``agent`` or ``root_agent`` is first accessed.
+"""
 
-from . import agent
+import importlib
+
+
+def __getattr__(name: str):
+    if name == "agent":
+        return importlib.import_module(".agent", __name__)
+    if name == "root_agent":
+        return importlib.import_module(".agent", __name__).root_agent
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -15,15 +15,58 @@
 """Marketing_coordinator Agent assists in creating effective online content."""
 
 from google.adk.agents import LlmAgent
-from google.adk.tools.agent_tool import AgentTool
+from google.adk.agents.readonly_context import ReadonlyContext
+from google.adk.agents.run_config import RunConfig, StreamingMode
 
 from . import prompt
+from .shared_libraries.cached_agent_tool import CachedAgentTool
+from .shared_libraries.context_cache import context_cache
+from .shared_libraries.handoff import BRIEF_KEY, SELECTED_DOMAIN_KEY, save_brief
+from .shared_libraries.history_window import HistoryWindow
+from .shared_libraries.model_registry import model_for
+from .shared_libraries.pass_through import PassThroughAgentTool
+from .shared_libraries.semantic_cache import SemanticIndex
+from .sub_agents.brand_package import brand_package_agent
+from .sub_agents.brand_package.agent import BRAND_PACKAGE_OUTPUT_KEY
 from .sub_agents.domain_create import domain_create_agent
 from .sub_agents.logo_create import logo_create_agent
 from .sub_agents.marketing_create import marketing_create_agent
 from .sub_agents.website_create import website_create_agent
 
-MODEL = "gemini-2.5-pro-preview-05-06" 
+MODEL = model_for("marketing_coordinator")
+
+# State keys each sub-agent gets from earlier steps along with its request.
+BRIEF_ONLY = (BRIEF_KEY,)
+BRIEF_AND_DOMAIN = (BRIEF_KEY, SELECTED_DOMAIN_KEY)
+
+# Sub-agents that write the website stream it, so its files are saved as they
+# are generated (see website_create/streaming.py).
+STREAMING = RunConfig(streaming_mode=StreamingMode.SSE)
+
+
+def coordinator_instruction(context: ReadonlyContext) -> str:
+    """The coordinator prompt, exempt from state templating.
+
+    Instruction providers are not templated, so the ``{key}`` references the
+    prompt teaches reach the model verbatim instead of being filled in.
+    """
+    return prompt.MARKETING_COORDINATOR_PROMPT
+
+
+history_window = HistoryWindow.from_env(
+    state_keys={
+        **{
+            agent.name: agent.output_key
+            for agent in (
+                domain_create_agent,
+                website_create_agent,
+                marketing_create_agent,
+                logo_create_agent,
+            )
+        },
+        brand_package_agent.name: BRAND_PACKAGE_OUTPUT_KEY,
+    }
+)
 
 marketing_coordinator = LlmAgent(
     name="marketing_coordinator",
@@ -35,12 +78,32 @@ marketing_coordinator = LlmAgent(
         "website, to strategizing online marketing campaigns, "
         "designing a memorable logo, and creating engaging short videos"
     ),
-    instruction=prompt.MARKETING_COORDINATOR_PROMPT,
+    instruction=coordinator_instruction,
+    before_model_callback=[history_window, context_cache.before_model],
+    after_model_callback=context_cache.after_model,
     tools=[
-        AgentTool(agent=domain_create_agent),
-        AgentTool(agent=website_create_agent),
-        AgentTool(agent=marketing_create_agent),
-        AgentTool(agent=logo_create_agent),
+        save_brief,
+        PassThroughAgentTool(agent=domain_create_agent, handoff_keys=BRIEF_ONLY),
+        CachedAgentTool(
+            agent=website_create_agent,
+            semantic_index=SemanticIndex.from_env(),
+            handoff_keys=BRIEF_AND_DOMAIN,
+            run_config=STREAMING,
+        ),
+        CachedAgentTool(
+            agent=marketing_create_agent,
+            semantic_index=SemanticIndex.from_env(),
+            handoff_keys=BRIEF_AND_DOMAIN,
+        ),
+        PassThroughAgentTool(
+            agent=logo_create_agent, handoff_keys=BRIEF_AND_DOMAIN
+        ),
+        PassThroughAgentTool(
+            agent=brand_package_agent,
+            state_key=BRAND_PACKAGE_OUTPUT_KEY,
+            handoff_keys=BRIEF_ONLY,
+            run_config=STREAMING,
+        ),
     ],
 )
 
@@ -0,0 +1,231 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Concurrent batch runs of independent requests from a JSONL file.
+
+Every input line is one request, run on a one-shot session of a shared runner.
+Results are appended to the output file as they finish, so an interrupted
+run can be resumed: requests that already have an ``ok`` result are
+skipped, failed ones are retried.
+"""
+
+import asyncio
+import json
+import logging
+import time
+from pathlib import Path
+from typing import Any, Iterator, Optional
+
+from google.adk.agents import BaseAgent
+from google.adk.runners import InMemoryRunner, Runner
+from google.adk.sessions import Session
+from google.genai.types import Part, UserContent
+
+from .runner_service import one_shot_session
+from .shared_libraries.pass_through import delivered_outputs
+
+logger = logging.getLogger(__name__)
+
+BATCH_USER_PREFIX = "batch"
+
+
+def request_id(record: dict[str, Any], line_number: int) -> str:
+    for field in ("id", "request_id"):
+        if record.get(field) is not None:
+            return str(record[field])
+    return f"line-{line_number}"
+
+
+def request_text(record: dict[str, Any]) -> str:
+    """The prompt of a record: ``request``/``text``/``prompt`` or title+body."""
+    for field in ("request", "text", "prompt"):
+        if record.get(field):
+            return str(record[field])
+    parts = [record.get("title"), record.get("body")]
+    text = "\n\n".join(str(part) for part in parts if part)
+    if not text:
+        raise ValueError("record has no request text")
+    return text
+
+
+def read_requests(path: Path) -> Iterator[tuple[str, dict[str, Any]]]:
+    with open(path, encoding="utf-8") as input_file:
+        for line_number, line in enumerate(input_file, 1):
+            if line.strip():
+                record = json.loads(line)
+                yield request_id(record, line_number), record
+
+
+def _ends_with_newline(path: Path) -> bool:
+    if not path.exists() or not path.stat().st_size:
+        return True
+    with open(path, "rb") as output_file:
+        output_file.seek(-1, 2)
+        return output_file.read(1) == b"\n"
+
+
+def completed_ids(path: Path) -> set[str]:
+    """Ids with an ``ok`` result; a torn last line from a crash is ignored."""
+    done = set()
+    if not path.exists():
+        return done
+    with open(path, encoding="utf-8") as output_file:
+        for line in output_file:
+            try:
+                result = json.loads(line)
+            except ValueError:
+                continue
+            if result.get("status") == "ok":
+                done.add(result["id"])
+    return done
+
+
+def _add_usage(tokens: dict[str, int], usage: Any) -> None:
+    tokens["prompt"] += usage.prompt_token_count or 0
+    tokens["candidates"] += usage.candidates_token_count or 0
+    tokens["total"] += usage.total_token_count or 0
+
+
+async def run_request(
+    runner: Runner,
+    rid: str,
+    text: str,
+    artifacts_dir: Optional[Path] = None,
+) -> dict[str, Any]:
+    """Runs one request on a clean session and returns its result record."""
+    result: dict[str, Any] = {"id": rid}
+    tokens = {"prompt": 0, "candidates": 0, "total": 0}
+    start = time.perf_counter()
+    try:
+        # The session is deleted with its artifacts afterwards, so overnight
+        # batches do not grow without bound.
+        async with one_shot_session(runner, BATCH_USER_PREFIX) as session:
+            result.update(
+                await _run(runner, session, text, tokens),
+                artifacts=await _export_artifacts(
+                    runner, session, rid, artifacts_dir
+                ),
+            )
+    except Exception as e:  # pylint: disable=broad-exception-caught
+        result.update(status="error", error=f"{type(e).__name__}: {e}")
+    result["latency_s"] = round(time.perf_counter() - start, 3)
+    result["tokens"] = tokens
+    return result
+
+
+async def _run(
+    runner: Runner, session: Session, text: str, tokens: dict[str, int]
+) -> dict[str, Any]:
+    response = ""
+    outputs: dict[str, str] = {}
+    async for event in runner.run_async(
+        user_id=session.user_id,
+        session_id=session.id,
+        new_message=UserContent(parts=[Part(text=text)]),
+    ):
+        if event.usage_metadata and not event.partial:
+            _add_usage(tokens, event.usage_metadata)
+        # Large sub-agent outputs reach the client only through these.
+        outputs.update(delivered_outputs(event))
+        if (
+            not event.partial
+            and event.content
+            and event.content.parts
+            and event.content.parts[0].text
+        ):
+            response = event.content.parts[0].text
+    result = {"status": "ok", "response": response}
+    if outputs:
+        result["outputs"] = outputs
+    return result
+
+
+async def _export_artifacts(
+    runner: Runner, session: Session, rid: str, artifacts_dir: Optional[Path]
+) -> list[str]:
+    service = runner.artifact_service
+    if service is None:
+        return []
+    names = await service.list_artifact_keys(
+        app_name=session.app_name, user_id=session.user_id, session_id=session.id
+    )
+    if artifacts_dir is None:
+        return names
+    for name in names:
+        part = await service.load_artifact(
+            app_name=session.app_name,
+            user_id=session.user_id,
+            session_id=session.id,
+            filename=name,
+        )
+        safe = ".." not in Path(name).parts
+        if part is not None and part.inline_data and safe:
+            path = artifacts_dir / rid / name
+            path.parent.mkdir(parents=True, exist_ok=True)
+            await asyncio.to_thread(path.write_bytes, part.inline_data.data)
+    return names
+
+
+async def run_batch(
+    agent: BaseAgent,
+    input_path: Path,
+    output_path: Path,
+    concurrency: int = 4,
+    artifacts_dir: Optional[Path] = None,
+    runner: Optional[Runner] = None,
+) -> dict[str, int]:
+    """Runs every pending request of ``input_path``; returns status counts."""
+    runner = runner or InMemoryRunner(agent=agent)
+    done = completed_ids(output_path)
+    pending = [
+        (rid, record)
+        for rid, record in read_requests(input_path)
+        if rid not in done
+    ]
+    counts = {"skipped": len(done), "ok": 0, "error": 0}
+    queue: asyncio.Queue = asyncio.Queue()
+    for item in pending:
+        queue.put_nowait(item)
+
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    torn = not _ends_with_newline(output_path)
+    with open(output_path, "a", encoding="utf-8") as output_file:
+        if torn:
+            # Terminate the line an earlier crash left half-written.
+            output_file.write("\n")
+
+        async def worker() -> None:
+            while not queue.empty():
+                rid, record = queue.get_nowait()
+                try:
+                    text = request_text(record)
+                except ValueError as e:
+                    result = {"id": rid, "status": "error", "error": str(e)}
+                else:
+                    result = await run_request(runner, rid, text, artifacts_dir)
+                output_file.write(json.dumps(result, ensure_ascii=False) + "\n")
+                output_file.flush()
+                counts[result["status"]] += 1
+                finished = counts["ok"] + counts["error"]
+                logger.info(
+                    "[%d/%d] %s: %s in %.1fs",
+                    finished,
+                    len(pending),
+                    rid,
+                    result["status"],
+                    result.get("latency_s", 0),
+                )
+
+        await asyncio.gather(*(worker() for _ in range(max(1, concurrency))))
+    return counts
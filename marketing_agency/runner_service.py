@@ -0,0 +1,123 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Long-lived runners for one-shot requests.
+
+``RunnerService`` keeps one runner per agent tree instead of building one per
+request. Every request still runs in a session of its own, created for a
+user id of its own so that no ``user:`` state is shared between requests;
+the session and its artifacts are deleted once the request is done.
+"""
+
+import uuid
+from contextlib import asynccontextmanager
+from typing import AsyncGenerator, Callable
+
+from google.adk.agents import BaseAgent
+from google.adk.artifacts import InMemoryArtifactService
+from google.adk.events import Event
+from google.adk.runners import InMemoryRunner, Runner
+from google.adk.sessions import InMemorySessionService, Session
+from google.genai import types
+
+from .sqlite_session_service import SqliteSessionService
+
+ONE_SHOT_USER_PREFIX = "oneshot"
+
+
+async def delete_session(runner: Runner, session: Session) -> None:
+    """Deletes ``session`` and every artifact saved under it."""
+    service = runner.artifact_service
+    if service is not None:
+        names = await service.list_artifact_keys(
+            app_name=session.app_name, user_id=session.user_id, session_id=session.id
+        )
+        for name in names:
+            await service.delete_artifact(
+                app_name=session.app_name,
+                user_id=session.user_id,
+                session_id=session.id,
+                filename=name,
+            )
+    service = runner.session_service
+    await service.delete_session(
+        app_name=session.app_name, user_id=session.user_id, session_id=session.id
+    )
+    if isinstance(service, InMemorySessionService):
+        # ADK keeps an empty dict per user id, and every request has its own.
+        users = service.sessions.get(session.app_name, {})
+        if not users.get(session.user_id, True):
+            del users[session.user_id]
+        service.user_state.get(session.app_name, {}).pop(session.user_id, None)
+
+
+@asynccontextmanager
+async def one_shot_session(
+    runner: Runner, user_prefix: str = ONE_SHOT_USER_PREFIX
+) -> AsyncGenerator[Session, None]:
+    """A new session of a new user, deleted with its artifacts on exit."""
+    session = await runner.session_service.create_session(
+        app_name=runner.app_name, user_id=f"{user_prefix}-{uuid.uuid4().hex}"
+    )
+    try:
+        yield session
+    finally:
+        await delete_session(runner, session)
+
+
+def make_runner(agent: BaseAgent) -> Runner:
+    """A runner on SQLite sessions when ``SESSION_DB_PATH`` is set."""
+    session_service = SqliteSessionService.from_env()
+    if session_service is None:
+        return InMemoryRunner(agent=agent)
+    return Runner(
+        app_name=agent.name,
+        agent=agent,
+        session_service=session_service,
+        artifact_service=InMemoryArtifactService(),
+    )
+
+
+class RunnerService:
+    """One runner per agent tree, shared by all callers."""
+
+    def __init__(self, runner_factory: Callable[[BaseAgent], Runner] = make_runner):
+        self.runner_factory = runner_factory
+        self._runners: dict[int, Runner] = {}
+
+    def runner_for(self, agent: BaseAgent) -> Runner:
+        runner = self._runners.get(id(agent))
+        if runner is None:
+            runner = self._runners[id(agent)] = self.runner_factory(agent)
+        return runner
+
+    async def run(
+        self,
+        agent: BaseAgent,
+        new_message: types.Content,
+        **run_kwargs,
+    ) -> AsyncGenerator[Event, None]:
+        """Runs ``new_message`` on a one-shot session of ``agent``'s runner."""
+        runner = self.runner_for(agent)
+        async with one_shot_session(runner) as session:
+            async for event in runner.run_async(
+                user_id=session.user_id,
+                session_id=session.id,
+                new_message=new_message,
+                **run_kwargs,
+            ):
+                yield event
+
+
+runner_service = RunnerService()
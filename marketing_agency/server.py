@@ -0,0 +1,389 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""HTTP front-end that streams runner events as Server-Sent Events.
+
+Admission is bounded: at most ``max_concurrency`` runs at once and
+``per_user`` per user, with up to ``queue_size`` requests waiting for a
+slot. Anything beyond that is answered with 429 and a ``Retry-After``
+estimate. On SIGINT/SIGTERM the server keeps listening while running requests
+finish, answering new ones with 503, and only then shuts down (a second
+signal skips the drain):
+
+    python -m marketing_agency.server --port 8080 --max-concurrency 16
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import math
+import os
+import time
+import weakref
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from typing import AsyncGenerator, Optional
+
+from fastapi import FastAPI, HTTPException
+from fastapi.responses import JSONResponse, StreamingResponse
+from starlette.types import Receive, Scope, Send
+from google.adk.agents import BaseAgent
+from google.adk.agents.run_config import RunConfig, StreamingMode
+from google.adk.runners import Runner
+from google.genai import types
+from pydantic import BaseModel
+
+from .runner_service import make_runner
+from .sqlite_session_service import SqliteSessionService
+
+logger = logging.getLogger(__name__)
+
+
+class Rejected(Exception):
+    """A request that cannot be admitted now."""
+
+    def __init__(self, status_code: int, detail: str, retry_after: int):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    """Global and per-user concurrency caps in front of a bounded queue."""
+
+    def __init__(
+        self,
+        max_concurrency: int = 16,
+        per_user: int = 2,
+        queue_size: int = 64,
+        queue_timeout: float = 30.0,
+    ):
+        self.max_concurrency = max_concurrency
+        self.per_user = per_user
+        self.queue_size = queue_size
+        self.queue_timeout = queue_timeout
+        self.in_flight = 0
+        self.queued = 0
+        self.draining = False
+        self.rejected = 0
+        self._per_user: defaultdict[str, int] = defaultdict(int)
+        # One condition per event loop, created on first use: on Python 3.9
+        # a condition binds to the loop current at construction, and the
+        # controller is usually built before uvicorn starts its loop.
+        self._conditions: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+        # Moving average of run durations, for Retry-After estimates.
+        self._avg_seconds = 10.0
+
+    @property
+    def _changed(self) -> asyncio.Condition:
+        loop = asyncio.get_running_loop()
+        condition = self._conditions.get(loop)
+        if condition is None:
+            condition = self._conditions[loop] = asyncio.Condition()
+        return condition
+
+    def retry_after(self) -> int:
+        waves = (self.queued + self.in_flight) / self.max_concurrency
+        return max(1, math.ceil(waves * self._avg_seconds))
+
+    def _has_slot(self, user_id: str) -> bool:
+        return (
+            self.in_flight < self.max_concurrency
+            and self._per_user[user_id] < self.per_user
+        )
+
+    def _reject(self, status_code: int, detail: str) -> Rejected:
+        self.rejected += 1
+        return Rejected(status_code, detail, self.retry_after())
+
+    async def acquire(self, user_id: str) -> None:
+        """Waits for a slot, or raises ``Rejected`` if that is not possible."""
+        async with self._changed:
+            if self.draining:
+                raise self._reject(503, "Server is shutting down")
+            if not self._has_slot(user_id):
+                if self.queued >= self.queue_size:
+                    raise self._reject(429, "Too many queued requests")
+                self.queued += 1
+                try:
+                    await asyncio.wait_for(
+                        self._changed.wait_for(
+                            lambda: self.draining or self._has_slot(user_id)
+                        ),
+                        self.queue_timeout,
+                    )
+                except asyncio.TimeoutError:
+                    raise self._reject(429, "Timed out waiting for a slot") from None
+                finally:
+                    self.queued -= 1
+                if self.draining:
+                    raise self._reject(503, "Server is shutting down")
+            self.in_flight += 1
+            self._per_user[user_id] += 1
+
+    async def release(self, user_id: str, seconds: float) -> None:
+        async with self._changed:
+            self.in_flight -= 1
+            self._per_user[user_id] -= 1
+            if not self._per_user[user_id]:
+                del self._per_user[user_id]
+            self._avg_seconds = 0.8 * self._avg_seconds + 0.2 * seconds
+            self._changed.notify_all()
+
+    async def drain(self, timeout: float) -> bool:
+        """Rejects new requests and waits for running ones to finish."""
+        async with self._changed:
+            self.draining = True
+            self._changed.notify_all()
+            try:
+                await asyncio.wait_for(
+                    self._changed.wait_for(lambda: not self.in_flight), timeout
+                )
+            except asyncio.TimeoutError:
+                logger.warning("Drain timed out with %d runs left", self.in_flight)
+                return False
+        return True
+
+    def stats(self) -> dict[str, object]:
+        return {
+            "in_flight": self.in_flight,
+            "queued": self.queued,
+            "rejected": self.rejected,
+            "draining": self.draining,
+        }
+
+
+class _Lease:
+    """An admission slot that is released exactly once."""
+
+    def __init__(self, admission: AdmissionController, user_id: str):
+        self.admission = admission
+        self.user_id = user_id
+        self.started = time.perf_counter()
+        self.released = False
+
+    async def release(self) -> None:
+        if not self.released:
+            self.released = True
+            await self.admission.release(
+                self.user_id, time.perf_counter() - self.started
+            )
+
+
+class _LeasedStreamingResponse(StreamingResponse):
+    """Releases its lease however the response ends.
+
+    The generator's own ``finally`` does not run if the client disconnects
+    before the first chunk is requested, so the release happens here.
+    """
+
+    def __init__(self, content, lease: _Lease, **kwargs):
+        super().__init__(content, **kwargs)
+        self.lease = lease
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            try:
+                await self.body_iterator.aclose()
+            finally:
+                await self.lease.release()
+
+
+class RunRequest(BaseModel):
+    user_id: str
+    message: str
+    session_id: Optional[str] = None
+    streaming: bool = True
+
+
+def create_app(
+    agent: BaseAgent,
+    runner: Optional[Runner] = None,
+    admission: Optional[AdmissionController] = None,
+    drain_timeout: float = 60.0,
+) -> FastAPI:
+    runner = runner or make_runner(agent)
+    admission = admission or AdmissionController()
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        yield
+        await admission.drain(drain_timeout)
+        if isinstance(runner.session_service, SqliteSessionService):
+            runner.session_service.flush()
+
+    app = FastAPI(lifespan=lifespan)
+    app.state.admission = admission
+    app.state.runner = runner
+
+    @app.get("/healthz")
+    async def healthz() -> JSONResponse:
+        status_code = 503 if admission.draining else 200
+        return JSONResponse(admission.stats(), status_code=status_code)
+
+    @app.post("/run_sse")
+    async def run_sse(req: RunRequest) -> StreamingResponse:
+        if req.session_id:
+            session = await runner.session_service.get_session(
+                app_name=runner.app_name,
+                user_id=req.user_id,
+                session_id=req.session_id,
+            )
+            if not session:
+                raise HTTPException(status_code=404, detail="Session not found")
+        try:
+            await admission.acquire(req.user_id)
+        except Rejected as e:
+            return JSONResponse(
+                {"detail": e.detail},
+                status_code=e.status_code,
+                headers={"Retry-After": str(e.retry_after)},
+            )
+        lease = _Lease(admission, req.user_id)
+        try:
+            if not req.session_id:
+                session = await runner.session_service.create_session(
+                    app_name=runner.app_name, user_id=req.user_id
+                )
+        except BaseException:
+            await lease.release()
+            raise
+
+        async def event_stream() -> AsyncGenerator[str, None]:
+            try:
+                stream_mode = (
+                    StreamingMode.SSE if req.streaming else StreamingMode.NONE
+                )
+                async for event in runner.run_async(
+                    user_id=req.user_id,
+                    session_id=session.id,
+                    new_message=types.UserContent(
+                        parts=[types.Part(text=req.message)]
+                    ),
+                    run_config=RunConfig(streaming_mode=stream_mode),
+                ):
+                    sse_event = event.model_dump_json(exclude_none=True, by_alias=True)
+                    yield f"data: {sse_event}\n\n"
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                logger.exception("Run failed for %s", req.user_id)
+                error = json.dumps({"error": f"{type(e).__name__}: {e}"})
+                yield f"event: error\ndata: {error}\n\n"
+            finally:
+                await lease.release()
+
+        return _LeasedStreamingResponse(
+            event_stream(),
+            lease,
+            media_type="text/event-stream",
+            headers={"X-Session-Id": session.id},
+        )
+
+    return app
+
+
+def serve(app: FastAPI, host: str, port: int, drain_timeout: float) -> None:
+    """Runs ``app`` with uvicorn, draining admission before shutting down.
+
+    uvicorn stops listening as soon as it gets a signal, and the lifespan
+    shutdown only runs after that, so draining there would never answer
+    a request with 503. The first signal therefore starts the drain and
+    hands over to uvicorn's shutdown once it is done.
+    """
+    import uvicorn
+
+    admission: AdmissionController = app.state.admission
+
+    class DrainingServer(uvicorn.Server):
+        _loop: Optional[asyncio.AbstractEventLoop] = None
+        _drain: Optional[asyncio.Task] = None
+
+        async def serve(self, sockets=None) -> None:
+            self._loop = asyncio.get_running_loop()
+            await super().serve(sockets)
+
+        def handle_exit(self, sig, frame) -> None:
+            if self._loop is None or self._drain is not None:
+                super().handle_exit(sig, frame)
+                return
+            logger.info("Draining before shutdown")
+            # Called from a signal handler: only schedule work on the loop.
+            self._loop.call_soon_threadsafe(self._start_drain, sig, frame)
+
+        def _start_drain(self, sig, frame) -> None:
+            if self._drain is None:
+                self._drain = asyncio.ensure_future(self._drain_then_exit(sig, frame))
+
+        async def _drain_then_exit(self, sig, frame) -> None:
+            await admission.drain(drain_timeout)
+            super().handle_exit(sig, frame)
+
+    config = uvicorn.Config(
+        app,
+        host=host,
+        port=port,
+        timeout_graceful_shutdown=int(drain_timeout),
+    )
+    DrainingServer(config).run()
+
+
+def main() -> None:
+    from .agent import root_agent
+    from .tracing import setup_tracing_from_env
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument(
+        "--max-concurrency",
+        type=int,
+        default=int(os.getenv("SERVER_MAX_CONCURRENCY", "16")),
+    )
+    parser.add_argument(
+        "--per-user", type=int, default=int(os.getenv("SERVER_PER_USER", "2"))
+    )
+    parser.add_argument(
+        "--queue-size", type=int, default=int(os.getenv("SERVER_QUEUE_SIZE", "64"))
+    )
+    parser.add_argument(
+        "--queue-timeout",
+        type=float,
+        default=float(os.getenv("SERVER_QUEUE_TIMEOUT", "30")),
+    )
+    parser.add_argument(
+        "--drain-timeout",
+        type=float,
+        default=float(os.getenv("SERVER_DRAIN_TIMEOUT", "60")),
+    )
+    args = parser.parse_args()
+
+    setup_tracing_from_env()
+    app = create_app(
+        root_agent,
+        admission=AdmissionController(
+            max_concurrency=args.max_concurrency,
+            per_user=args.per_user,
+            queue_size=args.queue_size,
+            queue_timeout=args.queue_timeout,
+        ),
+        drain_timeout=args.drain_timeout,
+    )
+    serve(app, args.host, args.port, args.drain_timeout)
+
+
+if __name__ == "__main__":
+    main()
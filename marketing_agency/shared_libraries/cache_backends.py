@@ -0,0 +1,145 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Pluggable key/value backends with TTL for sub-agent result caches."""
+
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+DEFAULT_TTL = 24 * 60 * 60
+
+
+class CacheBackend(ABC):
+    """Stores JSON-serializable values under (namespace, key) with a TTL."""
+
+    @abstractmethod
+    def get(self, namespace: str, key: str) -> Optional[Any]:
+        """The value under ``key``, or None if it is missing or expired."""
+
+    @abstractmethod
+    def set(self, namespace: str, key: str, value: Any, ttl: float) -> None:
+        """Stores ``value`` for ``ttl`` seconds."""
+
+    @abstractmethod
+    def clear(self, namespace: str) -> None:
+        """Drops every entry of ``namespace``."""
+
+
+class LRUCacheBackend(CacheBackend):
+    """In-process LRU with per-entry expiry."""
+
+    def __init__(
+        self, max_entries: int = 256, clock: Callable[[], float] = time.time
+    ):
+        self.max_entries = max_entries
+        self.clock = clock
+        self._entries: OrderedDict[tuple[str, str], tuple[Any, float]] = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+
+    def get(self, namespace: str, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get((namespace, key))
+            if entry is None:
+                return None
+            if entry[1] <= self.clock():
+                del self._entries[(namespace, key)]
+                return None
+            self._entries.move_to_end((namespace, key))
+            return entry[0]
+
+    def set(self, namespace: str, key: str, value: Any, ttl: float) -> None:
+        with self._lock:
+            self._entries[(namespace, key)] = (value, self.clock() + ttl)
+            self._entries.move_to_end((namespace, key))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self, namespace: str) -> None:
+        with self._lock:
+            for entry_key in [k for k in self._entries if k[0] == namespace]:
+                del self._entries[entry_key]
+
+
+class DiskCacheBackend(CacheBackend):
+    """One JSON file per entry under ``directory/<namespace>/``.
+
+    Survives restarts and can be shared by worker processes on one host.
+    Least recently read entries are dropped once a namespace holds more than
+    ``max_entries``.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        max_entries: int = 1024,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.directory = Path(directory)
+        self.max_entries = max_entries
+        self.clock = clock
+
+    def _path(self, namespace: str, key: str) -> Path:
+        safe_key = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        return self.directory / namespace / f"{safe_key}.json"
+
+    def get(self, namespace: str, key: str) -> Optional[Any]:
+        path = self._path(namespace, key)
+        try:
+            with open(path, encoding="utf-8") as entry_file:
+                entry = json.load(entry_file)
+        except (OSError, ValueError):
+            return None
+        if entry["expires_at"] <= self.clock():
+            path.unlink(missing_ok=True)
+            return None
+        os.utime(path)
+        return entry["value"]
+
+    def set(self, namespace: str, key: str, value: Any, ttl: float) -> None:
+        path = self._path(namespace, key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(tmp, "w", encoding="utf-8") as entry_file:
+            json.dump({"value": value, "expires_at": self.clock() + ttl}, entry_file)
+        os.replace(tmp, path)
+        entries = []
+        for entry in path.parent.glob("*.json"):
+            try:
+                entries.append((entry.stat().st_mtime, entry))
+            except FileNotFoundError:
+                continue  # Evicted by another worker meanwhile.
+        entries.sort()
+        for _, stale in entries[: max(0, len(entries) - self.max_entries)]:
+            stale.unlink(missing_ok=True)
+
+    def clear(self, namespace: str) -> None:
+        shutil.rmtree(self.directory / namespace, ignore_errors=True)
+
+
+def backend_from_env(prefix: str) -> CacheBackend:
+    """Disk backend when ``<prefix>_DIR`` is set, in-memory LRU otherwise."""
+    directory = os.getenv(f"{prefix}_DIR")
+    if directory:
+        return DiskCacheBackend(Path(directory))
+    return LRUCacheBackend(int(os.getenv(f"{prefix}_MAX_ENTRIES", "256")))
@@ -0,0 +1,228 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""AgentTool variant that memoizes sub-agent results."""
+
+import asyncio
+import hashlib
+import json
+import os
+import re
+import unicodedata
+from typing import Any, Optional, Sequence
+
+from google.adk.agents import BaseAgent
+from google.adk.agents.run_config import RunConfig
+from google.adk.tools import ToolContext
+from google.genai import types
+from opentelemetry import trace
+
+from .cache_backends import DEFAULT_TTL, CacheBackend, backend_from_env
+from .handoff import sub_agent_failed
+from .pass_through import PassThroughAgentTool
+from .semantic_cache import SemanticIndex
+
+# Prompt versions live in a namespace of their own, one entry per agent, so
+# that evicting results from a full namespace never drops the version.
+_VERSION_NAMESPACE = "__prompt_versions__"
+
+
+def normalize_request(text: str) -> str:
+    """Case-folds and collapses whitespace so trivial edits still hit."""
+    text = unicodedata.normalize("NFKC", text).casefold()
+    return re.sub(r"\s+", " ", text).strip().rstrip(".!?")
+
+
+def prompt_version(agent: BaseAgent) -> str:
+    """Fingerprint of the agent's instructions, i.e. of its prompt.py."""
+    instruction = getattr(agent, "instruction", "")
+    payload = json.dumps(
+        {
+            "instruction": instruction if isinstance(instruction, str) else "",
+            "description": agent.description,
+        },
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def _json_safe(value: Any) -> bool:
+    try:
+        json.dumps(value)
+    except (TypeError, ValueError):
+        return False
+    return True
+
+
+class CachedAgentTool(PassThroughAgentTool):
+    """An AgentTool that answers repeated requests from a cache.
+
+    Entries are keyed on the agent name, its model, the prompt version and the
+    normalized request. A hit replays the state changes (including the
+    agent's ``output_key``) and artifacts recorded on the original run, so the
+    caller cannot tell it apart from a fresh generation. Whenever the agent's
+    prompt changes, the agent's whole cache namespace is dropped.
+
+    With a ``semantic_index``, requests that miss exactly are also matched
+    against earlier requests by embedding similarity, so reworded briefs
+    reuse the closest cached result.
+
+    Large results are passed through as in ``PassThroughAgentTool``, and the
+    reference is what gets cached, together with the artifact. Runs that hit
+    a model error or a failed tool are not cached; ``ttl=0`` caches nothing.
+    """
+
+    def __init__(
+        self,
+        agent: BaseAgent,
+        skip_summarization: bool = False,
+        backend: Optional[CacheBackend] = None,
+        ttl: Optional[float] = None,
+        version: Optional[str] = None,
+        semantic_index: Optional[SemanticIndex] = None,
+        pass_through_chars: Optional[int] = None,
+        handoff_keys: Sequence[str] = (),
+        run_config: Optional[RunConfig] = None,
+    ):
+        super().__init__(
+            agent=agent,
+            skip_summarization=skip_summarization,
+            min_chars=pass_through_chars,
+            handoff_keys=handoff_keys,
+            run_config=run_config,
+        )
+        self.backend = backend or backend_from_env("SUBAGENT_CACHE")
+        if ttl is None:
+            ttl = float(os.getenv("SUBAGENT_CACHE_TTL", DEFAULT_TTL))
+        self.ttl = ttl
+        self.version = version or prompt_version(agent)
+        self.semantic_index = semantic_index
+        self.hits = 0
+        self.semantic_hits = 0
+        self.misses = 0
+        self._version_checked = False
+
+    @staticmethod
+    def _request_text(args: dict[str, Any]) -> str:
+        request = args.get("request")
+        if isinstance(request, str):
+            return request
+        return json.dumps(args, sort_keys=True)
+
+    def cache_key(self, args: dict[str, Any]) -> str:
+        model = getattr(self.agent, "model", "")
+        return json.dumps(
+            [
+                self.agent.name,
+                model if isinstance(model, str) else getattr(model, "model", ""),
+                self.version,
+                normalize_request(self._request_text(args)),
+            ]
+        )
+
+    def invalidate(self) -> None:
+        """Drops every cached result of this agent."""
+        self.backend.clear(self.agent.name)
+        if self.semantic_index is not None:
+            self.semantic_index.clear()
+        self.backend.set(
+            _VERSION_NAMESPACE, self.agent.name, self.version, 10 * 365 * 86400
+        )
+
+    def stats(self) -> dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "semantic_hits": self.semantic_hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    async def run_async(
+        self, *, args: dict[str, Any], tool_context: ToolContext
+    ) -> Any:
+        namespace = self.agent.name
+        # Keyed on the request as the agent will see it, with state filled in.
+        resolved = self.resolve_args(args, tool_context)
+        key = self.cache_key(resolved)
+        if not self._version_checked:
+            stored = await asyncio.to_thread(
+                self.backend.get, _VERSION_NAMESPACE, namespace
+            )
+            if stored != self.version:
+                await asyncio.to_thread(self.invalidate)
+            self._version_checked = True
+
+        cached = await asyncio.to_thread(self.backend.get, namespace, key)
+        semantic = False
+        if cached is None:
+            cached = await self._semantic_lookup(resolved)
+            semantic = cached is not None
+            if semantic:
+                self.semantic_hits += 1
+        span = trace.get_current_span()
+        span.set_attribute("marketing_agency.cache.hit", cached is not None)
+        span.set_attribute("marketing_agency.cache.semantic_hit", semantic)
+        if cached is not None:
+            self.hits += 1
+            return await self._replay(cached, tool_context)
+        self.misses += 1
+
+        state_before = tool_context.state.to_dict()
+        artifacts_before = dict(tool_context.actions.artifact_delta)
+        result = await super().run_async(args=args, tool_context=tool_context)
+        if not result or self.ttl <= 0 or sub_agent_failed.get():
+            return result
+
+        state_delta = {
+            name: value
+            for name, value in tool_context.state.to_dict().items()
+            if state_before.get(name) != value and _json_safe(value)
+        }
+        artifacts = {}
+        for name, version in tool_context.actions.artifact_delta.items():
+            if artifacts_before.get(name) == version:
+                continue
+            part = await tool_context.load_artifact(name)
+            if part is not None:
+                artifacts[name] = part.model_dump_json(exclude_none=True)
+        entry = {"result": result, "state_delta": state_delta, "artifacts": artifacts}
+        if _json_safe(entry):
+            await asyncio.to_thread(self.backend.set, namespace, key, entry, self.ttl)
+            if self.semantic_index is not None:
+                self.semantic_index.add(key, self._request_text(resolved))
+        return result
+
+    async def _semantic_lookup(self, args: dict[str, Any]) -> Optional[Any]:
+        if self.semantic_index is None:
+            return None
+        match = self.semantic_index.search(self._request_text(args))
+        if match is None:
+            return None
+        key, _ = match
+        cached = await asyncio.to_thread(self.backend.get, self.agent.name, key)
+        if cached is None:
+            # Expired or evicted from the backend since it was indexed.
+            self.semantic_index.discard(key)
+        return cached
+
+    async def _replay(self, entry: dict[str, Any], tool_context: ToolContext) -> Any:
+        if self.skip_summarization:
+            tool_context.actions.skip_summarization = True
+        tool_context.state.update(entry["state_delta"])
+        for name, part_json in entry["artifacts"].items():
+            await tool_context.save_artifact(
+                name, types.Part.model_validate_json(part_json)
+            )
+        return entry["result"]
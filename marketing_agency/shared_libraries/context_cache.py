@@ -0,0 +1,357 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Context caching of static agent instructions.
+
+The system instruction and tool declarations of an agent are uploaded once as
+a cached content, and each model request then references that handle instead
+of resending (and re-billing) them. Handles are refreshed shortly before they
+expire as long as the agent keeps being used.
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import time
+import weakref
+from abc import ABC, abstractmethod
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
+
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.models import LlmRequest, LlmResponse
+from google.genai import types
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL = 60 * 60
+DEFAULT_REFRESH_MARGIN = 5 * 60
+# Gemini rejects cached contents below a model-specific minimum size.
+DEFAULT_MIN_TOKENS = 1024
+# After a failed create, the instruction is sent inline for this long, then
+# twice as long after each further failure, up to the maximum.
+DEFAULT_RETRY_BACKOFF = 60
+MAX_RETRY_BACKOFF = 60 * 60
+# Model calls that raise never reach ``after_model``; their start times are
+# dropped after this many seconds.
+_STARTED_MAX_AGE = 10 * 60
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (about four characters per token)."""
+    return len(text) // 4
+
+
+class ContextCacheBackend(ABC):
+    """Creates and refreshes cached contents."""
+
+    @abstractmethod
+    async def create(
+        self, model: str, config: types.CreateCachedContentConfig
+    ) -> str:
+        """Uploads the content and returns its handle."""
+
+    @abstractmethod
+    async def refresh(self, name: str, ttl: float) -> None:
+        """Extends the lifetime of ``name`` to ``ttl`` seconds from now."""
+
+
+class GeminiContextCacheBackend(ContextCacheBackend):
+    """Cached contents stored by the Gemini API."""
+
+    def __init__(self, client: Optional[Any] = None):
+        self._client = client
+
+    @property
+    def client(self) -> Any:
+        if self._client is None:
+            from google.genai import Client
+
+            self._client = Client()
+        return self._client
+
+    async def create(
+        self, model: str, config: types.CreateCachedContentConfig
+    ) -> str:
+        cached = await self.client.aio.caches.create(model=model, config=config)
+        return cached.name
+
+    async def refresh(self, name: str, ttl: float) -> None:
+        await self.client.aio.caches.update(
+            name=name, config=types.UpdateCachedContentConfig(ttl=f"{ttl:.0f}s")
+        )
+
+
+class InMemoryContextCacheBackend(ContextCacheBackend):
+    """Local stand-in for offline runs and tests.
+
+    Keeps the cached configs so a fake model can ``resolve`` a handle back to
+    the instruction it stands for.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.time):
+        self.clock = clock
+        self.contents: dict[str, tuple[types.CreateCachedContentConfig, float]] = {}
+        self.creates = 0
+        self.refreshes = 0
+
+    async def create(
+        self, model: str, config: types.CreateCachedContentConfig
+    ) -> str:
+        self.creates += 1
+        name = f"cachedContents/local-{self.creates}"
+        self.contents[name] = (config, self.clock() + float(config.ttl[:-1]))
+        return name
+
+    async def refresh(self, name: str, ttl: float) -> None:
+        self.refreshes += 1
+        config, _ = self.contents[name]
+        self.contents[name] = (config, self.clock() + ttl)
+
+    def resolve(self, name: str) -> Optional[types.CreateCachedContentConfig]:
+        config, expires_at = self.contents.get(name, (None, 0.0))
+        return config if expires_at > self.clock() else None
+
+
+@dataclass
+class _Handle:
+    name: str
+    expires_at: float
+    # The static request fields the cached content replaces.
+    config: types.CreateCachedContentConfig
+
+
+@dataclass
+class AgentCacheStats:
+    """Per-agent request counters."""
+
+    requests: int = 0
+    cached_requests: int = 0
+    prompt_tokens: int = 0
+    cached_tokens: int = 0
+    prefill_seconds: float = 0.0
+    prefill_samples: int = 0
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "cached_requests": self.cached_requests,
+            "prompt_tokens": self.prompt_tokens,
+            "cached_tokens": self.cached_tokens,
+            "token_savings": (
+                self.cached_tokens / self.prompt_tokens if self.prompt_tokens else 0.0
+            ),
+            "avg_prefill_seconds": (
+                self.prefill_seconds / self.prefill_samples
+                if self.prefill_samples
+                else 0.0
+            ),
+            "prefill_samples": self.prefill_samples,
+        }
+
+
+class ContextCache:
+    """Before/after model callbacks that move static instructions to a cache.
+
+    ``before_model`` swaps the request's system instruction, tools and tool
+    config for a cached content handle (these fields may not be sent together
+    with one). ``after_model`` records, per agent, prompt and cached token
+    counts and the prefill time, i.e. the delay until the first response
+    chunk; it is only known for streamed calls, as a non-streaming call
+    returns the whole answer at once. Instructions that are too small to
+    cache are sent inline as before, and so are those the backend refuses,
+    until a retry after an exponential backoff.
+    """
+
+    def __init__(
+        self,
+        backend: Optional[ContextCacheBackend],
+        ttl: float = DEFAULT_TTL,
+        refresh_margin: float = DEFAULT_REFRESH_MARGIN,
+        min_tokens: int = DEFAULT_MIN_TOKENS,
+        retry_backoff: float = DEFAULT_RETRY_BACKOFF,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.backend = backend
+        self.ttl = ttl
+        self.refresh_margin = refresh_margin
+        self.min_tokens = min_tokens
+        self.retry_backoff = retry_backoff
+        self.clock = clock
+        self._handles: dict[str, _Handle] = {}
+        # Handles by cached content name, for ``inline``.
+        self._inline: dict[str, _Handle] = {}
+        # key -> (consecutive failures, time of the next attempt)
+        self._failures: dict[str, tuple[int, float]] = {}
+        # Per event loop: the cache outlives the loops of asyncio.run calls.
+        self._locks: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+        self._started: dict[tuple[str, str], float] = {}
+        self._stats: defaultdict[str, AgentCacheStats] = defaultdict(
+            AgentCacheStats
+        )
+
+    @classmethod
+    def from_env(cls) -> "ContextCache":
+        """Reads CONTEXT_CACHE_BACKEND (off, gemini or local) and TTLs.
+
+        Caching is off unless enabled: Gemini bills cached contents for their
+        storage time.
+        """
+        kind = os.getenv("CONTEXT_CACHE_BACKEND", "off")
+        backend = {
+            "gemini": GeminiContextCacheBackend,
+            "local": InMemoryContextCacheBackend,
+        }.get(kind)
+        return cls(
+            backend() if backend else None,
+            ttl=float(os.getenv("CONTEXT_CACHE_TTL", DEFAULT_TTL)),
+            refresh_margin=float(
+                os.getenv("CONTEXT_CACHE_REFRESH_MARGIN", DEFAULT_REFRESH_MARGIN)
+            ),
+            min_tokens=int(os.getenv("CONTEXT_CACHE_MIN_TOKENS", DEFAULT_MIN_TOKENS)),
+        )
+
+    def stats(self) -> dict[str, dict[str, Any]]:
+        return {agent: stats.as_dict() for agent, stats in self._stats.items()}
+
+    def _lock(self, key: str) -> asyncio.Lock:
+        loop = asyncio.get_running_loop()
+        locks = self._locks.get(loop)
+        if locks is None:
+            locks = self._locks[loop] = {}
+        lock = locks.get(key)
+        if lock is None:
+            lock = locks[key] = asyncio.Lock()
+        return lock
+
+    def _prune_inline(self) -> None:
+        now = self.clock()
+        for name in [n for n, h in self._inline.items() if h.expires_at <= now]:
+            del self._inline[name]
+
+    @staticmethod
+    def _cached_config(
+        llm_request: LlmRequest,
+    ) -> types.CreateCachedContentConfig:
+        config = llm_request.config
+        return types.CreateCachedContentConfig(
+            system_instruction=config.system_instruction,
+            tools=config.tools or None,
+            tool_config=config.tool_config,
+        )
+
+    async def handle_for(self, llm_request: LlmRequest) -> Optional[str]:
+        """Cached content handle for the request's static part, if any."""
+        config = llm_request.config
+        if self.backend is None or config is None or config.cached_content:
+            return None
+        cached_config = self._cached_config(llm_request)
+        payload = cached_config.model_dump_json(exclude_none=True)
+        if estimate_tokens(payload) < self.min_tokens:
+            return None
+        key = hashlib.sha256(
+            f"{llm_request.model}\n{payload}".encode("utf-8")
+        ).hexdigest()
+        failures, retry_at = self._failures.get(key, (0, 0.0))
+        if self.clock() < retry_at:
+            return None
+
+        async with self._lock(key):
+            handle = self._handles.get(key)
+            now = self.clock()
+            if handle and handle.expires_at - now > self.refresh_margin:
+                return handle.name
+            try:
+                if handle and handle.expires_at > now:
+                    await self.backend.refresh(handle.name, self.ttl)
+                    handle.expires_at = now + self.ttl
+                    return handle.name
+                cached_config.ttl = f"{self.ttl:.0f}s"
+                cached_config.display_name = key[:16]
+                name = await self.backend.create(llm_request.model, cached_config)
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                backoff = min(self.retry_backoff * 2**failures, MAX_RETRY_BACKOFF)
+                logger.warning(
+                    "Context caching paused for %s for %.0fs: %s",
+                    key[:16],
+                    backoff,
+                    e,
+                )
+                self._handles.pop(key, None)
+                self._failures[key] = (failures + 1, now + backoff)
+                return None
+            self._failures.pop(key, None)
+            self._prune_inline()
+            handle = _Handle(name, now + self.ttl, self._cached_config(llm_request))
+            self._handles[key] = self._inline[name] = handle
+            return name
+
+    def inline(self, llm_request: LlmRequest) -> None:
+        """Undoes ``before_model``, e.g. before sending to another model.
+
+        Cached contents are bound to the model they were created for.
+        """
+        config = llm_request.config
+        handle = self._inline.get(config.cached_content or "")
+        self._prune_inline()
+        if handle is None:
+            return
+        cached = handle.config
+        config.cached_content = None
+        config.system_instruction = cached.system_instruction
+        config.tools = cached.tools
+        config.tool_config = cached.tool_config
+
+    async def before_model(
+        self, callback_context: CallbackContext, llm_request: LlmRequest
+    ) -> None:
+        stats = self._stats[callback_context.agent_name]
+        stats.requests += 1
+        name = await self.handle_for(llm_request)
+        if name:
+            stats.cached_requests += 1
+            llm_request.config.cached_content = name
+            llm_request.config.system_instruction = None
+            llm_request.config.tools = None
+            llm_request.config.tool_config = None
+        now = time.perf_counter()
+        for key in [
+            k for k, t in self._started.items() if now - t > _STARTED_MAX_AGE
+        ]:
+            del self._started[key]
+        self._started[
+            (callback_context.invocation_id, callback_context.agent_name)
+        ] = now
+
+    def after_model(
+        self, callback_context: CallbackContext, llm_response: LlmResponse
+    ) -> None:
+        agent_name = callback_context.agent_name
+        stats = self._stats[agent_name]
+        started = self._started.pop(
+            (callback_context.invocation_id, agent_name), None
+        )
+        # Only the first chunk of a streamed answer marks the end of prefill.
+        if started is not None and llm_response.partial:
+            stats.prefill_seconds += time.perf_counter() - started
+            stats.prefill_samples += 1
+        usage = llm_response.usage_metadata
+        if usage and not llm_response.partial:
+            stats.prompt_tokens += usage.prompt_token_count or 0
+            stats.cached_tokens += usage.cached_content_token_count or 0
+
+
+context_cache = ContextCache.from_env()
@@ -0,0 +1,235 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Hands upstream results to sub-agents from session state.
+
+The coordinator records the brand brief and the chosen domain once with
+``save_brief``. After that, a sub-agent tool appends the state keys it
+depends on to the request, and expands ``{key}`` / ``{key?}`` references in
+it (the syntax of ADK instruction templates), so the coordinator passes a
+short request instead of re-typing the brief and earlier results.
+"""
+
+import re
+from contextvars import ContextVar
+from typing import Any, Mapping, Optional, Sequence
+
+from google.adk.agents import BaseAgent, LlmAgent
+from google.adk.agents.run_config import RunConfig
+from google.adk.events import Event
+from google.adk.memory import InMemoryMemoryService
+from google.adk.runners import Runner
+from google.adk.sessions import InMemorySessionService, Session
+from google.adk.tools import ToolContext
+from google.adk.tools.agent_tool import AgentTool
+from google.genai import types
+
+BRIEF_KEY = "brand_brief"
+SELECTED_DOMAIN_KEY = "selected_domain"
+_CONTEXT_HEADER = "Context from earlier steps"
+
+# For the prompts of sub-agents that are called with handoff_keys.
+HANDOFF_INSTRUCTION = (
+    f'The request may end with a "{_CONTEXT_HEADER}" section holding the brand '
+    f"brief ([{BRIEF_KEY}]) and the domain the user chose "
+    f"([{SELECTED_DOMAIN_KEY}]). Treat that section as information provided to "
+    "you directly."
+)
+
+_REFERENCE = re.compile(r"\{\s*((?:app:|user:)?[A-Za-z_]\w*)\s*(\??)\s*\}")
+_FAILED_STATUSES = ("error", "failed")
+
+# Whether the last sub-agent run of the current task hit a model error or a
+# failed tool, for wrappers such as CachedAgentTool.
+sub_agent_failed: ContextVar[bool] = ContextVar("sub_agent_failed", default=False)
+
+
+def expand_references(text: str, state: Mapping[str, Any]) -> str:
+    """Replaces ``{key}`` with ``state[key]``; ``{key?}`` may be missing.
+
+    Unknown required keys are left as they are, so that the sub-agent sees
+    what was asked for rather than an empty string.
+    """
+
+    def replace(match: re.Match) -> str:
+        key, optional = match.group(1), match.group(2)
+        if key in state:
+            return str(state[key])
+        return "" if optional else match.group(0)
+
+    return _REFERENCE.sub(replace, text)
+
+
+def handoff_context(state: Mapping[str, Any], keys: Sequence[str]) -> str:
+    sections = [f"[{key}]\n{state[key]}" for key in keys if state.get(key)]
+    if not sections:
+        return ""
+    return f"{_CONTEXT_HEADER}:\n\n" + "\n\n".join(sections)
+
+
+def save_brief(
+    brief: str, selected_domain: str, tool_context: ToolContext
+) -> dict[str, str]:
+    """Records the brand brief and the chosen domain for the other tools.
+
+    Call this when the user has described their brand, and again once they
+    have picked a domain. The sub-agent tools read both from here, so their
+    requests only need what is specific to that step.
+
+    Args:
+      brief: Brand name, business description, audience, goals and style, as
+        given by the user. Pass an empty string to keep the saved brief.
+      selected_domain: The domain the user chose, or an empty string if they
+        have not chosen one yet.
+
+    Returns:
+      The saved brief and domain.
+    """
+    if brief:
+        tool_context.state[BRIEF_KEY] = brief
+    if selected_domain:
+        tool_context.state[SELECTED_DOMAIN_KEY] = selected_domain.strip().lower()
+    return {
+        BRIEF_KEY: tool_context.state.get(BRIEF_KEY, ""),
+        SELECTED_DOMAIN_KEY: tool_context.state.get(SELECTED_DOMAIN_KEY, ""),
+    }
+
+
+def _failed(event: Event) -> bool:
+    if event.error_code:
+        return True
+    return any(
+        isinstance(response.response, dict)
+        and response.response.get("status") in _FAILED_STATUSES
+        for response in event.get_function_responses()
+    )
+
+
+async def _artifact_names(runner: Runner, session: Session) -> list[str]:
+    if runner.artifact_service is None:
+        return []
+    return await runner.artifact_service.list_artifact_keys(
+        app_name=session.app_name, user_id=session.user_id, session_id=session.id
+    )
+
+
+async def _delete_session(runner: Runner, session: Session) -> None:
+    """Deletes a sub-agent session and the artifacts saved under it."""
+    for name in await _artifact_names(runner, session):
+        await runner.artifact_service.delete_artifact(
+            app_name=session.app_name,
+            user_id=session.user_id,
+            session_id=session.id,
+            filename=name,
+        )
+    await runner.session_service.delete_session(
+        app_name=session.app_name, user_id=session.user_id, session_id=session.id
+    )
+
+
+class HandoffAgentTool(AgentTool):
+    """An AgentTool whose request is completed from session state.
+
+    With a ``run_config`` the sub-agent runs with it instead of ADK's default
+    (no streaming), e.g. so that its callbacks see SSE partial responses.
+    The sub-agent's artifacts are moved, not copied, to the calling session,
+    so long-lived processes do not keep them in the shared artifact service.
+    """
+
+    def __init__(
+        self,
+        agent: BaseAgent,
+        skip_summarization: bool = False,
+        handoff_keys: Sequence[str] = (),
+        run_config: Optional[RunConfig] = None,
+    ):
+        super().__init__(agent=agent, skip_summarization=skip_summarization)
+        self.handoff_keys = tuple(handoff_keys)
+        self.run_config = run_config
+
+    def resolve_args(
+        self, args: dict[str, Any], tool_context: ToolContext
+    ) -> dict[str, Any]:
+        request = args.get("request")
+        if not isinstance(request, str):
+            return args
+        state = tool_context.state.to_dict()
+        # Keys the request already references are not repeated.
+        keys = [key for key in self.handoff_keys if f"{{{key}" not in request]
+        parts = [expand_references(request, state), handoff_context(state, keys)]
+        return {**args, "request": "\n\n".join(part for part in parts if part)}
+
+    async def run_async(
+        self, *, args: dict[str, Any], tool_context: ToolContext
+    ) -> Any:
+        args = self.resolve_args(args, tool_context)
+        sub_agent_failed.set(False)
+        if isinstance(self.agent, LlmAgent) and (
+            self.agent.input_schema or self.agent.output_schema
+        ):
+            return await super().run_async(args=args, tool_context=tool_context)
+        return await self._run_agent(args["request"], tool_context)
+
+    async def _run_agent(self, request: str, tool_context: ToolContext) -> str:
+        """AgentTool.run_async for a text request, with ``self.run_config``.
+
+        Unlike AgentTool, it deletes the sub-session and its artifacts once
+        they are copied to the calling session, and sets ``sub_agent_failed``.
+        """
+        if self.skip_summarization:
+            tool_context.actions.skip_summarization = True
+        runner = Runner(
+            app_name=self.agent.name,
+            agent=self.agent,
+            artifact_service=tool_context._invocation_context.artifact_service,
+            session_service=InMemorySessionService(),
+            memory_service=InMemoryMemoryService(),
+        )
+        session = await runner.session_service.create_session(
+            app_name=self.agent.name,
+            user_id="tmp_user",
+            state=tool_context.state.to_dict(),
+        )
+        last_event = None
+        failed = False
+        try:
+            async for event in runner.run_async(
+                user_id=session.user_id,
+                session_id=session.id,
+                new_message=types.Content(
+                    role="user", parts=[types.Part.from_text(text=request)]
+                ),
+                run_config=self.run_config or RunConfig(),
+            ):
+                if event.actions.state_delta:
+                    tool_context.state.update(event.actions.state_delta)
+                failed = failed or _failed(event)
+                if not event.partial:
+                    last_event = event
+            for name in await _artifact_names(runner, session):
+                artifact = await runner.artifact_service.load_artifact(
+                    app_name=session.app_name,
+                    user_id=session.user_id,
+                    session_id=session.id,
+                    filename=name,
+                )
+                if artifact:
+                    await tool_context.save_artifact(filename=name, artifact=artifact)
+        finally:
+            await _delete_session(runner, session)
+        sub_agent_failed.set(failed)
+
+        if not last_event or not last_event.content or not last_event.content.parts:
+            return ""
+        return "\n".join(part.text for part in last_event.content.parts if part.text)
@@ -0,0 +1,159 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Bounded conversation history for the coordinator's model requests.
+
+The last ``keep_turns`` user turns are sent verbatim. In older turns, tool
+results and model replies longer than ``max_chars`` are cut down to a short
+excerpt that names the state key holding the full result, so the prompt no
+longer grows by a whole website or strategy with every step of the flow.
+"""
+
+import json
+import logging
+import os
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.models import LlmRequest
+from google.genai import types
+
+from .context_cache import estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class TurnTokens:
+    """Estimated prompt tokens of one model request, before and after."""
+
+    invocation_id: str
+    before: int
+    after: int
+
+
+def _part_text(part: types.Part) -> str:
+    if part.text:
+        return part.text
+    if part.function_response:
+        return json.dumps(part.function_response.response, default=str)
+    if part.function_call:
+        return json.dumps(part.function_call.args, default=str)
+    return ""
+
+
+def content_tokens(contents: list[types.Content]) -> int:
+    return sum(
+        estimate_tokens(_part_text(part))
+        for content in contents
+        for part in content.parts or []
+    )
+
+
+def _is_user_turn(content: types.Content) -> bool:
+    return content.role == "user" and any(
+        part.text for part in content.parts or []
+    )
+
+
+class HistoryWindow:
+    """A before-model callback that shrinks large results of older turns."""
+
+    def __init__(
+        self,
+        keep_turns: int = 2,
+        max_chars: int = 2000,
+        excerpt_chars: int = 300,
+        state_keys: Optional[dict[str, str]] = None,
+        history_size: int = 100,
+    ):
+        self.keep_turns = keep_turns
+        self.max_chars = max_chars
+        self.excerpt_chars = excerpt_chars
+        # Tool (agent) name -> state key with that agent's full output.
+        self.state_keys = state_keys or {}
+        self.turns: deque[TurnTokens] = deque(maxlen=history_size)
+        self.requests = 0
+        self.tokens_before = 0
+        self.tokens_after = 0
+
+    @classmethod
+    def from_env(
+        cls, state_keys: Optional[dict[str, str]] = None
+    ) -> "HistoryWindow":
+        return cls(
+            keep_turns=int(os.getenv("HISTORY_KEEP_TURNS", "2")),
+            max_chars=int(os.getenv("HISTORY_MAX_CHARS", "2000")),
+            excerpt_chars=int(os.getenv("HISTORY_EXCERPT_CHARS", "300")),
+            state_keys=state_keys,
+        )
+
+    def _excerpt(self, text: str, state_key: Optional[str]) -> str:
+        note = f"{len(text) - self.excerpt_chars} more characters omitted"
+        if state_key:
+            note += f"; the full result is in state key '{state_key}'"
+        return f"{text[: self.excerpt_chars]}... [{note}]"
+
+    def _shrink(self, content: types.Content) -> None:
+        for part in content.parts or []:
+            response = part.function_response
+            if response and len(_part_text(part)) > self.max_chars:
+                result = (response.response or {}).get("result")
+                text = result if isinstance(result, str) else _part_text(part)
+                response.response = {
+                    "result": self._excerpt(text, self.state_keys.get(response.name))
+                }
+            elif part.text and content.role == "model":
+                if len(part.text) > self.max_chars:
+                    part.text = self._excerpt(part.text, None)
+
+    def __call__(
+        self, callback_context: CallbackContext, llm_request: LlmRequest
+    ) -> None:
+        contents = llm_request.contents
+        before = content_tokens(contents)
+        turns = [i for i, content in enumerate(contents) if _is_user_turn(content)]
+        if self.keep_turns and len(turns) > self.keep_turns:
+            # The contents are copies of the session events, so the session
+            # itself keeps the full history.
+            for content in contents[: turns[-self.keep_turns]]:
+                self._shrink(content)
+        after = content_tokens(contents)
+        self.turns.append(TurnTokens(callback_context.invocation_id, before, after))
+        self.requests += 1
+        self.tokens_before += before
+        self.tokens_after += after
+        logger.debug(
+            "%s history: %d -> %d prompt tokens",
+            callback_context.agent_name,
+            before,
+            after,
+        )
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "tokens_before": self.tokens_before,
+            "tokens_after": self.tokens_after,
+            "token_savings": (
+                1 - self.tokens_after / self.tokens_before
+                if self.tokens_before
+                else 0.0
+            ),
+            "recent": [
+                {"before": turn.before, "after": turn.after} for turn in self.turns
+            ],
+        }
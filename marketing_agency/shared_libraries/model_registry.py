@@ -0,0 +1,214 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Central choice of the model behind every agent.
+
+Each agent is assigned a tier: ``pro`` for long-form generation, ``flash``
+for tool-driven or conversational work, or ``auto`` to let a router send
+simple requests to Flash and escalate to Pro on failure or a poor answer.
+Tiers and model names can be overridden per deployment, e.g.::
+
+    MODEL_TIER_PRO=gemini-2.5-pro
+    WEBSITE_CREATE_AGENT_MODEL=auto
+"""
+
+import logging
+import os
+from typing import AsyncGenerator, Callable, Optional, Union
+
+from google.adk.models import BaseLlm, Gemini, LlmRequest, LlmResponse
+from google.genai import types
+
+from .context_cache import ContextCache, context_cache
+
+logger = logging.getLogger(__name__)
+
+PRO = "pro"
+FLASH = "flash"
+AUTO = "auto"
+
+DEFAULT_MODELS = {
+    PRO: "gemini-2.5-pro-preview-05-06",
+    FLASH: "gemini-2.5-flash-preview-05-20",
+}
+
+AGENT_TIERS = {
+    "marketing_coordinator": AUTO,
+    "domain_create_agent": FLASH,
+    "logo_create_agent": FLASH,
+    "marketing_create_agent": AUTO,
+    "website_create_agent": PRO,
+}
+
+# List prices in USD per million tokens (prompts up to 200k tokens), used
+# for cost estimates only.
+PRICES = {
+    "gemini-2.5-pro-preview-05-06": {"input": 1.25, "output": 10.0},
+    "gemini-2.5-flash-preview-05-20": {"input": 0.15, "output": 0.60},
+}
+
+# Requests that ask for these are sent to the strong model directly.
+COMPLEX_HINTS = (
+    "comprehensive",
+    "detailed",
+    "in-depth",
+    "full strategy",
+    "multi-channel",
+    "competitor",
+    "budget",
+)
+
+
+def tier_model(tier: str) -> str:
+    """Model name of a tier, honouring ``MODEL_TIER_<TIER>``."""
+    return os.getenv(f"MODEL_TIER_{tier.upper()}", DEFAULT_MODELS[tier])
+
+
+def estimate_cost(model: str, input_tokens: int, output_tokens: int) -> float:
+    price = PRICES.get(model)
+    if price is None:
+        return 0.0
+    return (input_tokens * price["input"] + output_tokens * price["output"]) / 1e6
+
+
+def _user_text(llm_request: LlmRequest) -> Optional[str]:
+    """Text of the latest user message, skipping function responses.
+
+    After a tool call the request ends with the tool's response, which has
+    no text; the call that writes the answer is judged by what the user
+    asked for, like the call that started the turn.
+    """
+    for content in reversed(llm_request.contents):
+        if content.role != "user":
+            continue
+        texts = [part.text for part in content.parts or [] if part.text]
+        if texts:
+            return "\n".join(texts)
+    return None
+
+
+def is_simple_request(llm_request: LlmRequest, max_chars: int = 600) -> bool:
+    """Short requests without hints at an elaborate answer."""
+    text = _user_text(llm_request)
+    if text is None:
+        return False
+    lowered = text.lower()
+    return len(text) <= max_chars and not any(
+        hint in lowered for hint in COMPLEX_HINTS
+    )
+
+
+def is_acceptable(llm_request: LlmRequest, response: LlmResponse) -> bool:
+    """Rejects errors, truncated or empty answers and unknown tool calls."""
+    if response.error_code:
+        return False
+    # Newer ADK versions report why generation stopped, e.g. MAX_TOKENS.
+    finish_reason = getattr(response, "finish_reason", None)
+    if finish_reason not in (None, types.FinishReason.STOP):
+        return False
+    parts = response.content.parts if response.content else None
+    if not parts:
+        return False
+    for part in parts:
+        if part.function_call and part.function_call.name not in (
+            llm_request.tools_dict
+        ):
+            return False
+    return any(part.function_call or (part.text or "").strip() for part in parts)
+
+
+class RoutedLlm(BaseLlm):
+    """Sends simple requests to ``fast`` and the rest to ``strong``.
+
+    Answers from ``fast`` are checked with ``accept`` before anything is
+    yielded; errors and rejected answers are retried on ``strong``. When
+    streaming, the fast answer is therefore buffered, which costs little
+    given Flash latency. ``model`` is the fast model so that context caches
+    are created for it; requests sent to ``strong`` carry their instruction
+    inline.
+    """
+
+    fast: BaseLlm
+    strong: BaseLlm
+    classify: Callable[[LlmRequest], bool] = is_simple_request
+    accept: Callable[[LlmRequest, LlmResponse], bool] = is_acceptable
+    context_cache: Optional[ContextCache] = None
+    counters: dict[str, int] = {}
+
+    def stats(self) -> dict[str, int]:
+        return dict(self.counters)
+
+    def _count(self, name: str) -> None:
+        self.counters[name] = self.counters.get(name, 0) + 1
+
+    async def _strong(
+        self, llm_request: LlmRequest, stream: bool
+    ) -> AsyncGenerator[LlmResponse, None]:
+        if self.context_cache is not None:
+            self.context_cache.inline(llm_request)
+        llm_request.model = self.strong.model
+        async for response in self.strong.generate_content_async(
+            llm_request, stream
+        ):
+            yield response
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        if not self.classify(llm_request):
+            self._count("strong")
+            async for response in self._strong(llm_request, stream):
+                yield response
+            return
+
+        self._count("fast")
+        llm_request.model = self.fast.model
+        responses: list[LlmResponse] = []
+        try:
+            async for response in self.fast.generate_content_async(
+                llm_request, stream
+            ):
+                responses.append(response)
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            logger.warning("Escalating after %s failed: %s", self.fast.model, e)
+            responses = []
+        final = next((r for r in reversed(responses) if not r.partial), None)
+        if final is not None and self.accept(llm_request, final):
+            for response in responses:
+                yield response
+            return
+
+        self._count("escalated")
+        async for response in self._strong(llm_request, stream):
+            yield response
+
+
+def model_for(agent_name: str) -> Union[str, BaseLlm]:
+    """Model of ``agent_name`` per ``<AGENT_NAME>_MODEL`` or ``AGENT_TIERS``.
+
+    The setting may be a tier (pro, flash, auto) or a model name.
+    """
+    setting = os.getenv(
+        f"{agent_name.upper()}_MODEL", AGENT_TIERS.get(agent_name, PRO)
+    )
+    if setting == AUTO:
+        return RoutedLlm(
+            model=tier_model(FLASH),
+            fast=Gemini(model=tier_model(FLASH)),
+            strong=Gemini(model=tier_model(PRO)),
+            context_cache=context_cache,
+        )
+    if setting in DEFAULT_MODELS:
+        return tier_model(setting)
+    return setting
@@ -0,0 +1,107 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""AgentTool variant that hands large results to the client, not the model.
+
+A result of at least ``min_chars`` characters is saved as an artifact, and
+the calling model only gets a short reference to it, so it does not
+regenerate a whole website or strategy token by token to show it to the
+user. The client receives the full text in the function response event:
+as the artifact, and in the state delta under the agent's output key.
+"""
+
+import os
+from typing import Any, Optional, Sequence
+
+from google.adk.agents import BaseAgent
+from google.adk.agents.run_config import RunConfig
+from google.adk.events import Event
+from google.adk.tools import ToolContext
+from google.genai import types
+from opentelemetry import trace
+
+from .handoff import HandoffAgentTool
+
+PASS_THROUGH_KEY = "pass_through"
+
+
+def delivered_outputs(event: Event) -> dict[str, str]:
+    """Full texts behind the pass-through results of ``event``, by state key."""
+    outputs = {}
+    for response in event.get_function_responses():
+        result = response.response or {}
+        key = result.get("state_key")
+        if result.get(PASS_THROUGH_KEY) and key in event.actions.state_delta:
+            outputs[key] = event.actions.state_delta[key]
+    return outputs
+
+
+class PassThroughAgentTool(HandoffAgentTool):
+    """An AgentTool that replaces large results by a reference."""
+
+    def __init__(
+        self,
+        agent: BaseAgent,
+        skip_summarization: bool = False,
+        min_chars: Optional[int] = None,
+        excerpt_chars: int = 200,
+        state_key: Optional[str] = None,
+        handoff_keys: Sequence[str] = (),
+        run_config: Optional[RunConfig] = None,
+    ):
+        super().__init__(
+            agent=agent,
+            skip_summarization=skip_summarization,
+            handoff_keys=handoff_keys,
+            run_config=run_config,
+        )
+        if min_chars is None:
+            min_chars = int(os.getenv("PASS_THROUGH_MIN_CHARS", "4000"))
+        self.min_chars = min_chars
+        self.excerpt_chars = excerpt_chars
+        # Where the agent leaves its full output; its output_key by default.
+        self.state_key = state_key or getattr(agent, "output_key", None)
+
+    async def run_async(
+        self, *, args: dict[str, Any], tool_context: ToolContext
+    ) -> Any:
+        artifacts_before = dict(tool_context.actions.artifact_delta)
+        result = await super().run_async(args=args, tool_context=tool_context)
+        if (
+            not self.min_chars
+            or not isinstance(result, str)
+            or len(result) < self.min_chars
+        ):
+            return result
+        data = result.encode("utf-8")
+        await tool_context.save_artifact(
+            f"{self.state_key or self.agent.name}.md",
+            types.Part.from_bytes(data=data, mime_type="text/markdown"),
+        )
+        artifacts = [
+            name
+            for name, version in tool_context.actions.artifact_delta.items()
+            if artifacts_before.get(name) != version
+        ]
+        span = trace.get_current_span()
+        span.set_attribute("marketing_agency.pass_through", True)
+        span.set_attribute("marketing_agency.artifact.count", len(artifacts))
+        span.set_attribute("marketing_agency.artifact.bytes", len(data))
+        return {
+            PASS_THROUGH_KEY: True,
+            "characters": len(result),
+            "artifacts": artifacts,
+            "state_key": self.state_key,
+            "excerpt": result[: self.excerpt_chars],
+        }
@@ -0,0 +1,184 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Near-duplicate lookup of requests with local hashed embeddings.
+
+Requests are embedded with a signed hashing vectorizer over words and
+character trigrams, so no model or network call is needed, and compared by
+cosine similarity against a bounded in-memory matrix. Domains, numbers and
+colour codes are pinned: two requests only match if those agree exactly.
+"""
+
+import hashlib
+import os
+import re
+import threading
+import unicodedata
+from collections import OrderedDict
+from typing import Optional
+
+import numpy as np
+
+DEFAULT_DIMENSIONS = 2048
+DEFAULT_THRESHOLD = 0.9
+
+# Filler words that change wording but not the brief.
+STOPWORDS = frozenset(
+    """
+    a an the and or of for to in on at by with from called named about is are
+    be please i we me my our us want need would like make create some new
+    """.split()
+)
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+_PINNED_RE = re.compile(r"[a-z0-9-]+(?:\.[a-z0-9-]+)+|#[0-9a-f]{3,6}\b|\d+")
+
+
+def fold(text: str) -> str:
+    """Case-folds ``text`` and strips its accents ("Café" -> "cafe")."""
+    text = unicodedata.normalize("NFKD", text.casefold())
+    return "".join(char for char in text if not unicodedata.combining(char))
+
+
+def tokenize(text: str) -> list[str]:
+    """Lowercased, accent-free words without filler words."""
+    return [
+        token for token in _TOKEN_RE.findall(fold(text)) if token not in STOPWORDS
+    ]
+
+
+def pinned_terms(text: str) -> frozenset[str]:
+    """Terms that must match exactly, e.g. ``brewbean.com`` or ``#ff0000``."""
+    return frozenset(_PINNED_RE.findall(text.casefold()))
+
+
+def _features(tokens: list[str]) -> list[str]:
+    features = [f"w:{token}" for token in tokens]
+    for token in tokens:
+        padded = f"<{token}>"
+        features.extend(f"c:{padded[i:i + 3]}" for i in range(len(padded) - 2))
+    return features
+
+
+class HashingVectorizer:
+    """Maps text to an L2-normalized ``float32`` vector of fixed size.
+
+    Word features are weighted above character trigrams so that shared words
+    dominate while spelling variants ("café"/"cafe", "Beans"/"Bean") still
+    overlap.
+    """
+
+    def __init__(self, dimensions: int = DEFAULT_DIMENSIONS):
+        self.dimensions = dimensions
+
+    def transform(self, text: str) -> np.ndarray:
+        vector = np.zeros(self.dimensions, dtype=np.float32)
+        for feature in _features(tokenize(text)):
+            digest = hashlib.blake2b(feature.encode("utf-8"), digest_size=8)
+            value = int.from_bytes(digest.digest(), "little")
+            weight = 2.0 if feature.startswith("w:") else 1.0
+            sign = 1.0 if value & 1 else -1.0
+            vector[(value >> 1) % self.dimensions] += sign * weight
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+
+class SemanticIndex:
+    """Bounded cosine-similarity index mapping request vectors to cache keys.
+
+    Lookups are a single matrix-vector product over at most ``max_entries``
+    rows; once full, the least recently matched key is replaced.
+    """
+
+    def __init__(
+        self,
+        threshold: float = DEFAULT_THRESHOLD,
+        max_entries: int = 1024,
+        vectorizer: Optional[HashingVectorizer] = None,
+    ):
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.vectorizer = vectorizer or HashingVectorizer()
+        self._vectors = np.zeros(
+            (max_entries, self.vectorizer.dimensions), dtype=np.float32
+        )
+        self._rows: OrderedDict[str, int] = OrderedDict()
+        self._keys: dict[int, str] = {}
+        self._pinned: dict[str, frozenset[str]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    @classmethod
+    def from_env(cls) -> "SemanticIndex":
+        return cls(
+            threshold=float(
+                os.getenv("SUBAGENT_SEMANTIC_THRESHOLD", DEFAULT_THRESHOLD)
+            ),
+            max_entries=int(os.getenv("SUBAGENT_SEMANTIC_MAX_ENTRIES", "1024")),
+        )
+
+    def search(self, text: str) -> Optional[tuple[str, float]]:
+        """Most similar stored key and its score, if above the threshold."""
+        vector = self.vectorizer.transform(text)
+        pinned = pinned_terms(text)
+        with self._lock:
+            if not self._rows or not vector.any():
+                return None
+            scores = self._vectors[: len(self._rows)] @ vector
+            candidates = np.flatnonzero(scores >= self.threshold)
+            for row in candidates[np.argsort(-scores[candidates])]:
+                key = self._keys[int(row)]
+                if self._pinned[key] == pinned:
+                    self._rows.move_to_end(key)
+                    return key, float(scores[row])
+            return None
+
+    def add(self, key: str, text: str) -> None:
+        vector = self.vectorizer.transform(text)
+        with self._lock:
+            row = self._rows.pop(key, None)
+            if row is None:
+                if len(self._rows) < self.max_entries:
+                    row = len(self._rows)
+                else:
+                    evicted, row = self._rows.popitem(last=False)
+                    del self._pinned[evicted]
+            self._rows[key] = row
+            self._keys[row] = key
+            self._pinned[key] = pinned_terms(text)
+            self._vectors[row] = vector
+
+    def discard(self, key: str) -> None:
+        with self._lock:
+            row = self._rows.pop(key, None)
+            if row is None:
+                return
+            del self._pinned[key]
+            # Keep rows dense: move the last row into the freed slot.
+            last = len(self._rows)
+            if row != last:
+                moved = self._keys[last]
+                self._vectors[row] = self._vectors[last]
+                self._keys[row] = moved
+                self._rows[moved] = row
+            self._vectors[last] = 0
+            del self._keys[last]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._rows.clear()
+            self._keys.clear()
+            self._pinned.clear()
+            self._vectors[:] = 0
@@ -0,0 +1,501 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Session service on a local SQLite database, for long-running processes.
+
+Nothing is kept in memory between calls: sessions are read from the
+database when a run starts and their events are written back as they are
+appended. Writes are buffered and committed together every ``batch_size``
+writes or ``flush_interval`` seconds, and before any read, so a crash loses
+at most the last few events. The async methods run their SQLite work in
+worker threads, so the event loop never waits on the database.
+
+When a new turn starts on a session with more than ``compact_after``
+events, the turns before the last ``keep_turns`` are replaced by a single
+snapshot event that carries the latest ``*_create_output`` results, so the
+coordinator still sees what was produced earlier.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Optional
+
+from google.adk.events import Event
+from google.adk.sessions import BaseSessionService, Session
+from google.adk.sessions.base_session_service import (
+    GetSessionConfig,
+    ListSessionsResponse,
+)
+from google.adk.sessions.state import State
+from google.genai import types
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_AUTHOR = "session_snapshot"
+SNAPSHOT_SUFFIX = "_create_output"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    app_name TEXT NOT NULL,
+    user_id TEXT NOT NULL,
+    id TEXT NOT NULL,
+    state TEXT NOT NULL,
+    last_update_time REAL NOT NULL,
+    PRIMARY KEY (app_name, user_id, id)
+);
+CREATE TABLE IF NOT EXISTS events (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    app_name TEXT NOT NULL,
+    user_id TEXT NOT NULL,
+    session_id TEXT NOT NULL,
+    author TEXT NOT NULL,
+    timestamp REAL NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS events_by_session
+    ON events (app_name, user_id, session_id, seq);
+CREATE TABLE IF NOT EXISTS app_states (
+    app_name TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT NOT NULL,
+    PRIMARY KEY (app_name, key)
+);
+CREATE TABLE IF NOT EXISTS user_states (
+    app_name TEXT NOT NULL,
+    user_id TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT NOT NULL,
+    PRIMARY KEY (app_name, user_id, key)
+);
+"""
+
+_SESSION = "app_name = ? AND user_id = ? AND session_id = ?"
+# Sessions whose event count is remembered between turns.
+_MAX_COUNTED_SESSIONS = 10_000
+
+
+def _session_state(state: dict[str, Any]) -> dict[str, Any]:
+    """The keys stored on the session row; app/user keys have their own."""
+    prefixes = (State.APP_PREFIX, State.USER_PREFIX, State.TEMP_PREFIX)
+    return {k: v for k, v in state.items() if not k.startswith(prefixes)}
+
+
+def snapshot_event(state: dict[str, Any], timestamp: float) -> Optional[Event]:
+    """An event restating the ``*_create_output`` results in ``state``."""
+    outputs = {
+        key: value
+        for key, value in state.items()
+        if key.endswith(SNAPSHOT_SUFFIX) and value
+    }
+    if not outputs:
+        return None
+    text = "Results from earlier in this session:\n\n" + "\n\n".join(
+        f"[{key}]\n{value}" for key, value in outputs.items()
+    )
+    return Event(
+        invocation_id=f"compaction-{uuid.uuid4()}",
+        author=SNAPSHOT_AUTHOR,
+        content=types.Content(role="model", parts=[types.Part(text=text)]),
+        timestamp=timestamp,
+    )
+
+
+class SqliteSessionService(BaseSessionService):
+    """Sessions, events and app/user state in a SQLite database (WAL)."""
+
+    def __init__(
+        self,
+        path: str,
+        batch_size: int = 64,
+        flush_interval: float = 0.5,
+        compact_after: int = 200,
+        keep_turns: int = 4,
+    ):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.compact_after = compact_after
+        self.keep_turns = keep_turns
+        self.compactions = 0
+        self._lock = threading.Lock()
+        self._pending: list[tuple[str, tuple]] = []
+        self._first_pending = 0.0
+        self._flush_timer: Optional[threading.Timer] = None
+        # Events per session since its last compaction check, so that a new
+        # turn only reads the event list when compaction may be due.
+        self._event_counts: OrderedDict[tuple[str, str, str], int] = OrderedDict()
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        # Commits in WAL mode without an fsync each; a power cut may lose the
+        # last transactions but never corrupts the database.
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    @classmethod
+    def from_env(cls) -> Optional["SqliteSessionService"]:
+        """A service on ``SESSION_DB_PATH``, or None when it is not set."""
+        path = os.getenv("SESSION_DB_PATH")
+        if not path:
+            return None
+        return cls(
+            os.path.expanduser(path),
+            batch_size=int(os.getenv("SESSION_DB_BATCH_SIZE", "64")),
+            flush_interval=float(os.getenv("SESSION_DB_FLUSH_INTERVAL", "0.5")),
+            compact_after=int(os.getenv("SESSION_COMPACT_AFTER", "200")),
+            keep_turns=int(os.getenv("SESSION_COMPACT_KEEP_TURNS", "4")),
+        )
+
+    def _write(self, sql: str, params: tuple) -> None:
+        with self._lock:
+            if not self._pending:
+                self._first_pending = time.monotonic()
+                # Commits a burst that ends before ``batch_size`` writes.
+                self._flush_timer = threading.Timer(self.flush_interval, self.flush)
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
+            self._pending.append((sql, params))
+            due = (
+                len(self._pending) >= self.batch_size
+                or time.monotonic() - self._first_pending >= self.flush_interval
+            )
+        if due:
+            self.flush()
+
+    def flush(self) -> None:
+        """Commits the buffered writes in one transaction."""
+        with self._lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            if not self._pending:
+                return
+            pending, self._pending = self._pending, []
+            with self._conn:
+                for sql, params in pending:
+                    self._conn.execute(sql, params)
+
+    def _query(self, sql: str, params: tuple) -> list[tuple]:
+        self.flush()
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def close(self) -> None:
+        self.flush()
+        with self._lock:
+            self._conn.close()
+
+    async def create_session(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        state: Optional[dict[str, Any]] = None,
+        session_id: Optional[str] = None,
+    ) -> Session:
+        return await asyncio.to_thread(
+            self._create_session, app_name, user_id, dict(state or {}), session_id
+        )
+
+    def _create_session(
+        self,
+        app_name: str,
+        user_id: str,
+        state: dict[str, Any],
+        session_id: Optional[str],
+    ) -> Session:
+        session_id = (session_id or "").strip() or str(uuid.uuid4())
+        if self._query(
+            "SELECT 1 FROM sessions WHERE app_name = ? AND user_id = ? AND id = ?",
+            (app_name, user_id, session_id),
+        ):
+            raise ValueError(f"Session {session_id} already exists")
+        session = Session(
+            app_name=app_name,
+            user_id=user_id,
+            id=session_id,
+            state=state,
+            last_update_time=time.time(),
+        )
+        self._apply_shared_state(app_name, user_id, session.state)
+        self._write(
+            "INSERT INTO sessions VALUES (?, ?, ?, ?, ?)",
+            (
+                app_name,
+                user_id,
+                session_id,
+                json.dumps(_session_state(session.state)),
+                session.last_update_time,
+            ),
+        )
+        return self._merge_state(session)
+
+    async def get_session(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        session_id: str,
+        config: Optional[GetSessionConfig] = None,
+    ) -> Optional[Session]:
+        return await asyncio.to_thread(
+            self._get_session, app_name, user_id, session_id, config
+        )
+
+    def _get_session(
+        self,
+        app_name: str,
+        user_id: str,
+        session_id: str,
+        config: Optional[GetSessionConfig],
+    ) -> Optional[Session]:
+        rows = self._query(
+            "SELECT state, last_update_time FROM sessions"
+            " WHERE app_name = ? AND user_id = ? AND id = ?",
+            (app_name, user_id, session_id),
+        )
+        if not rows:
+            return None
+        state, last_update_time = rows[0]
+        session = Session(
+            app_name=app_name,
+            user_id=user_id,
+            id=session_id,
+            state=json.loads(state),
+            last_update_time=last_update_time,
+            events=self._load_events(app_name, user_id, session_id, config),
+        )
+        return self._merge_state(session)
+
+    def _load_events(
+        self,
+        app_name: str,
+        user_id: str,
+        session_id: str,
+        config: Optional[GetSessionConfig],
+    ) -> list[Event]:
+        # Only the requested window is read and parsed.
+        sql = f"SELECT data FROM events WHERE {_SESSION}"
+        params: tuple = (app_name, user_id, session_id)
+        if config and config.after_timestamp:
+            sql += " AND timestamp >= ?"
+            params += (config.after_timestamp,)
+        sql += " ORDER BY seq DESC"
+        if config and config.num_recent_events:
+            sql += " LIMIT ?"
+            params += (config.num_recent_events,)
+        rows = self._query(sql, params)
+        return [Event.model_validate_json(data) for data, in reversed(rows)]
+
+    def _merge_state(self, session: Session) -> Session:
+        rows = self._query(
+            "SELECT key, value FROM app_states WHERE app_name = ?",
+            (session.app_name,),
+        )
+        for key, value in rows:
+            session.state[State.APP_PREFIX + key] = json.loads(value)
+        rows = self._query(
+            "SELECT key, value FROM user_states WHERE app_name = ? AND user_id = ?",
+            (session.app_name, session.user_id),
+        )
+        for key, value in rows:
+            session.state[State.USER_PREFIX + key] = json.loads(value)
+        return session
+
+    def _apply_shared_state(
+        self, app_name: str, user_id: str, delta: dict[str, Any]
+    ) -> None:
+        for key, value in delta.items():
+            if key.startswith(State.APP_PREFIX):
+                self._write(
+                    "INSERT OR REPLACE INTO app_states VALUES (?, ?, ?)",
+                    (app_name, key.removeprefix(State.APP_PREFIX), json.dumps(value)),
+                )
+            elif key.startswith(State.USER_PREFIX):
+                self._write(
+                    "INSERT OR REPLACE INTO user_states VALUES (?, ?, ?, ?)",
+                    (
+                        app_name,
+                        user_id,
+                        key.removeprefix(State.USER_PREFIX),
+                        json.dumps(value),
+                    ),
+                )
+
+    async def list_sessions(
+        self, *, app_name: str, user_id: str
+    ) -> ListSessionsResponse:
+        rows = await asyncio.to_thread(
+            self._query,
+            "SELECT id, last_update_time FROM sessions"
+            " WHERE app_name = ? AND user_id = ?",
+            (app_name, user_id),
+        )
+        return ListSessionsResponse(
+            sessions=[
+                Session(
+                    app_name=app_name,
+                    user_id=user_id,
+                    id=session_id,
+                    last_update_time=last_update_time,
+                )
+                for session_id, last_update_time in rows
+            ]
+        )
+
+    async def delete_session(
+        self, *, app_name: str, user_id: str, session_id: str
+    ) -> None:
+        await asyncio.to_thread(self._delete_session, app_name, user_id, session_id)
+
+    def _delete_session(self, app_name: str, user_id: str, session_id: str) -> None:
+        self._forget_count((app_name, user_id, session_id))
+        self._write(
+            f"DELETE FROM events WHERE {_SESSION}", (app_name, user_id, session_id)
+        )
+        self._write(
+            "DELETE FROM sessions WHERE app_name = ? AND user_id = ? AND id = ?",
+            (app_name, user_id, session_id),
+        )
+
+    async def append_event(self, session: Session, event: Event) -> Event:
+        if event.partial:
+            return event
+        await super().append_event(session=session, event=event)
+        session.last_update_time = event.timestamp
+        # Serialized here, while nothing else can change the session.
+        await asyncio.to_thread(
+            self._store_event,
+            (session.app_name, session.user_id, session.id),
+            event,
+            event.model_dump_json(exclude_none=True),
+            dict(session.state),
+        )
+        return event
+
+    def _store_event(
+        self,
+        key: tuple[str, str, str],
+        event: Event,
+        data: str,
+        state: dict[str, Any],
+    ) -> None:
+        if event.author == "user" and self._event_count(key) > self.compact_after:
+            # A new turn: the previous invocation is complete and can be
+            # folded into a snapshot without splitting tool call pairs.
+            self.compact(*key, state=state)
+        if event.actions and event.actions.state_delta:
+            self._apply_shared_state(key[0], key[1], event.actions.state_delta)
+        self._write(
+            "INSERT INTO events (app_name, user_id, session_id, author,"
+            " timestamp, data) VALUES (?, ?, ?, ?, ?, ?)",
+            key + (event.author, event.timestamp, data),
+        )
+        self._write(
+            "UPDATE sessions SET state = ?, last_update_time = ?"
+            " WHERE app_name = ? AND user_id = ? AND id = ?",
+            (json.dumps(_session_state(state)), event.timestamp) + key,
+        )
+        with self._lock:
+            if key in self._event_counts:
+                self._event_counts[key] += 1
+
+    def _event_count(self, key: tuple[str, str, str]) -> int:
+        with self._lock:
+            count = self._event_counts.get(key)
+            if count is not None:
+                self._event_counts.move_to_end(key)
+                return count
+        rows = self._query(f"SELECT COUNT(*) FROM events WHERE {_SESSION}", key)
+        self._set_count(key, rows[0][0])
+        return rows[0][0]
+
+    def _set_count(self, key: tuple[str, str, str], count: int) -> None:
+        with self._lock:
+            self._event_counts[key] = count
+            self._event_counts.move_to_end(key)
+            while len(self._event_counts) > _MAX_COUNTED_SESSIONS:
+                self._event_counts.popitem(last=False)
+
+    def _forget_count(self, key: tuple[str, str, str]) -> None:
+        with self._lock:
+            self._event_counts.pop(key, None)
+
+    def compact(
+        self,
+        app_name: str,
+        user_id: str,
+        session_id: str,
+        state: Optional[dict[str, Any]] = None,
+    ) -> bool:
+        """Folds all but the last ``keep_turns`` turns into a snapshot event."""
+        key = (app_name, user_id, session_id)
+        rows = self._query(
+            f"SELECT seq, author, timestamp FROM events WHERE {_SESSION}"
+            " ORDER BY seq",
+            key,
+        )
+        self._set_count(key, len(rows))
+        if len(rows) <= self.compact_after:
+            return False
+        turns = [seq for seq, author, _ in rows if author == "user"]
+        if len(turns) <= self.keep_turns:
+            return False
+        boundary = turns[-self.keep_turns] if self.keep_turns else rows[-1][0] + 1
+        first = rows[0][0]
+        folded = [row for row in rows if row[0] < boundary]
+        if state is None:
+            session_rows = self._query(
+                "SELECT state FROM sessions"
+                " WHERE app_name = ? AND user_id = ? AND id = ?",
+                key,
+            )
+            state = json.loads(session_rows[0][0]) if session_rows else {}
+        snapshot = snapshot_event(state, folded[-1][2])
+        # The snapshot takes over the sequence number of the oldest folded
+        # event, which keeps it in front of the turns that are kept.
+        self._write(
+            f"DELETE FROM events WHERE {_SESSION} AND seq > ? AND seq < ?",
+            key + (first, boundary),
+        )
+        if snapshot is None:
+            self._write("DELETE FROM events WHERE seq = ?", (first,))
+        else:
+            self._write(
+                "UPDATE events SET author = ?, timestamp = ?, data = ?"
+                " WHERE seq = ?",
+                (
+                    snapshot.author,
+                    snapshot.timestamp,
+                    snapshot.model_dump_json(exclude_none=True),
+                    first,
+                ),
+            )
+        self.flush()
+        self._set_count(
+            key, len(rows) - len(folded) + (0 if snapshot is None else 1)
+        )
+        self.compactions += 1
+        logger.info(
+            "Compacted %d events of session %s", len(folded), session_id
+        )
+        return True
@@ -0,0 +1,23 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""brand_package_agent: for creating a full brand package in one shot"""
+
+import importlib
+
+
+def __getattr__(name: str):
+    if name == "brand_package_agent":
+        return importlib.import_module(".agent", __name__).brand_package_agent
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,180 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""brand_package_agent: for creating a full brand package in one shot
+
+The domain is chosen first; the website, marketing and logo stages only depend
+on that domain, so they run concurrently and the package takes roughly as long
+as the slowest stage instead of the sum of all three.
+"""
+
+import re
+from typing import AsyncGenerator, Optional, Sequence
+
+from google.adk.agents import BaseAgent, LlmAgent, ParallelAgent, SequentialAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event, EventActions
+from google.genai import types
+
+from ...shared_libraries.handoff import SELECTED_DOMAIN_KEY
+from ..domain_create import domain_create_agent
+from ..logo_create import logo_create_agent
+from ..marketing_create import marketing_create_agent
+from ..website_create import website_create_agent
+
+BRAND_PACKAGE_OUTPUT_KEY = "brand_package_output"
+
+_DOMAIN_PATTERN = re.compile(
+    r"\b((?:[a-z0-9](?:[a-z0-9-]*[a-z0-9])?\.)+[a-z]{2,})\b", re.IGNORECASE
+)
+
+
+def _text_event(
+    ctx: InvocationContext, author: str, text: str, state_delta: dict
+) -> Event:
+    return Event(
+        invocation_id=ctx.invocation_id,
+        author=author,
+        branch=ctx.branch,
+        content=types.Content(role="model", parts=[types.Part(text=text)]),
+        actions=EventActions(state_delta=state_delta),
+    )
+
+
+class DomainSelectAgent(BaseAgent):
+    """Picks the first suggested domain so the asset stages can start.
+
+    Without a domain there is nothing to build the assets for, so the agent
+    escalates and the pipeline ends with its explanation instead.
+    """
+
+    source_key: str = "domain_create_output"
+    output_key: str = SELECTED_DOMAIN_KEY
+
+    async def _run_async_impl(
+        self, ctx: InvocationContext
+    ) -> AsyncGenerator[Event, None]:
+        suggestions = str(ctx.session.state.get(self.source_key) or "")
+        match = _DOMAIN_PATTERN.search(suggestions)
+        if match is None:
+            text = (
+                "No domain could be selected from the domain suggestions, so "
+                "the website, marketing strategy and logo were not created. "
+                "Ask the user for a domain or for different brand keywords."
+            )
+            event = _text_event(ctx, self.name, text, {})
+            event.actions.escalate = True
+            yield event
+            return
+        domain = match.group(1).lower()
+        text = f"Selected domain for the brand package: {domain}"
+        yield _text_event(ctx, self.name, text, {self.output_key: domain})
+
+
+class BrandPackageMergeAgent(BaseAgent):
+    """Merges the stage outputs (by output_key) into a single response."""
+
+    sections: dict[str, str]
+    output_key: str = BRAND_PACKAGE_OUTPUT_KEY
+
+    async def _run_async_impl(
+        self, ctx: InvocationContext
+    ) -> AsyncGenerator[Event, None]:
+        state = ctx.session.state
+        parts = []
+        domain = state.get(SELECTED_DOMAIN_KEY)
+        if domain:
+            parts.append(f"## Domain\n\n{domain}")
+        for key, title in self.sections.items():
+            value = state.get(key)
+            if value:
+                parts.append(f"## {title}\n\n{value}")
+        text = "\n\n".join(parts) or "The brand package produced no output."
+        yield _text_event(ctx, self.name, text, {self.output_key: text})
+
+
+class BrandPackagePipeline(SequentialAgent):
+    """Runs its stages in order and stops after a stage escalates."""
+
+    async def _run_async_impl(
+        self, ctx: InvocationContext
+    ) -> AsyncGenerator[Event, None]:
+        for sub_agent in self.sub_agents:
+            escalated = False
+            async for event in sub_agent.run_async(ctx):
+                escalated = escalated or bool(event.actions.escalate)
+                yield event
+            if escalated:
+                return
+
+
+def _package_stage(agent: LlmAgent) -> LlmAgent:
+    """Copies ``agent`` so it can live in the package tree.
+
+    An agent can only have one parent and the originals stay reachable through
+    the coordinator's AgentTools. Transfers are disabled because parallel
+    branches must not hand control to one another.
+    """
+    return agent.model_copy(
+        update={
+            "parent_agent": None,
+            "disallow_transfer_to_parent": True,
+            "disallow_transfer_to_peers": True,
+        }
+    )
+
+
+def create_brand_package_agent(
+    domain_agent: LlmAgent,
+    asset_agents: Sequence[LlmAgent],
+    name: str = "brand_package_agent",
+    titles: Optional[dict[str, str]] = None,
+) -> BrandPackagePipeline:
+    """Builds the domain -> parallel assets -> merge pipeline."""
+    titles = titles or {}
+    stages = [_package_stage(agent) for agent in asset_agents]
+    sections = {
+        agent.output_key: titles.get(agent.output_key, agent.name)
+        for agent in stages
+        if agent.output_key
+    }
+    return BrandPackagePipeline(
+        name=name,
+        description=(
+            "Create a full brand package in one step: suggest a domain, then "
+            "build the website, the marketing strategy and the logo for it "
+            "concurrently. Use it when the user wants everything at once."
+        ),
+        sub_agents=[
+            _package_stage(domain_agent),
+            DomainSelectAgent(
+                name="domain_select_agent", source_key=domain_agent.output_key
+            ),
+            ParallelAgent(name="brand_assets_agent", sub_agents=stages),
+            BrandPackageMergeAgent(
+                name="brand_package_merge_agent", sections=sections
+            ),
+        ],
+    )
+
+
+brand_package_agent = create_brand_package_agent(
+    domain_create_agent,
+    [website_create_agent, marketing_create_agent, logo_create_agent],
+    titles={
+        "website_create_output": "Website",
+        "marketing_create_output": "Marketing Strategy",
+        "logo_create_output": "Logo",
+    },
+)
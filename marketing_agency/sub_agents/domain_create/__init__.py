@@ -14,4 +14,10 @@
 
 """Domain_create_agent: for suggesting meanigful DNS domain"""
 
-from .agent import domain_create_agent
+import importlib
+
+
+def __getattr__(name: str):
+    if name == "domain_create_agent":
+        return importlib.import_module(".agent", __name__).domain_create_agent
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -15,16 +15,17 @@
 """Domain_create_agent: for suggesting meanigful DNS domain"""
 
 from google.adk import Agent
-from google.adk.tools import google_search
 
+from ...shared_libraries.model_registry import model_for
 from . import prompt
+from .tools import check_domains, suggest_domains
 
-MODEL = "gemini-2.5-pro-preview-05-06" 
+MODEL = model_for("domain_create_agent")
 
 domain_create_agent = Agent(
     model=MODEL,
     name="domain_create_agent",
     instruction=prompt.DOMAIN_CREATE_PROMPT,
     output_key="domain_create_output",
-    tools=[google_search],
+    tools=[suggest_domains, check_domains],
 )
@@ -0,0 +1,190 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Local domain candidate generation and ranking.
+
+Expands brand keywords into thousands of candidate domains (affixes, blends
+and TLD variants) and ranks them with vectorized features, so the model only
+has to curate the top few instead of brainstorming the whole pool.
+"""
+
+import re
+from typing import Iterable
+
+import numpy as np
+
+from ...shared_libraries.semantic_cache import fold
+
+PREFIXES = ("get", "try", "go", "my", "the", "hey", "use", "join", "we", "all")
+SUFFIXES = (
+    "ly", "ify", "hub", "lab", "labs", "hq", "co", "app", "studio", "works",
+    "base", "nest", "spot", "wise", "zen", "go", "now", "pro", "box", "kit",
+)
+TLD_WEIGHTS = {"com": 1.0, "co": 0.8, "io": 0.8, "app": 0.7, "net": 0.6}
+
+# Small sample of common English words; only used to estimate which letter
+# pairs read naturally.
+_BIGRAM_CORPUS = """
+about above across after again against air all almost along also always among
+and animal answer any around ask away back base beautiful because become before
+begin being below best better between big black blue body book both bring brown
+build business but call came can care carry center change children city clean
+close cold color come common company complete could country course create cut
+dark day deep design different direction does done door down draw dream drive
+during each early earth easy eat energy even ever every example face fact fall
+family far fast father feel field find fine fire first fish five food foot form
+found four free fresh friend from front full game garden general give good great
+green ground group grow hand happy hard have head hear heart heavy help here high
+home hope horse hot house idea important inside island just keep kind king land
+language large last later learn leave left letter life light like line list
+little live long look love made make market matter mean might mind money more
+morning mother mountain move music name nature near need never next night north
+nothing number ocean often open order other over page paper part people perhaps
+picture place plan plant play point power press problem product question quick
+rain reach read ready real record river road rock room round rule same school
+science second seem sentence service shape short should show side simple since
+small smart social something sound south space special spring stand star start
+state still stone story street strong study such summer sun sure system table
+take talk teach team tell thing think those thought through time today together
+too travel tree true turn under unit until upon usual very voice walk want warm
+watch water wave way weather well west where while white whole wind window
+winter with wonder wood word work world would write year young
+"""
+
+_ALPHABET = "abcdefghijklmnopqrstuvwxyz0123456789"
+_BOUNDARY = len(_ALPHABET)
+_SYMBOLS = _BOUNDARY + 1
+_LABEL_RE = re.compile(r"[^a-z0-9]+")
+_TLD_RE = re.compile(r"\.[a-z]{2,63}$")
+
+
+def _bigram_log_probs() -> np.ndarray:
+    counts = np.ones((_SYMBOLS, _SYMBOLS))
+    for word in _BIGRAM_CORPUS.split():
+        codes = [_BOUNDARY] + [_ALPHABET.index(c) for c in word] + [_BOUNDARY]
+        np.add.at(counts, (codes[:-1], codes[1:]), 1)
+    return np.log(counts / counts.sum(axis=1, keepdims=True))
+
+
+_BIGRAM_LOG_PROBS = _bigram_log_probs()
+
+
+def normalize_keywords(keywords: Iterable[str]) -> list[str]:
+    """Splits keywords into lower-case, accent-free alphanumeric words.
+
+    A trailing TLD is dropped, so "ecotech.com" gives "ecotech".
+    """
+    words = []
+    for keyword in keywords:
+        keyword = _TLD_RE.sub("", fold(keyword).strip())
+        for word in _LABEL_RE.split(keyword):
+            if len(word) > 1 and word not in words:
+                words.append(word)
+    return words
+
+
+def _blends(first: str, second: str) -> Iterable[str]:
+    # Overlapping portmanteaus ("brew" + "wave" -> "brewave") and half splices.
+    for size in range(1, min(len(first), len(second)) - 1):
+        if first.endswith(second[:size]):
+            yield first + second[size:]
+    if len(first) > 3 and len(second) > 3:
+        yield first[: (len(first) + 1) // 2] + second[len(second) // 2 :]
+        yield first + second[len(second) // 2 :]
+
+
+def generate_labels(keywords: list[str]) -> list[str]:
+    """Expands keywords into second-level labels (without a TLD)."""
+    stems = list(keywords)
+    for first in keywords:
+        for second in keywords:
+            if first != second:
+                stems.append(first + second)
+                stems.extend(_blends(first, second))
+    labels = list(stems)
+    for stem in stems:
+        labels.extend(prefix + stem for prefix in PREFIXES)
+        labels.extend(stem + suffix for suffix in SUFFIXES)
+    return [label for label in dict.fromkeys(labels) if 3 <= len(label) <= 20]
+
+
+def _encode(labels: list[str]) -> tuple[np.ndarray, np.ndarray]:
+    """Encodes labels as a padded symbol matrix with boundary markers."""
+    lengths = np.fromiter((len(label) for label in labels), int, len(labels))
+    width = int(lengths.max()) + 2
+    codes = np.full((len(labels), width), _BOUNDARY, dtype=np.int64)
+    lookup = np.full(128, _BOUNDARY, dtype=np.int64)
+    lookup[np.frombuffer(_ALPHABET.encode(), dtype=np.uint8)] = np.arange(
+        len(_ALPHABET)
+    )
+    for row, label in enumerate(labels):
+        codes[row, 1 : len(label) + 1] = lookup[
+            np.frombuffer(label.encode("ascii"), dtype=np.uint8)
+        ]
+    return codes, lengths
+
+
+def score_labels(labels: list[str], keywords: list[str]) -> np.ndarray:
+    """Scores labels on length, pronounceability and keyword coverage."""
+    codes, lengths = _encode(labels)
+
+    # Mean bigram log-probability over the real bigrams (label plus its two
+    # boundaries); padding bigrams are masked out.
+    bigram_scores = _BIGRAM_LOG_PROBS[codes[:, :-1], codes[:, 1:]]
+    positions = np.arange(codes.shape[1] - 1)
+    mask = positions[None, :] <= lengths[:, None]
+    pronounceability = (bigram_scores * mask).sum(axis=1) / (lengths + 1)
+    spread = np.ptp(pronounceability) or 1.0
+    pronounceability = (pronounceability - pronounceability.min()) / spread
+
+    # Short names are easier to type and remember; 6-10 letters is the sweet
+    # spot, anything longer decays quickly.
+    length_score = np.exp(-(np.maximum(lengths - 8, 0) / 5.0) ** 2)
+    length_score *= np.minimum(lengths / 5.0, 1.0)
+
+    label_array = np.array(labels)
+    coverage = np.zeros(len(labels))
+    for keyword in keywords:
+        coverage += np.char.find(label_array, keyword) >= 0
+    coverage /= max(len(keywords), 1)
+
+    return 0.4 * pronounceability + 0.3 * length_score + 0.3 * coverage
+
+
+def rank_candidates(keywords: Iterable[str], top_k: int = 50) -> list[str]:
+    """Returns the ``top_k`` best domains generated from ``keywords``."""
+    words = normalize_keywords(keywords)
+    if not words:
+        return []
+    labels = generate_labels(words)
+    if not labels:
+        # e.g. a single keyword too long for any label.
+        return []
+    label_scores = score_labels(labels, words)
+
+    tlds = list(TLD_WEIGHTS)
+    tld_weights = np.array([TLD_WEIGHTS[tld] for tld in tlds])
+    # One row per label, one column per TLD: shorter TLD lists keep the
+    # ranking dominated by the label itself.
+    scores = label_scores[:, None] * (0.8 + 0.2 * tld_weights[None, :])
+    flat = scores.ravel()
+    top_k = min(top_k, flat.size)
+    best = np.argpartition(-flat, top_k - 1)[:top_k]
+    best = best[np.argsort(-flat[best], kind="stable")]
+    return [f"{labels[i // len(tlds)]}.{tlds[i % len(tlds)]}" for i in best]
+
+
+def count_candidates(keywords: Iterable[str]) -> int:
+    """Number of domains ``rank_candidates`` chooses from."""
+    return len(generate_labels(normalize_keywords(keywords))) * len(TLD_WEIGHTS)
@@ -0,0 +1,201 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Memory-mapped index of registered domains for offline "taken" checks.
+
+The index file holds a Bloom filter followed by a sorted table of domains.
+Most made-up candidates are answered by the Bloom filter alone; the rare
+positives are confirmed with a binary search over the memory-mapped table, so
+lookups never touch the network and the file is shared between processes
+through the page cache.
+
+Build one from zone files or plain domain lists:
+
+    python -m marketing_agency.sub_agents.domain_create.index build \\
+        com.zone net.zone -o registered.idx
+"""
+
+import argparse
+import hashlib
+import math
+import mmap
+import struct
+import sys
+from array import array
+from pathlib import Path
+from typing import Iterable, Union
+
+from .resolvers import read_zone_file
+
+MAGIC = b"MADIDX01"
+# magic, domain count, bloom bits, bloom hash count, offsets/blob/bloom positions
+_HEADER = struct.Struct("<8sQQIxxxxQQQ")
+_OFFSET = struct.Struct("<Q")
+
+
+def _bloom_positions(domain: bytes, bits: int, hashes: int) -> Iterable[int]:
+    digest = hashlib.blake2b(domain, digest_size=16).digest()
+    h1 = int.from_bytes(digest[:8], "little")
+    h2 = int.from_bytes(digest[8:], "little") | 1
+    return ((h1 + i * h2) % bits for i in range(hashes))
+
+
+def _bloom_size(count: int, false_positive_rate: float) -> tuple[int, int]:
+    count = max(count, 1)
+    bits = math.ceil(-count * math.log(false_positive_rate) / math.log(2) ** 2)
+    bits = max(64, (bits + 7) // 8 * 8)
+    hashes = max(1, round(bits / count * math.log(2)))
+    return bits, hashes
+
+
+def build_index(
+    domains: Iterable[str],
+    path: Union[str, Path],
+    false_positive_rate: float = 0.01,
+) -> int:
+    """Writes the index for ``domains`` to ``path`` and returns its size."""
+    table = sorted({domain.strip().lower().encode("utf-8") for domain in domains})
+    table = [domain for domain in table if domain]
+    bits, hashes = _bloom_size(len(table), false_positive_rate)
+
+    bloom = bytearray(bits // 8)
+    for domain in table:
+        for position in _bloom_positions(domain, bits, hashes):
+            bloom[position >> 3] |= 1 << (position & 7)
+
+    offsets = array("Q", [0])
+    for domain in table:
+        offsets.append(offsets[-1] + len(domain))
+    offsets_pos = _HEADER.size
+    blob_pos = offsets_pos + len(offsets) * _OFFSET.size
+    bloom_pos = blob_pos + offsets[-1]
+    if sys.byteorder != "little":
+        offsets.byteswap()
+
+    with open(path, "wb") as out:
+        out.write(
+            _HEADER.pack(
+                MAGIC, len(table), bits, hashes, offsets_pos, blob_pos, bloom_pos
+            )
+        )
+        out.write(offsets.tobytes())
+        for domain in table:
+            out.write(domain)
+        out.write(bloom)
+    return bloom_pos + len(bloom)
+
+
+class DomainIndex:
+    """Read-only view of an index file built by ``build_index``."""
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        with open(self.path, "rb") as index_file:
+            self._mmap = mmap.mmap(index_file.fileno(), 0, access=mmap.ACCESS_READ)
+        (
+            magic,
+            self.count,
+            self._bits,
+            self._hashes,
+            self._offsets_pos,
+            self._blob_pos,
+            self._bloom_pos,
+        ) = _HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC:
+            self._mmap.close()
+            raise ValueError(f"{self.path} is not a domain index file")
+        self.bloom_rejections = 0
+        self.table_lookups = 0
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __contains__(self, domain: str) -> bool:
+        key = domain.strip().lower().encode("utf-8")
+        if not self._maybe_contains(key):
+            self.bloom_rejections += 1
+            return False
+        self.table_lookups += 1
+        return self._search(key)
+
+    def close(self) -> None:
+        self._mmap.close()
+
+    def __enter__(self) -> "DomainIndex":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _maybe_contains(self, key: bytes) -> bool:
+        bloom_pos = self._bloom_pos
+        data = self._mmap
+        for position in _bloom_positions(key, self._bits, self._hashes):
+            if not data[bloom_pos + (position >> 3)] & (1 << (position & 7)):
+                return False
+        return True
+
+    def _entry(self, i: int) -> bytes:
+        start, end = struct.unpack_from(
+            "<QQ", self._mmap, self._offsets_pos + i * _OFFSET.size
+        )
+        return self._mmap[self._blob_pos + start : self._blob_pos + end]
+
+    def _search(self, key: bytes) -> bool:
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            entry = self._entry(mid)
+            if entry == key:
+                return True
+            if entry < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return False
+
+
+def _read_sources(paths: Iterable[str]) -> Iterable[str]:
+    for path in paths:
+        yield from read_zone_file(Path(path))
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+    build = commands.add_parser("build", help="build an index from zone files")
+    build.add_argument("sources", nargs="+", help="zone files or domain lists")
+    build.add_argument("-o", "--output", required=True, help="index file to write")
+    build.add_argument("--false-positive-rate", type=float, default=0.01)
+    lookup = commands.add_parser("lookup", help="check domains against an index")
+    lookup.add_argument("index", help="index file")
+    lookup.add_argument("domains", nargs="+")
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        size = build_index(
+            _read_sources(args.sources), args.output, args.false_positive_rate
+        )
+        with DomainIndex(args.output) as index:
+            print(f"Indexed {len(index)} domains into {args.output} ({size} bytes)")
+        return 0
+
+    with DomainIndex(args.index) as index:
+        for domain in args.domains:
+            print(f"{domain}\t{'taken' if domain in index else 'not indexed'}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
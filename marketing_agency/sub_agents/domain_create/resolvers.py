@@ -0,0 +1,264 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Pluggable backends that decide whether a domain is already registered."""
+
+import asyncio
+import os
+import socket
+import time
+import weakref
+from abc import ABC, abstractmethod
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import Iterable, Optional
+
+import httpx
+
+AVAILABLE = "available"
+TAKEN = "taken"
+UNKNOWN = "unknown"
+
+# IANA's registry of RDAP servers per TLD (RFC 9224).
+RDAP_BOOTSTRAP_URL = "https://data.iana.org/rdap/dns.json"
+RDAP_BOOTSTRAP_TTL = 24 * 60 * 60
+
+
+class DomainResolver(ABC):
+    """Base class for availability backends.
+
+    Subclasses implement ``check`` for a single domain; ``check_batch`` fans a
+    whole batch out concurrently and can be overridden to share a connection.
+    """
+
+    def __init__(self, concurrency: int = 20, timeout: float = 5.0):
+        self.concurrency = concurrency
+        self.timeout = timeout
+
+    @abstractmethod
+    async def check(self, domain: str) -> str:
+        """Returns AVAILABLE, TAKEN or UNKNOWN for ``domain``."""
+
+    def _check_timeout(self) -> float:
+        """Time allowed for one ``check``, retries included."""
+        return self.timeout
+
+    async def check_batch(self, domains: Iterable[str]) -> dict[str, str]:
+        """Checks ``domains`` concurrently and returns a verdict per domain."""
+        return await self._gather(domains, self.check)
+
+    async def _gather(self, domains, check) -> dict[str, str]:
+        slots = asyncio.Semaphore(self.concurrency)
+
+        async def _check(domain: str) -> str:
+            async with slots:
+                try:
+                    return await asyncio.wait_for(
+                        check(domain), self._check_timeout()
+                    )
+                except (asyncio.TimeoutError, OSError, httpx.HTTPError):
+                    return UNKNOWN
+
+        domains = list(domains)
+        verdicts = await asyncio.gather(*(_check(domain) for domain in domains))
+        return dict(zip(domains, verdicts))
+
+
+class DnsResolver(DomainResolver):
+    """Treats a domain that resolves as taken and NXDOMAIN as available.
+
+    Cheap and dependency free, but a registered domain without address records
+    looks available; prefer RdapResolver where the network allows it.
+    """
+
+    async def check(self, domain: str) -> str:
+        loop = asyncio.get_running_loop()
+        try:
+            await loop.getaddrinfo(domain, None)
+        except socket.gaierror as e:
+            if e.errno == socket.EAI_NONAME:
+                return AVAILABLE
+            return UNKNOWN
+        return TAKEN
+
+
+def retry_after_seconds(value: Optional[str]) -> Optional[float]:
+    """Parses a Retry-After header: delta seconds or an HTTP date."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class RdapResolver(DomainResolver):
+    """Asks the registry through RDAP: 404 means the domain is unregistered.
+
+    Each TLD's RDAP server comes from the IANA bootstrap registry. TLDs that
+    are not covered (many ccTLDs run no RDAP service) are reported as
+    UNKNOWN instead of taking a redirector's 404 for an available domain.
+    Registries rate-limit RDAP, so only a few lookups run at once and a 429
+    pauses every lookup to that server for its ``Retry-After``.
+    """
+
+    def __init__(
+        self,
+        bootstrap_url: str = RDAP_BOOTSTRAP_URL,
+        concurrency: int = 4,
+        retries: int = 2,
+        max_retry_after: float = 10.0,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        **kwargs,
+    ):
+        super().__init__(concurrency=concurrency, **kwargs)
+        self.bootstrap_url = bootstrap_url
+        self.retries = retries
+        self.max_retry_after = max_retry_after
+        self.transport = transport
+        self._servers: dict[str, str] = {}
+        self._servers_loaded_at: Optional[float] = None
+        # One lock per event loop; the resolver outlives asyncio.run calls.
+        self._servers_locks: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+        self._resume_at: dict[str, float] = {}
+
+    def _client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(follow_redirects=True, transport=self.transport)
+
+    def _check_timeout(self) -> float:
+        return (self.retries + 1) * self.timeout + self.retries * self.max_retry_after
+
+    async def check(self, domain: str) -> str:
+        async with self._client() as client:
+            await self._load_servers(client)
+            return await self._query(client, domain)
+
+    async def check_batch(self, domains: Iterable[str]) -> dict[str, str]:
+        domains = list(domains)
+        # One client per batch so every lookup reuses the same connections.
+        async with self._client() as client:
+            try:
+                await self._load_servers(client)
+            except (OSError, httpx.HTTPError, ValueError):
+                return {domain: UNKNOWN for domain in domains}
+            return await self._gather(
+                domains, lambda domain: self._query(client, domain)
+            )
+
+    async def _load_servers(self, client: httpx.AsyncClient) -> None:
+        """Fetches the TLD to RDAP server map, at most once per TTL."""
+        loop = asyncio.get_running_loop()
+        lock = self._servers_locks.get(loop)
+        if lock is None:
+            lock = self._servers_locks[loop] = asyncio.Lock()
+        async with lock:
+            if (
+                self._servers_loaded_at is not None
+                and time.monotonic() - self._servers_loaded_at < RDAP_BOOTSTRAP_TTL
+            ):
+                return
+            response = await client.get(self.bootstrap_url, timeout=self.timeout)
+            response.raise_for_status()
+            servers = {}
+            for tlds, urls in response.json().get("services", []):
+                # Prefer HTTPS; base URLs end with a slash.
+                url = sorted(urls, key=lambda u: not u.startswith("https:"))[0]
+                for tld in tlds:
+                    servers[tld.lower()] = url.rstrip("/") + "/"
+            self._servers = servers
+            self._servers_loaded_at = time.monotonic()
+
+    async def _query(self, client: httpx.AsyncClient, domain: str) -> str:
+        server = self._servers.get(domain.rsplit(".", 1)[-1])
+        if server is None:
+            return UNKNOWN
+        for attempt in range(self.retries + 1):
+            pause = self._resume_at.get(server, 0.0) - time.monotonic()
+            if pause > 0:
+                await asyncio.sleep(pause)
+            response = await client.get(
+                f"{server}domain/{domain}", timeout=self.timeout
+            )
+            if response.status_code == 404:
+                return AVAILABLE
+            if response.status_code == 200:
+                return TAKEN
+            if response.status_code not in (429, 503) or attempt == self.retries:
+                break
+            delay = retry_after_seconds(response.headers.get("Retry-After"))
+            delay = min(self.max_retry_after, 2.0**attempt if delay is None else delay)
+            self._resume_at[server] = max(
+                self._resume_at.get(server, 0.0), time.monotonic() + delay
+            )
+        return UNKNOWN
+
+
+def read_zone_file(path: Path) -> set[str]:
+    """Reads registered domains from a zone file or a one-per-line list.
+
+    Zone files list owner names in the first column; relative names are
+    completed with the current ``$ORIGIN``. Lines that start with whitespace
+    repeat the previous owner, and lines inside ``( ... )`` continue a
+    record, so neither names a domain.
+    """
+    domains = set()
+    origin = ""
+    depth = 0
+    with open(path, encoding="utf-8") as zone:
+        for line in zone:
+            line = line.split(";", 1)[0].rstrip()
+            continued = depth > 0 or line[:1].isspace()
+            depth = max(0, depth + line.count("(") - line.count(")"))
+            if continued or not line:
+                continue
+            fields = line.split()
+            if fields[0].upper() == "$ORIGIN" and len(fields) > 1:
+                origin = fields[1].strip(".").lower()
+                continue
+            if fields[0].startswith(("$", "@")):
+                continue
+            name = fields[0].lower()
+            if name.endswith("."):
+                name = name[:-1]
+            elif origin:
+                name = f"{name}.{origin}"
+            domains.add(name)
+    return domains
+
+
+class ZoneFileResolver(DomainResolver):
+    """Offline stand-in that answers from a local zone file snapshot."""
+
+    def __init__(self, path: Path, **kwargs):
+        super().__init__(**kwargs)
+        self.registered = read_zone_file(Path(path))
+
+    async def check(self, domain: str) -> str:
+        return TAKEN if domain in self.registered else AVAILABLE
+
+
+def resolver_from_env() -> DomainResolver:
+    """Builds the backend named by DOMAIN_RESOLVER: rdap, dns or zonefile:PATH."""
+    name = os.getenv("DOMAIN_RESOLVER", "rdap")
+    if name.startswith("zonefile:"):
+        return ZoneFileResolver(Path(name.split(":", 1)[1]))
+    if name == "dns":
+        return DnsResolver()
+    if name == "rdap":
+        return RdapResolver()
+    raise ValueError(f"Unknown DOMAIN_RESOLVER: {name}")
@@ -0,0 +1,135 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tools for the domain_create_agent."""
+
+import os
+import re
+from typing import Optional
+
+from . import candidates, resolvers
+from .index import DomainIndex
+from .verdict_cache import VerdictCache
+
+_DOMAIN_RE = re.compile(r"^(?:[a-z0-9](?:[a-z0-9-]{0,61}[a-z0-9])?\.)+[a-z]{2,63}$")
+
+# Built on first use, so that importing the agent neither opens files nor
+# fails on a misconfigured environment.
+resolver: Optional[resolvers.DomainResolver] = None
+verdict_cache: Optional[VerdictCache] = None
+
+# Optional local snapshot of registered domains (see index.py). Candidates it
+# contains are rejected as taken before any remote verification.
+registered_index: Optional[DomainIndex] = None
+_index_loaded = False
+
+
+def _get_resolver() -> resolvers.DomainResolver:
+    global resolver
+    if resolver is None:
+        resolver = resolvers.resolver_from_env()
+    return resolver
+
+
+def _get_verdict_cache() -> VerdictCache:
+    global verdict_cache
+    if verdict_cache is None:
+        verdict_cache = VerdictCache.from_env()
+    return verdict_cache
+
+
+def _get_registered_index() -> Optional[DomainIndex]:
+    global registered_index, _index_loaded
+    if registered_index is None and not _index_loaded:
+        if os.getenv("DOMAIN_INDEX_PATH"):
+            registered_index = DomainIndex(os.environ["DOMAIN_INDEX_PATH"])
+        _index_loaded = True
+    return registered_index
+
+
+def normalize_domain(candidate: str) -> Optional[str]:
+    """Lower-cases and strips scheme, ``www.`` and paths; None if invalid."""
+    domain = candidate.strip().lower()
+    domain = re.sub(r"^[a-z]+://", "", domain).split("/", 1)[0].rstrip(".")
+    if domain.startswith("www."):
+        domain = domain[4:]
+    if len(domain) > 253 or not _DOMAIN_RE.match(domain):
+        return None
+    return domain
+
+
+def suggest_domains(keywords: list[str], top_k: int = 50) -> dict:
+    """Generates and ranks domain candidates for the brand keywords.
+
+    Thousands of combinations (prefixes, suffixes, blends and TLD variants)
+    are scored locally on length, pronounceability and keyword coverage, and
+    only the best ones are returned.
+
+    Args:
+        keywords: Brand keywords, e.g. ["brew", "bean", "coffee"].
+        top_k: How many ranked candidates to return.
+
+    Returns:
+        The ranked candidates, best first, and how many were considered.
+    """
+    top_k = max(1, min(int(top_k), 200))
+    return {
+        "status": "success",
+        "candidates": candidates.rank_candidates(keywords, top_k),
+        "considered": candidates.count_candidates(keywords),
+    }
+
+
+async def check_domains(candidates: list[str]) -> dict:
+    """Checks the availability of a whole batch of candidate domains at once.
+
+    Pass every candidate you are considering in a single call; they are all
+    verified concurrently.
+
+    Args:
+        candidates: Domain names to check, e.g. ["brewbean.com", "beanly.io"].
+
+    Returns:
+        The candidates grouped by verdict: available, taken, unknown and
+        invalid.
+    """
+    domains = []
+    invalid = []
+    for candidate in candidates:
+        domain = normalize_domain(candidate)
+        if domain is None:
+            invalid.append(candidate)
+        elif domain not in domains:
+            domains.append(domain)
+
+    verdicts = {}
+    domain_index = _get_registered_index()
+    if domain_index is not None:
+        verdicts = {d: resolvers.TAKEN for d in domains if d in domain_index}
+    pending = [d for d in domains if d not in verdicts]
+    cache = _get_verdict_cache()
+    verdicts.update(await cache.get_many_async(pending))
+    remote = await _get_resolver().check_batch(
+        [d for d in pending if d not in verdicts]
+    )
+    await cache.put_many_async(remote)
+    verdicts.update(remote)
+
+    return {
+        "status": "success",
+        "available": [d for d in domains if verdicts[d] == resolvers.AVAILABLE],
+        "taken": [d for d in domains if verdicts[d] == resolvers.TAKEN],
+        "unknown": [d for d in domains if verdicts[d] == resolvers.UNKNOWN],
+        "invalid": invalid,
+    }
@@ -0,0 +1,176 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Process-wide cache of domain availability verdicts."""
+
+import asyncio
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Iterable, Optional
+
+from .resolvers import AVAILABLE, TAKEN
+
+DEFAULT_POSITIVE_TTL = 24 * 60 * 60
+DEFAULT_NEGATIVE_TTL = 60 * 60
+DEFAULT_MAX_ENTRIES = 100_000
+
+
+class VerdictCache:
+    """TTL cache shared by every session that checks domain availability.
+
+    Positive verdicts (the domain is registered) rarely change and are kept for
+    ``positive_ttl`` seconds; negative ones (the domain looked available) can
+    be invalidated by any registration and expire after ``negative_ttl``.
+    UNKNOWN verdicts are never cached. At most ``max_entries`` verdicts are
+    kept in memory, least recently used first out. With ``path`` set, verdicts
+    are also persisted to SQLite so they survive restarts and can be shared
+    between worker processes; use the ``*_async`` methods from the event loop
+    so that the database is only touched from worker threads. Expired rows
+    are deleted on startup and whenever new verdicts are written.
+    """
+
+    def __init__(
+        self,
+        positive_ttl: float = DEFAULT_POSITIVE_TTL,
+        negative_ttl: float = DEFAULT_NEGATIVE_TTL,
+        path: Optional[str] = None,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.ttls = {TAKEN: positive_ttl, AVAILABLE: negative_ttl}
+        self.max_entries = max_entries
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, tuple[str, float]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        if path:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS verdicts ("
+                "domain TEXT PRIMARY KEY, verdict TEXT NOT NULL, "
+                "expires_at REAL NOT NULL)"
+            )
+            self._purge(self.clock())
+            self._db.commit()
+
+    @classmethod
+    def from_env(cls) -> "VerdictCache":
+        """Builds the cache from DOMAIN_VERDICT_POSITIVE_TTL,
+        DOMAIN_VERDICT_NEGATIVE_TTL, DOMAIN_VERDICT_CACHE_PATH and
+        DOMAIN_VERDICT_MAX_ENTRIES."""
+        return cls(
+            positive_ttl=float(
+                os.getenv("DOMAIN_VERDICT_POSITIVE_TTL", DEFAULT_POSITIVE_TTL)
+            ),
+            negative_ttl=float(
+                os.getenv("DOMAIN_VERDICT_NEGATIVE_TTL", DEFAULT_NEGATIVE_TTL)
+            ),
+            path=os.getenv("DOMAIN_VERDICT_CACHE_PATH") or None,
+            max_entries=int(
+                os.getenv("DOMAIN_VERDICT_MAX_ENTRIES", DEFAULT_MAX_ENTRIES)
+            ),
+        )
+
+    def get_many(self, domains: Iterable[str]) -> dict[str, str]:
+        """Returns the fresh cached verdicts among ``domains``."""
+        domains = list(domains)
+        now = self.clock()
+        found = {}
+        with self._lock:
+            missing = []
+            for domain in domains:
+                entry = self._entries.get(domain)
+                if entry and entry[1] > now:
+                    self._entries.move_to_end(domain)
+                    found[domain] = entry[0]
+                else:
+                    if entry:
+                        del self._entries[domain]
+                    missing.append(domain)
+            if missing and self._db is not None:
+                for domain, verdict, expires_at in self._load(missing, now):
+                    self._remember(domain, verdict, expires_at)
+                    found[domain] = verdict
+            self.hits += len(found)
+            self.misses += len(domains) - len(found)
+        return found
+
+    def put_many(self, verdicts: dict[str, str]) -> None:
+        """Caches every AVAILABLE/TAKEN verdict in ``verdicts``."""
+        now = self.clock()
+        rows = [
+            (domain, verdict, now + self.ttls[verdict])
+            for domain, verdict in verdicts.items()
+            if verdict in self.ttls
+        ]
+        with self._lock:
+            for domain, verdict, expires_at in rows:
+                self._remember(domain, verdict, expires_at)
+            if self._db is not None and rows:
+                self._purge(now)
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO verdicts VALUES (?, ?, ?)", rows
+                )
+                self._db.commit()
+
+    async def get_many_async(self, domains: Iterable[str]) -> dict[str, str]:
+        """``get_many`` without blocking the event loop on SQLite."""
+        if self._db is None:
+            return self.get_many(domains)
+        return await asyncio.to_thread(self.get_many, list(domains))
+
+    async def put_many_async(self, verdicts: dict[str, str]) -> None:
+        """``put_many`` without blocking the event loop on SQLite."""
+        if self._db is None:
+            self.put_many(verdicts)
+        else:
+            await asyncio.to_thread(self.put_many, verdicts)
+
+    def stats(self) -> dict[str, Any]:
+        """Hit/miss counters for tuning the TTLs."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": len(self._entries),
+        }
+
+    def _remember(self, domain: str, verdict: str, expires_at: float) -> None:
+        self._entries[domain] = (verdict, expires_at)
+        self._entries.move_to_end(domain)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _purge(self, now: float) -> None:
+        self._db.execute("DELETE FROM verdicts WHERE expires_at <= ?", (now,))
+
+    def _load(self, domains: list[str], now: float):
+        rows = []
+        # Stay well below SQLite's bound-parameter limit.
+        for start in range(0, len(domains), 500):
+            chunk = domains[start : start + 500]
+            placeholders = ",".join("?" * len(chunk))
+            rows += self._db.execute(
+                "SELECT domain, verdict, expires_at FROM verdicts "
+                f"WHERE expires_at > ? AND domain IN ({placeholders})",
+                [now, *chunk],
+            ).fetchall()
+        return rows
@@ -14,4 +14,10 @@
 
 """website_create_agent: for creating beautiful web site"""
 
-from .agent import logo_create_agent
+import importlib
+
+
+def __getattr__(name: str):
+    if name == "logo_create_agent":
+        return importlib.import_module(".agent", __name__).logo_create_agent
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
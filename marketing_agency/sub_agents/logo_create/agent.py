@@ -14,77 +14,179 @@
 
 """logo_create_agent: for creating logos"""
 
+import asyncio
+import hashlib
+import logging
 import os
+import weakref
 
 from dotenv import load_dotenv
 from google.adk import Agent
 from google.adk.tools import ToolContext, load_artifacts
 from google.genai import Client, types
+from opentelemetry import trace
 
-from . import prompt
+from ...shared_libraries.model_registry import model_for
+from . import derivatives, prompt
+from .cache import ImageCache, cache_key
 
-MODEL = "gemini-2.5-pro-preview-05-06" 
+MODEL = model_for("logo_create_agent")
 MODEL_IMAGE = "imagen-3.0-generate-002"
 
-load_dotenv()
+logger = logging.getLogger(__name__)
+tracer = trace.get_tracer(__name__)
 
-# Only Vertex AI supports image generation for now.
-client = Client(
-    vertexai=True,
-    project=os.getenv("GOOGLE_CLOUD_PROJECT"),
-    location=os.getenv("GOOGLE_CLOUD_LOCATION"),
-)
+# Created on first use, so that importing the agent needs no credentials.
+client = None
 
 
-def generate_image(img_prompt: str, tool_context: "ToolContext"):
-    """Generates an image based on the prompt."""
-    try:
-        print(f"[DEBUG] Starting image generation with prompt: {img_prompt[:100]}...")
-        
-        # 生成图像
-        response = client.models.generate_images(
-            model=MODEL_IMAGE,
-            prompt=img_prompt,
-            config={"number_of_images": 1},
+def _get_client() -> Client:
+    global client
+    if client is None:
+        load_dotenv()
+        # Only Vertex AI supports image generation for now.
+        client = Client(
+            vertexai=True,
+            project=os.getenv("GOOGLE_CLOUD_PROJECT"),
+            location=os.getenv("GOOGLE_CLOUD_LOCATION"),
         )
+    return client
+
+
+# Imagen calls are slow; cap how many run at once so a burst of sessions
+# cannot exhaust the per-project quota.
+MAX_CONCURRENT_IMAGE_REQUESTS = int(os.getenv("LOGO_MAX_CONCURRENT_REQUESTS", "4"))
+# One semaphore per event loop: an asyncio primitive is bound to the loop it
+# is first used on, and batch runs and tests start a new loop each time.
+_image_request_slots: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+
+def _request_slots() -> asyncio.Semaphore:
+    loop = asyncio.get_running_loop()
+    slots = _image_request_slots.get(loop)
+    if slots is None:
+        slots = _image_request_slots[loop] = asyncio.Semaphore(
+            MAX_CONCURRENT_IMAGE_REQUESTS
+        )
+    return slots
+
+
+# Imagen returns at most four images per request.
+MAX_VARIANTS = 4
+
+image_cache = ImageCache.from_env()
+
+
+def _artifact_filename(image_bytes: bytes) -> str:
+    """Content-addressed name, so concurrent calls never overwrite each other."""
+    return f"logo-{hashlib.sha256(image_bytes).hexdigest()[:16]}.png"
+
+
+async def generate_image(
+    img_prompt: str,
+    tool_context: "ToolContext",
+    number_of_variants: int = 1,
+    use_cache: bool = True,
+):
+    """Generates one or more logo variants based on the prompt.
+
+    All variants are requested in a single Imagen call and each one is saved
+    as its own artifact. Uses the async genai client so an Imagen round trip
+    never blocks the event loop shared by every other session in the process.
+
+    Args:
+        img_prompt: Description of the logo to generate.
+        number_of_variants: How many alternative logos to generate (1-4).
+        use_cache: Set to false when the user wants fresh images for a prompt
+            that was already rendered.
+    """
+    try:
+        number_of_variants = max(1, min(int(number_of_variants), MAX_VARIANTS))
+        # Recorded on the enclosing ``execute_tool generate_image`` span.
+        span = trace.get_current_span()
+        span.set_attribute("marketing_agency.imagen.variants", number_of_variants)
+        logger.debug("Generating image for prompt: %s", img_prompt[:100])
         
-        if not response.generated_images:
-            print("[ERROR] No images generated from the API response")
-            return {"status": "failed", "error": "No images generated"}
-        
-        print(f"[DEBUG] Successfully generated {len(response.generated_images)} image(s)")
-        
-        # 获取图像字节数据
-        image_bytes = response.generated_images[0].image.image_bytes
-        print(f"[DEBUG] Image bytes length: {len(image_bytes)}")
+        config = {"number_of_images": number_of_variants}
+        key = cache_key(img_prompt, MODEL_IMAGE, config)
+        cached = await asyncio.to_thread(image_cache.get, key) if use_cache else None
         
-        # 创建Part对象
-        image_part = types.Part.from_bytes(data=image_bytes, mime_type="image/png")
-        print(f"[DEBUG] Created Part object with mime_type: {image_part.inline_data.mime_type}")
+        if cached is not None:
+            logger.debug("Logo cache hit: %s", key[:16])
+            all_image_bytes = cached
+        else:
+            # 生成图像
+            async with _request_slots():
+                with tracer.start_as_current_span(
+                    "imagen.generate_images",
+                    attributes={
+                        "gen_ai.request.model": MODEL_IMAGE,
+                        "marketing_agency.imagen.variants": number_of_variants,
+                    },
+                ) as imagen_span:
+                    response = await _get_client().aio.models.generate_images(
+                        model=MODEL_IMAGE,
+                        prompt=img_prompt,
+                        config=config,
+                    )
+                    imagen_span.set_attribute(
+                        "marketing_agency.imagen.images",
+                        len(response.generated_images or []),
+                    )
+            
+            if not response.generated_images:
+                logger.warning("No images generated for prompt: %s", img_prompt[:100])
+                return {"status": "failed", "error": "No images generated"}
+            
+            all_image_bytes = [
+                generated_image.image.image_bytes
+                for generated_image in response.generated_images
+            ]
+            try:
+                await asyncio.to_thread(image_cache.put, key, all_image_bytes)
+            except OSError as e:
+                # The images are generated (and billed); only caching failed.
+                logger.warning("Could not cache logo %s: %s", key[:16], e)
         
         # 保存到artifacts
-        print("[DEBUG] Attempting to save artifact...")
-        tool_context.save_artifact("image.png", image_part)
-        print("[DEBUG] Artifact saved successfully")
+        images = []
+        for image_bytes in all_image_bytes:
+            filename = _artifact_filename(image_bytes)
+            image_part = types.Part.from_bytes(data=image_bytes, mime_type="image/png")
+            await tool_context.save_artifact(filename, image_part)
+            images.append({"filename": filename, "image_size_bytes": len(image_bytes)})
+        span.set_attribute("marketing_agency.cache.hit", cached is not None)
+        span.set_attribute("marketing_agency.artifact.count", len(images))
+        span.set_attribute(
+            "marketing_agency.artifact.bytes", sum(map(len, all_image_bytes))
+        )
         
-        # 验证保存是否成功
-        try:
-            saved_artifacts = tool_context.load_artifacts()
-            print(f"[DEBUG] Available artifacts after save: {list(saved_artifacts.keys()) if saved_artifacts else 'None'}")
-        except Exception as e:
-            print(f"[WARNING] Could not verify saved artifacts: {e}")
+        # 派生尺寸 (favicon, app icons, WebP/JPEG)
+        if derivatives.is_available():
+            try:
+                rendered = await derivatives.render_derivatives_async(all_image_bytes)
+                for image, outputs in zip(images, rendered):
+                    stem = image["filename"].removesuffix(".png")
+                    image["derivatives"] = []
+                    for suffix, (data, mime_type) in outputs.items():
+                        name = f"{stem}-{suffix}"
+                        await tool_context.save_artifact(
+                            name, types.Part.from_bytes(data=data, mime_type=mime_type)
+                        )
+                        image["derivatives"].append(name)
+            except Exception as e:
+                logger.warning("Could not render logo derivatives: %s", e)
         
         return {
             "status": "success",
-            "detail": "Image generated successfully and stored in artifacts.",
-            "filename": "image.png",
-            "image_size_bytes": len(image_bytes)
+            "detail": f"{len(images)} image(s) generated and stored in artifacts.",
+            "filenames": [image["filename"] for image in images],
+            "images": images,
+            "cache_hit": cached is not None,
         }
         
     except Exception as e:
-        print(f"[ERROR] Exception in generate_image: {type(e).__name__}: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Image generation failed")
         return {
             "status": "failed", 
             "error": f"{type(e).__name__}: {str(e)}"
@@ -0,0 +1,131 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Persistent, content-addressed cache of generated logo images."""
+
+import hashlib
+import json
+import os
+import shutil
+import threading
+from pathlib import Path
+from typing import Any, Optional
+
+DEFAULT_CACHE_DIR = Path.home() / ".cache" / "marketing_agency" / "logos"
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+def cache_key(prompt: str, model: str, config: dict[str, Any]) -> str:
+    """Hashes everything that determines the Imagen output."""
+    payload = json.dumps(
+        {"prompt": prompt, "model": model, "config": config}, sort_keys=True
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ImageCache:
+    """On-disk LRU cache mapping a generation key to the generated images.
+
+    Each entry is a directory holding the images of one Imagen response. The
+    directory mtime is bumped on every hit and the least recently used entries
+    are evicted once the cache grows past ``max_bytes``.
+    """
+
+    def __init__(
+        self,
+        directory: Path = DEFAULT_CACHE_DIR,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        enabled: bool = True,
+    ):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> "ImageCache":
+        """Builds the cache from LOGO_CACHE_DIR, LOGO_CACHE_MAX_BYTES and
+        LOGO_CACHE_DISABLED."""
+        return cls(
+            directory=Path(os.getenv("LOGO_CACHE_DIR", str(DEFAULT_CACHE_DIR))),
+            max_bytes=int(os.getenv("LOGO_CACHE_MAX_BYTES", str(DEFAULT_MAX_BYTES))),
+            enabled=os.getenv("LOGO_CACHE_DISABLED", "").lower()
+            not in ("1", "true", "yes"),
+        )
+
+    def get(self, key: str) -> Optional[list[bytes]]:
+        """Returns the cached images for ``key``, or None on a miss."""
+        if not self.enabled:
+            return None
+        entry = self.directory / key
+        with self._lock:
+            try:
+                images = [
+                    path.read_bytes() for path in sorted(entry.glob("*.png"))
+                ]
+                os.utime(entry)
+            except OSError:
+                images = []
+            if not images:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return images
+
+    def put(self, key: str, images: list[bytes]) -> None:
+        """Stores ``images`` under ``key`` and evicts old entries if needed."""
+        if not self.enabled or not images:
+            return
+        entry = self.directory / key
+        tmp = self.directory / f".{key}.{os.getpid()}.{threading.get_ident()}"
+        with self._lock:
+            tmp.mkdir(parents=True, exist_ok=True)
+            for index, image_bytes in enumerate(images):
+                (tmp / f"{index:02d}.png").write_bytes(image_bytes)
+            shutil.rmtree(entry, ignore_errors=True)
+            os.replace(tmp, entry)
+            self._evict()
+
+    def stats(self) -> dict[str, Any]:
+        """Hit/miss counters for monitoring."""
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    def _evict(self) -> None:
+        entries = []
+        total = 0
+        for entry in self.directory.iterdir():
+            if entry.name.startswith(".") or not entry.is_dir():
+                continue
+            try:
+                size = sum(path.stat().st_size for path in entry.iterdir())
+                entries.append((entry.stat().st_mtime, size, entry))
+            except FileNotFoundError:
+                continue  # Evicted or replaced by another worker meanwhile.
+            total += size
+        entries.sort(key=lambda item: item[0])
+        while total > self.max_bytes and len(entries) > 1:
+            _, size, entry = entries.pop(0)
+            shutil.rmtree(entry, ignore_errors=True)
+            total -= size
+            self.evictions += 1
@@ -0,0 +1,106 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Responsive logo derivatives rendered off the event loop.
+
+From one generated logo this produces the standard favicon and app icon
+sizes plus compressed WebP and JPEG variants, so a smaller version never
+requires another Imagen call. Rendering needs Pillow (the ``images`` extra)
+and runs in a process pool.
+"""
+
+import asyncio
+import io
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+try:
+    from PIL import Image
+except ImportError:  # Pillow is optional; derivatives are skipped without it.
+    Image = None
+
+# Derivative suffix -> (edge length in pixels, or None for full size; format)
+DERIVATIVES = {
+    "favicon-16.png": (16, "PNG"),
+    "favicon-32.png": (32, "PNG"),
+    "favicon.ico": (None, "ICO"),
+    "apple-touch-icon.png": (180, "PNG"),
+    "icon-192.png": (192, "PNG"),
+    "icon-512.png": (512, "PNG"),
+    "full.webp": (None, "WEBP"),
+    "full.jpg": (None, "JPEG"),
+}
+
+MIME_TYPES = {
+    "PNG": "image/png",
+    "ICO": "image/x-icon",
+    "WEBP": "image/webp",
+    "JPEG": "image/jpeg",
+}
+
+
+def is_available() -> bool:
+    return Image is not None
+
+
+def render_derivatives(image_bytes: bytes) -> dict[str, tuple[bytes, str]]:
+    """Renders every derivative; returns suffix -> (bytes, MIME type)."""
+    source = Image.open(io.BytesIO(image_bytes))
+    source.load()
+    rgba = source.convert("RGBA")
+    outputs = {}
+    for suffix, (size, image_format) in DERIVATIVES.items():
+        buffer = io.BytesIO()
+        if image_format == "ICO":
+            rgba.save(buffer, format="ICO", sizes=[(16, 16), (32, 32), (48, 48)])
+        elif image_format == "JPEG":
+            # JPEG has no alpha channel; flatten onto white like most logos.
+            flat = Image.new("RGB", rgba.size, (255, 255, 255))
+            flat.paste(rgba, mask=rgba.getchannel("A"))
+            flat.save(buffer, format="JPEG", quality=85, optimize=True)
+        elif image_format == "WEBP":
+            rgba.save(buffer, format="WEBP", quality=85, method=6)
+        else:
+            resized = rgba.resize((size, size), Image.Resampling.LANCZOS)
+            resized.save(buffer, format="PNG", optimize=True)
+        outputs[suffix] = (buffer.getvalue(), MIME_TYPES[image_format])
+    return outputs
+
+
+_pool: Optional[ProcessPoolExecutor] = None
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        # Spawned, not forked: the agent process already runs threads
+        # whose locks a forked child would inherit in a held state.
+        _pool = ProcessPoolExecutor(
+            max_workers=int(os.getenv("LOGO_DERIVATIVE_WORKERS", "2")),
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _pool
+
+
+async def render_derivatives_async(
+    images: list[bytes],
+) -> list[dict[str, tuple[bytes, str]]]:
+    """Renders the derivatives of several images concurrently in the pool."""
+    loop = asyncio.get_running_loop()
+    pool = _get_pool()
+    return await asyncio.gather(
+        *(loop.run_in_executor(pool, render_derivatives, image) for image in images)
+    )
@@ -14,4 +14,10 @@
 
 """marketing_create_agent: for creating marketing strategies"""
 
-from .agent import marketing_create_agent
+import importlib
+
+
+def __getattr__(name: str):
+    if name == "marketing_create_agent":
+        return importlib.import_module(".agent", __name__).marketing_create_agent
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
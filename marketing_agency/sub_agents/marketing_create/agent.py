@@ -16,13 +16,17 @@
 
 from google.adk import Agent
 
+from ...shared_libraries.context_cache import context_cache
+from ...shared_libraries.model_registry import model_for
 from . import prompt
 
-MODEL = "gemini-2.5-pro-preview-05-06" 
+MODEL = model_for("marketing_create_agent")
 
 marketing_create_agent = Agent(
     model=MODEL,
     name="marketing_create_agent",
     instruction=prompt.MARKETING_CREATE_PROMPT,
     output_key="marketing_create_output",
+    before_model_callback=context_cache.before_model,
+    after_model_callback=context_cache.after_model,
 )
@@ -16,13 +16,21 @@
 
 from google.adk import Agent
 
+from ...shared_libraries.context_cache import context_cache
+from ...shared_libraries.model_registry import model_for
 from . import prompt
+from .streaming import WebsiteArtifactWriter
 
-MODEL = "gemini-2.5-pro-preview-05-06" 
+MODEL = model_for("website_create_agent")
+
+artifact_writer = WebsiteArtifactWriter()
 
 website_create_agent = Agent(
     model=MODEL,
     name="website_create_agent",
     instruction=prompt.WEBSITE_CREATE_PROMPT,
     output_key="website_create_output",
+    before_model_callback=context_cache.before_model,
+    after_model_callback=[context_cache.after_model, artifact_writer],
+    after_agent_callback=artifact_writer.after_agent,
 )
@@ -0,0 +1,92 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Per-file website artifacts with precompressed variants and a manifest."""
+
+import gzip
+import hashlib
+import json
+from typing import Any
+
+from google.adk.agents.callback_context import CallbackContext
+from google.genai import types
+
+ARTIFACT_PREFIX = "website/"
+DIST_PREFIX = "website/dist/"
+MANIFEST_NAME = "manifest.json"
+
+MIME_TYPES = {
+    ".html": "text/html",
+    ".css": "text/css",
+    ".js": "text/javascript",
+    ".json": "application/json",
+    ".svg": "image/svg+xml",
+    ".txt": "text/plain",
+    ".xml": "application/xml",
+}
+
+
+def mime_type_for(filename: str) -> str:
+    return MIME_TYPES.get(filename[filename.rfind(".") :].lower(), "text/plain")
+
+
+async def save_website_file(
+    callback_context: CallbackContext,
+    name: str,
+    content: bytes,
+    prefix: str = ARTIFACT_PREFIX,
+) -> dict[str, Any]:
+    """Saves ``content`` and its gzip variant; returns the manifest entry."""
+    # mtime=0 keeps the compressed bytes (and so their hash) reproducible.
+    compressed = gzip.compress(content, compresslevel=9, mtime=0)
+    artifact = prefix + name
+    mime_type = mime_type_for(name)
+    await callback_context.save_artifact(
+        artifact, types.Part.from_bytes(data=content, mime_type=mime_type)
+    )
+    await callback_context.save_artifact(
+        artifact + ".gz",
+        types.Part.from_bytes(data=compressed, mime_type="application/gzip"),
+    )
+    return {
+        "path": name,
+        "artifact": artifact,
+        "gzip_artifact": artifact + ".gz",
+        "mime_type": mime_type,
+        "size": len(content),
+        "gzip_size": len(compressed),
+        "sha256": hashlib.sha256(content).hexdigest(),
+    }
+
+
+async def save_manifest(
+    callback_context: CallbackContext,
+    entries: list[dict[str, Any]],
+    prefix: str = ARTIFACT_PREFIX,
+) -> str:
+    """Saves the manifest describing every file and returns its artifact name."""
+    manifest = {
+        "files": entries,
+        "total_size": sum(entry["size"] for entry in entries),
+        "total_gzip_size": sum(entry["gzip_size"] for entry in entries),
+    }
+    artifact = prefix + MANIFEST_NAME
+    await callback_context.save_artifact(
+        artifact,
+        types.Part.from_bytes(
+            data=json.dumps(manifest, indent=2).encode("utf-8"),
+            mime_type="application/json",
+        ),
+    )
+    return artifact
@@ -0,0 +1,494 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Build-time optimizer for generated websites.
+
+Minifies HTML, CSS and JavaScript, inlines the CSS needed for the first
+screen of every page, and renames stylesheets and scripts with content hashes
+so they can be cached long-term. Everything is pure Python and runs in a
+process pool, so optimizing a site never blocks the event loop.
+"""
+
+import asyncio
+import hashlib
+import multiprocessing
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Awaitable, Optional
+
+# How much of a page's body counts as the first screen when nothing better
+# (the header and the first section) can be found.
+ABOVE_THE_FOLD_BYTES = 4096
+
+_HTML_COMMENT_RE = re.compile(r"<!--(?!\[if).*?-->", re.DOTALL)
+_RAW_BLOCK_RE = re.compile(
+    r"(<(pre|textarea|script|style)\b[^>]*>)(.*?)(</\2\s*>)",
+    re.DOTALL | re.IGNORECASE,
+)
+_TAG_RE = re.compile(r"<([a-zA-Z][\w-]*)([^>]*)>")
+_CLASS_RE = re.compile(r"""\bclass\s*=\s*["']([^"']*)["']""")
+_ID_RE = re.compile(r"""\bid\s*=\s*["']([^"']*)["']""")
+_SELECTOR_TOKEN_RE = re.compile(r"([.#]?)(-?[_a-zA-Z][\w-]*)")
+_STYLESHEET_RE = re.compile(
+    r"""<link\b[^>]*\brel\s*=\s*["']stylesheet["'][^>]*>""", re.IGNORECASE
+)
+_HREF_RE = re.compile(r"""\bhref\s*=\s*["']([^"']+)["']""")
+_CSS_TOKEN_RE = re.compile(
+    r"""(/\*.*?\*/)|"(?:\\.|[^"\\])*"|'(?:\\.|[^'\\])*'|url\(\s*[^)"'\s]*\s*\)""",
+    re.DOTALL | re.IGNORECASE,
+)
+_JS_WORD_RE = re.compile(r"[\w$]+")
+# Characters next to which whitespace never separates two tokens.
+_JS_TIGHT = "{}()[];,"
+_KEYWORDS_BEFORE_EXPRESSION = frozenset(
+    "await case delete do else in instanceof new of return throw typeof void "
+    "yield".split()
+)
+
+
+def minify_css(css: str) -> str:
+    """Drops comments and the whitespace between tokens.
+
+    Strings and ``url()`` values are set aside first, so that spaces, commas
+    and ``>`` inside them are kept as they are.
+    """
+    literals = []
+
+    def _stash(match: re.Match) -> str:
+        if match.group(1):
+            return ""
+        literals.append(match.group(0))
+        return f"\x00{len(literals) - 1}\x00"
+
+    css = _CSS_TOKEN_RE.sub(_stash, css)
+    css = re.sub(r"\s+", " ", css)
+    css = re.sub(r"\s*([{};,>])\s*", r"\1", css)
+    css = re.sub(r"\s*:\s*(?=[^{}]*[;}])", ":", css)
+    css = css.replace(";}", "}")
+    return re.sub(r"\x00(\d+)\x00", lambda m: literals[int(m.group(1))], css.strip())
+
+
+def _skip_string(js: str, i: int) -> int:
+    """Index just past the string or template literal starting at ``i``."""
+    quote, n = js[i], len(js)
+    i += 1
+    while i < n and js[i] != quote:
+        if js[i] == "\\":
+            i += 2
+        elif quote == "`" and js.startswith("${", i):
+            i = _skip_substitution(js, i + 2)
+        elif quote != "`" and js[i] == "\n":
+            return i  # Unterminated; leave the rest to the caller.
+        else:
+            i += 1
+    return i + 1
+
+
+def _skip_substitution(js: str, i: int) -> int:
+    """Index just past the ``}`` closing a template ``${...}``."""
+    depth, n = 1, len(js)
+    while i < n:
+        char = js[i]
+        if char in "\"'`":
+            i = _skip_string(js, i)
+            continue
+        if char == "{":
+            depth += 1
+        elif char == "}":
+            depth -= 1
+            if depth == 0:
+                return i + 1
+        i += 1
+    return n
+
+
+def _skip_regex(js: str, i: int) -> Optional[int]:
+    """Index just past the regex literal at ``i``, or None if there is none."""
+    in_class, n = False, len(js)
+    i += 1
+    while i < n and js[i] != "\n":
+        char = js[i]
+        if char == "\\":
+            i += 2
+            continue
+        if char == "[":
+            in_class = True
+        elif char == "]":
+            in_class = False
+        elif char == "/" and not in_class:
+            i += 1
+            while i < n and (js[i].isalnum() or js[i] in "_$"):
+                i += 1
+            return i
+        i += 1
+    return None
+
+
+def _regex_allowed(previous: str) -> bool:
+    """Whether a ``/`` after the token ``previous`` starts a regex literal."""
+    if not previous:
+        return True
+    if previous[-1].isalnum() or previous[-1] in "_$":
+        return previous in _KEYWORDS_BEFORE_EXPRESSION
+    return previous not in (")", "]", "}", "++", "--", "literal")
+
+
+def minify_js(js: str) -> str:
+    """Drops comments and the whitespace between tokens.
+
+    Strings, template literals and regex literals are copied verbatim. Line
+    breaks are kept, so automatic semicolon insertion behaves exactly as in
+    the original, and a space is only dropped next to brackets, ``;`` and
+    ``,``, where it can never separate two tokens.
+    """
+    out: list[str] = []
+    previous = ""
+    space = newline = False
+    i, n = 0, len(js)
+    while i < n:
+        char = js[i]
+        if char == "\n":
+            newline = True
+            i += 1
+            continue
+        if char.isspace():
+            space = True
+            i += 1
+            continue
+        if js.startswith("//", i):
+            end = js.find("\n", i)
+            i = n if end == -1 else end
+            continue
+        if js.startswith("/*", i):
+            end = js.find("*/", i + 2)
+            end = n if end == -1 else end + 2
+            if "\n" in js[i:end]:
+                newline = True
+            else:
+                space = True
+            i = end
+            continue
+
+        end = None
+        token_kind = char
+        if char in "\"'`":
+            end, token_kind = _skip_string(js, i), "literal"
+        elif char == "/" and _regex_allowed(previous):
+            end = _skip_regex(js, i)
+            token_kind = "literal" if end is not None else char
+        if end is None:
+            match = _JS_WORD_RE.match(js, i)
+            if match:
+                end = match.end()
+                token_kind = match.group(0)
+            elif js.startswith(("++", "--"), i):
+                end, token_kind = i + 2, js[i : i + 2]
+            else:
+                end = i + 1
+        token = js[i:end]
+
+        if out:
+            if newline:
+                out.append("\n")
+            elif space and not (
+                out[-1][-1] in _JS_TIGHT or token[0] in _JS_TIGHT
+            ):
+                out.append(" ")
+        space = newline = False
+        out.append(token)
+        previous = token_kind
+        i = end
+    return "".join(out)
+
+
+def minify_html(html: str) -> str:
+    blocks = []
+
+    def _stash(match: re.Match) -> str:
+        tag = match.group(2).lower()
+        body = match.group(3)
+        if tag == "style":
+            body = minify_css(body)
+        elif tag == "script":
+            body = minify_js(body)
+        blocks.append(match.group(1) + body + match.group(4))
+        return f"\x00{len(blocks) - 1}\x00"
+
+    html = _RAW_BLOCK_RE.sub(_stash, html)
+    html = _HTML_COMMENT_RE.sub("", html)
+    # Whitespace between inline elements can be visible, so runs collapse to a
+    # single space instead of disappearing.
+    html = re.sub(r"\s+", " ", html).strip()
+    return re.sub(r"\x00(\d+)\x00", lambda m: blocks[int(m.group(1))], html)
+
+
+def _css_rules(css: str, context: Optional[str] = None) -> list[tuple]:
+    """Splits minified CSS into (enclosing @media, selectors, declarations)."""
+    rules = []
+    i = 0
+    while True:
+        brace = css.find("{", i)
+        if brace == -1:
+            return rules
+        # Statements such as @import end with ";" before the next block.
+        prelude = css[i:brace].rsplit(";", 1)[-1].strip()
+        depth = 0
+        end = brace
+        for end in range(brace, len(css)):
+            depth += {"{": 1, "}": -1}.get(css[end], 0)
+            if depth == 0:
+                break
+        body = css[brace + 1 : end]
+        if prelude.startswith(("@media", "@supports")):
+            rules += _css_rules(body, prelude)
+        else:
+            rules.append((context, prelude, body))
+        i = end + 1
+
+
+def _page_tokens(html: str) -> set[str]:
+    tokens = set()
+    for tag, attributes in _TAG_RE.findall(html):
+        tokens.add(tag.lower())
+        for classes in _CLASS_RE.findall(attributes):
+            tokens.update("." + name for name in classes.split())
+        for element_id in _ID_RE.findall(attributes):
+            tokens.add("#" + element_id)
+    return tokens
+
+
+def _above_the_fold(html: str) -> str:
+    body_start = html.lower().find("<body")
+    body = html[body_start:] if body_start != -1 else html
+    lowered = body.lower()
+    for closing_tag in ("</section>", "</header>"):
+        end = lowered.find(closing_tag)
+        if end != -1:
+            return body[: end + len(closing_tag)]
+    return body[:ABOVE_THE_FOLD_BYTES]
+
+
+def _selector_matches(selector: str, tokens: set[str]) -> bool:
+    selector = re.sub(r"::?[\w-]+(\([^)]*\))?", "", selector)
+    selector = re.sub(r"\[[^\]]*\]", "", selector)
+    for prefix, name in _SELECTOR_TOKEN_RE.findall(selector):
+        token = prefix + (name if prefix else name.lower())
+        if token not in tokens:
+            return False
+    return True
+
+
+def critical_css(css: str, html: str) -> str:
+    """Returns the rules of ``css`` that style the first screen of ``html``."""
+    tokens = _page_tokens(_above_the_fold(html)) | {"html", "body"}
+    output = []
+    open_prelude = None
+    for prelude, selectors, declarations in _css_rules(minify_css(css)):
+        if selectors.startswith("@"):
+            continue
+        if not any(_selector_matches(s, tokens) for s in selectors.split(",")):
+            continue
+        if prelude != open_prelude:
+            if open_prelude is not None:
+                output.append("}")
+            if prelude is not None:
+                output.append(prelude + "{")
+            open_prelude = prelude
+        output.append(f"{selectors}{{{declarations}}}")
+    if open_prelude is not None:
+        output.append("}")
+    return "".join(output)
+
+
+def hashed_name(name: str, content: str) -> str:
+    digest = hashlib.sha256(content.encode("utf-8")).hexdigest()[:8]
+    stem, dot, extension = name.rpartition(".")
+    return f"{stem}.{digest}.{extension}" if dot else f"{name}.{digest}"
+
+
+def _rewrite_references(html: str, renames: dict[str, str]) -> str:
+    for original, renamed in renames.items():
+        html = re.sub(
+            r"""(\b(?:href|src)\s*=\s*["'])(?:\./)?%s(["'])""" % re.escape(original),
+            lambda m: m.group(1) + renamed + m.group(2),
+            html,
+        )
+    return html
+
+
+def _defer_stylesheets(html: str, critical: str) -> str:
+    """Inlines ``critical`` and turns stylesheet links into non-blocking loads."""
+
+    def _replace(match: re.Match) -> str:
+        href = _HREF_RE.search(match.group(0))
+        if href is None or "://" in href.group(1):
+            return match.group(0)
+        url = href.group(1)
+        return (
+            f'<link rel="preload" href="{url}" as="style" '
+            "onload=\"this.onload=null;this.rel='stylesheet'\">"
+            f'<noscript><link rel="stylesheet" href="{url}"></noscript>'
+        )
+
+    html, count = _STYLESHEET_RE.subn(_replace, html)
+    if count and critical:
+        style = f"<style>{critical}</style>"
+        head_end = html.lower().find("</head>")
+        if head_end == -1:
+            return style + html
+        html = html[:head_end] + style + html[head_end:]
+    return html
+
+
+def _minify_asset(name: str, content: str) -> str:
+    if name.endswith(".css"):
+        return minify_css(content)
+    if name.endswith(".js"):
+        return minify_js(content)
+    return content
+
+
+def _optimize_page(
+    html: str, css: str, renames: dict[str, str]
+) -> tuple[str, int]:
+    """Returns the optimized page and how many bytes of CSS were inlined."""
+    critical = critical_css(css, html) if css else ""
+    html = _defer_stylesheets(html, critical)
+    return minify_html(_rewrite_references(html, renames)), len(critical)
+
+
+def optimize_site(files: dict[str, str]) -> dict[str, Any]:
+    """Optimizes a whole site in the current process.
+
+    Returns the optimized files (stylesheets and scripts under hashed names)
+    and a per-file report of the byte savings. Pages may end up larger than
+    before because they carry their critical CSS inline; in exchange the
+    first render no longer waits for the stylesheet.
+    """
+    assets = {
+        name: _minify_asset(name, content)
+        for name, content in files.items()
+        if name.endswith((".css", ".js"))
+    }
+    css = _stylesheet_text(files)
+    renames = _renames(assets)
+    pages = {
+        name: _optimize_page(content, css, renames)
+        for name, content in files.items()
+        if name.endswith(".html")
+    }
+    return _assemble(files, assets, pages)
+
+
+def _stylesheet_text(files: dict[str, str]) -> str:
+    return "".join(
+        content for name, content in files.items() if name.endswith(".css")
+    )
+
+
+def _renames(assets: dict[str, str]) -> dict[str, str]:
+    return {name: hashed_name(name, content) for name, content in assets.items()}
+
+
+def _assemble(
+    files: dict[str, str],
+    assets: dict[str, str],
+    pages: dict[str, tuple[str, int]],
+) -> dict[str, Any]:
+    renames = _renames(assets)
+    optimized = {}
+    report = []
+    for name, content in files.items():
+        inlined = 0
+        if name in pages:
+            output_name, (output, inlined) = name, pages[name]
+        elif name in assets:
+            output_name, output = renames[name], assets[name]
+        else:
+            output_name, output = name, content
+        optimized[output_name] = output
+        original_size = len(content.encode("utf-8"))
+        optimized_size = len(output.encode("utf-8"))
+        saved = original_size - optimized_size
+        report.append(
+            {
+                "path": name,
+                "output": output_name,
+                "original_size": original_size,
+                "optimized_size": optimized_size,
+                "saved_bytes": saved,
+                "saved_percent": round(100 * saved / max(original_size, 1), 1),
+                # Pages grow by the critical CSS they now carry inline.
+                "inlined_css_size": inlined,
+            }
+        )
+    return {"files": optimized, "report": report}
+
+
+_pool: Optional[ProcessPoolExecutor] = None
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        # Forking a process that runs threads (the event loop's executors,
+        # gRPC) can deadlock the child, so workers are spawned.
+        _pool = ProcessPoolExecutor(
+            max_workers=int(os.getenv("WEBSITE_OPTIMIZER_WORKERS", "2")),
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _pool
+
+
+def minify_asset_async(name: str, content: str) -> Optional[asyncio.Future]:
+    """Starts minifying a stylesheet or script in the process pool.
+
+    Returns None for other files. The website writer calls this as each file
+    finishes streaming, so that little is left to do once the last one is in.
+    """
+    if not name.endswith((".css", ".js")):
+        return None
+    loop = asyncio.get_running_loop()
+    return loop.run_in_executor(_get_pool(), _minify_asset, name, content)
+
+
+async def optimize_site_async(
+    files: dict[str, str], started: Optional[dict[str, Awaitable[str]]] = None
+) -> dict[str, Any]:
+    """Runs ``optimize_site`` in the process pool, one task per file.
+
+    ``started`` holds assets already handed to ``minify_asset_async``.
+    """
+    loop = asyncio.get_running_loop()
+    pool = _get_pool()
+    started = started or {}
+    asset_names = [name for name in files if name.endswith((".css", ".js"))]
+    minified = await asyncio.gather(
+        *(
+            started.get(name) or minify_asset_async(name, files[name])
+            for name in asset_names
+        )
+    )
+    assets = dict(zip(asset_names, minified))
+    css = _stylesheet_text(files)
+    renames = _renames(assets)
+    page_names = [name for name in files if name.endswith(".html")]
+    pages = await asyncio.gather(
+        *(
+            loop.run_in_executor(pool, _optimize_page, files[name], css, renames)
+            for name in page_names
+        )
+    )
+    return _assemble(files, assets, dict(zip(page_names, pages)))
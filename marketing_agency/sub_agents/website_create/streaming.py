@@ -0,0 +1,221 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Streaming splitter that turns website_create_agent output into files.
+
+The model emits the whole site as one text: a ``### <filename>`` heading
+followed by a fenced code block per file. ``WebsiteFileSplitter`` consumes
+that text chunk by chunk and hands over each file the moment its closing fence
+arrives, holding only the file currently being written.
+"""
+
+import asyncio
+import re
+import time
+from typing import Callable, Optional
+
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.models import LlmResponse
+
+from .artifacts import DIST_PREFIX, save_manifest, save_website_file
+from .optimizer import minify_asset_async, optimize_site_async
+
+WEBSITE_FILES_KEY = "website_files"
+WEBSITE_MANIFEST_KEY = "website_manifest"
+WEBSITE_BUILD_REPORT_KEY = "website_build_report"
+
+_FILENAME_RE = re.compile(
+    r"^[\s#>*`_-]*(?:file(?:name)?\s*:\s*)?[`*_]*"
+    r"(?P<name>[\w-]+(?:/[\w-]+)*\.(?:html|css|js|json|svg|txt|xml))"
+    r"[`*_:\s]*$",
+    re.IGNORECASE,
+)
+_FENCE_RE = re.compile(r"^\s*```")
+
+
+class WebsiteFileSplitter:
+    """Incremental parser for the multi-file website output.
+
+    Call ``feed`` with every text chunk as it is generated and ``close`` once
+    the response is complete; ``on_file(name, content)`` is invoked for each
+    finished file.
+    """
+
+    def __init__(self, on_file: Callable[[str, str], None]):
+        self.on_file = on_file
+        self.files: list[str] = []
+        self._pending = ""
+        self._name: Optional[str] = None
+        self._lines: Optional[list[str]] = None
+
+    def feed(self, chunk: str) -> None:
+        self._pending += chunk
+        *lines, self._pending = self._pending.split("\n")
+        for line in lines:
+            self._process(line)
+
+    def close(self) -> None:
+        if self._pending:
+            self._process(self._pending)
+            self._pending = ""
+        # A truncated response still yields the part of the file we have.
+        if self._lines is not None:
+            self._finish()
+
+    def _process(self, line: str) -> None:
+        if self._lines is not None:
+            if _FENCE_RE.match(line):
+                self._finish()
+            else:
+                self._lines.append(line)
+            return
+        if _FENCE_RE.match(line):
+            if self._name is not None:
+                self._lines = []
+            return
+        match = _FILENAME_RE.match(line)
+        if match:
+            self._name = match.group("name")
+
+    def _finish(self) -> None:
+        name, content = self._name, "\n".join(self._lines) + "\n"
+        self._name, self._lines = None, None
+        self.files.append(name)
+        self.on_file(name, content)
+
+
+class WebsiteArtifactWriter:
+    """after_model_callback that saves each website file as an artifact.
+
+    Every file is stored with a gzip variant, and a manifest with sizes and
+    content hashes is saved once the response is complete, so serving the site
+    never requires re-parsing or re-compressing the model output. The
+    complete site is then optimized (see optimizer.py) into ``website/dist/``;
+    stylesheets and scripts are minified in the process pool as soon as they
+    arrive, so only the pages are left for the end of the response.
+
+    With SSE streaming every partial response is fed to the splitter, so the
+    first page is saved long before the last one is generated; without
+    streaming the single final response is split the same way. The
+    coordinator's tool runs the agent with SSE for this reason.
+
+    Register ``after_agent`` as well, so that a stream which ends without a
+    final response does not leave its splitter behind. Splitters of runs that
+    raised are dropped once they have been idle for ``idle_timeout`` seconds.
+    """
+
+    def __init__(self, idle_timeout: float = 600.0):
+        self.idle_timeout = idle_timeout
+        self._splitters: dict[tuple[str, str], _AsyncSplitter] = {}
+
+    async def __call__(
+        self, callback_context: CallbackContext, llm_response: LlmResponse
+    ) -> None:
+        key = (callback_context.invocation_id, callback_context.agent_name)
+        self._prune()
+        text = "".join(
+            part.text
+            for part in (llm_response.content.parts if llm_response.content else [])
+            if part.text and not part.thought
+        )
+        streamed = key in self._splitters
+        if llm_response.partial:
+            if text:
+                await self._splitter(key).feed_async(text, callback_context)
+            return None
+        splitter = self._splitters.pop(key, None) or _AsyncSplitter()
+        if not streamed and text:
+            await splitter.feed_async(text, callback_context)
+        await splitter.close_async(callback_context)
+        if splitter.entries:
+            callback_context.state[WEBSITE_FILES_KEY] = [
+                entry["artifact"] for entry in splitter.entries
+            ]
+            callback_context.state[WEBSITE_MANIFEST_KEY] = await save_manifest(
+                callback_context, splitter.entries
+            )
+            callback_context.state[WEBSITE_BUILD_REPORT_KEY] = await _build_dist(
+                callback_context, splitter.contents, splitter.minifying
+            )
+        return None
+
+    async def after_agent(self, callback_context: CallbackContext) -> None:
+        key = (callback_context.invocation_id, callback_context.agent_name)
+        self._splitters.pop(key, None)
+        return None
+
+    def _splitter(self, key) -> "_AsyncSplitter":
+        if key not in self._splitters:
+            self._splitters[key] = _AsyncSplitter()
+        self._splitters[key].last_fed = time.monotonic()
+        return self._splitters[key]
+
+    def _prune(self) -> None:
+        cutoff = time.monotonic() - self.idle_timeout
+        for key, splitter in list(self._splitters.items()):
+            if splitter.last_fed < cutoff:
+                del self._splitters[key]
+
+
+class _AsyncSplitter(WebsiteFileSplitter):
+    """Collects finished files during ``feed`` and saves them afterwards."""
+
+    def __init__(self):
+        self._finished: list[tuple[str, str]] = []
+        self.entries: list[dict] = []
+        self.contents: dict[str, str] = {}
+        # Assets are minified while the rest of the site is still streaming.
+        self.minifying: dict[str, asyncio.Future] = {}
+        self.last_fed = time.monotonic()
+        super().__init__(lambda name, content: self._finished.append((name, content)))
+
+    async def feed_async(self, chunk: str, callback_context: CallbackContext):
+        self.feed(chunk)
+        await self._flush(callback_context)
+
+    async def close_async(self, callback_context: CallbackContext):
+        self.close()
+        await self._flush(callback_context)
+
+    async def _flush(self, callback_context: CallbackContext) -> None:
+        finished, self._finished = self._finished, []
+        for name, content in finished:
+            self.contents[name] = content
+            future = minify_asset_async(name, content)
+            if future is not None:
+                self.minifying[name] = future
+            self.entries.append(
+                await save_website_file(
+                    callback_context, name, content.encode("utf-8")
+                )
+            )
+
+
+async def _build_dist(
+    callback_context: CallbackContext,
+    files: dict[str, str],
+    minifying: dict[str, asyncio.Future],
+) -> list[dict]:
+    """Optimizes the site and saves it under ``website/dist/``."""
+    optimized = await optimize_site_async(files, minifying)
+    entries = await asyncio.gather(
+        *(
+            save_website_file(
+                callback_context, name, content.encode("utf-8"), DIST_PREFIX
+            )
+            for name, content in optimized["files"].items()
+        )
+    )
+    await save_manifest(callback_context, entries, DIST_PREFIX)
+    return optimized["report"]
@@ -0,0 +1,314 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Local span export and per-stage latency reports.
+
+ADK already opens OpenTelemetry spans for every invocation, agent run, model
+call and tool call, and our own code adds Imagen calls, cache hits and
+artifact sizes to them. ``setup_tracing`` installs a tracer provider that
+appends them to a file in the OTLP/JSON format, one export request per line
+(as read by the collector's ``otlpjsonfile`` receiver). Token counts are
+lifted out of the model responses into ``gen_ai.usage.*`` attributes, and
+the full request/response payloads are dropped unless ``keep_payloads``.
+
+The report aggregates a trace file by stage:
+
+    TRACE_FILE=spans.jsonl python run_marketing_agency.py --batch in.jsonl
+    python -m marketing_agency.tracing spans.jsonl
+"""
+
+import argparse
+import json
+import logging
+import math
+import os
+import threading
+from collections import defaultdict
+from typing import Any, Iterator, Optional, Sequence
+
+from opentelemetry import trace
+from opentelemetry.sdk.resources import Resource
+from opentelemetry.sdk.trace import ReadableSpan, TracerProvider
+from opentelemetry.sdk.trace.export import (
+    BatchSpanProcessor,
+    SpanExporter,
+    SpanExportResult,
+)
+
+logger = logging.getLogger(__name__)
+
+SERVICE_NAME = "marketing_agency"
+# ADK span attributes with whole prompts, responses and tool payloads.
+PAYLOAD_ATTRIBUTES = (
+    "gcp.vertex.agent.llm_request",
+    "gcp.vertex.agent.llm_response",
+    "gcp.vertex.agent.tool_call_args",
+    "gcp.vertex.agent.tool_response",
+    "gcp.vertex.agent.data",
+)
+USAGE_FIELDS = {
+    "prompt_token_count": "gen_ai.usage.input_tokens",
+    "candidates_token_count": "gen_ai.usage.output_tokens",
+    "cached_content_token_count": "gen_ai.usage.cached_tokens",
+}
+
+
+def _load_json(value: Any) -> dict[str, Any]:
+    try:
+        loaded = json.loads(value)
+    except (TypeError, ValueError):
+        return {}
+    return loaded if isinstance(loaded, dict) else {}
+
+
+def span_attributes(
+    span: ReadableSpan, keep_payloads: bool = False
+) -> dict[str, Any]:
+    """The span's attributes, with token counts and the agent name added."""
+    attributes = dict(span.attributes or {})
+    response = _load_json(attributes.get("gcp.vertex.agent.llm_response"))
+    usage = response.get("usage_metadata") or {}
+    for field, name in USAGE_FIELDS.items():
+        if usage.get(field) is not None:
+            attributes[name] = usage[field]
+    request = _load_json(attributes.get("gcp.vertex.agent.llm_request"))
+    labels = (request.get("config") or {}).get("labels") or {}
+    if labels.get("adk_agent_name"):
+        attributes["gen_ai.agent.name"] = labels["adk_agent_name"]
+    tool_response = attributes.get("gcp.vertex.agent.tool_response")
+    if isinstance(tool_response, str):
+        attributes["marketing_agency.tool.response_bytes"] = len(
+            tool_response.encode("utf-8")
+        )
+    if not keep_payloads:
+        for name in PAYLOAD_ATTRIBUTES:
+            attributes.pop(name, None)
+    return attributes
+
+
+def _any_value(value: Any) -> dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        # OTLP/JSON encodes 64-bit integers as strings.
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    if isinstance(value, (list, tuple)):
+        return {"arrayValue": {"values": [_any_value(item) for item in value]}}
+    return {"stringValue": str(value)}
+
+
+def _key_values(attributes: dict[str, Any]) -> list[dict[str, Any]]:
+    return [{"key": k, "value": _any_value(v)} for k, v in attributes.items()]
+
+
+def otlp_span(span: ReadableSpan, keep_payloads: bool = False) -> dict[str, Any]:
+    context = span.get_span_context()
+    record = {
+        "traceId": format(context.trace_id, "032x"),
+        "spanId": format(context.span_id, "016x"),
+        "name": span.name,
+        "kind": f"SPAN_KIND_{span.kind.name}",
+        "startTimeUnixNano": str(span.start_time),
+        "endTimeUnixNano": str(span.end_time),
+        "attributes": _key_values(span_attributes(span, keep_payloads)),
+        "status": {"code": f"STATUS_CODE_{span.status.status_code.name}"},
+    }
+    if span.parent is not None:
+        record["parentSpanId"] = format(span.parent.span_id, "016x")
+    if span.status.description:
+        record["status"]["message"] = span.status.description
+    return record
+
+
+class JsonFileSpanExporter(SpanExporter):
+    """Appends each batch of spans to ``path`` as one OTLP/JSON line."""
+
+    def __init__(self, path: str, keep_payloads: bool = False):
+        self.path = path
+        self.keep_payloads = keep_payloads
+        self._lock = threading.Lock()
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    def export(self, spans: Sequence[ReadableSpan]) -> SpanExportResult:
+        if not spans:
+            return SpanExportResult.SUCCESS
+        scopes: dict[str, list[dict[str, Any]]] = defaultdict(list)
+        for span in spans:
+            scope = span.instrumentation_scope
+            scopes[scope.name if scope else ""].append(
+                otlp_span(span, self.keep_payloads)
+            )
+        resource = spans[0].resource.attributes if spans[0].resource else {}
+        request = {
+            "resourceSpans": [
+                {
+                    "resource": {"attributes": _key_values(dict(resource))},
+                    "scopeSpans": [
+                        {"scope": {"name": name}, "spans": records}
+                        for name, records in scopes.items()
+                    ],
+                }
+            ]
+        }
+        try:
+            with self._lock, open(self.path, "a", encoding="utf-8") as out:
+                out.write(json.dumps(request, ensure_ascii=False) + "\n")
+        except OSError as e:
+            logger.warning("Could not write spans to %s: %s", self.path, e)
+            return SpanExportResult.FAILURE
+        return SpanExportResult.SUCCESS
+
+    def shutdown(self) -> None:
+        pass
+
+
+def setup_tracing(path: str, keep_payloads: bool = False) -> TracerProvider:
+    """Sends every span of this process to ``path``."""
+    provider = TracerProvider(
+        resource=Resource.create({"service.name": SERVICE_NAME})
+    )
+    provider.add_span_processor(
+        BatchSpanProcessor(JsonFileSpanExporter(path, keep_payloads))
+    )
+    trace.set_tracer_provider(provider)
+    return provider
+
+
+def setup_tracing_from_env() -> Optional[TracerProvider]:
+    """Calls ``setup_tracing`` when ``TRACE_FILE`` is set."""
+    path = os.getenv("TRACE_FILE")
+    if not path:
+        return None
+    keep_payloads = os.getenv("TRACE_KEEP_PAYLOADS", "0") == "1"
+    return setup_tracing(os.path.expanduser(path), keep_payloads)
+
+
+def _attribute_value(value: dict[str, Any]) -> Any:
+    if "intValue" in value:
+        return int(value["intValue"])
+    if "arrayValue" in value:
+        return [_attribute_value(v) for v in value["arrayValue"].get("values", [])]
+    return next(iter(value.values()), None)
+
+
+def read_spans(path: str) -> Iterator[dict[str, Any]]:
+    """Spans of an OTLP/JSON lines file, with plain attribute dicts."""
+    with open(path, encoding="utf-8") as trace_file:
+        for line in trace_file:
+            if not line.strip():
+                continue
+            for resource_spans in json.loads(line).get("resourceSpans", []):
+                for scope_spans in resource_spans.get("scopeSpans", []):
+                    for span in scope_spans.get("spans", []):
+                        span["attributes"] = {
+                            item["key"]: _attribute_value(item["value"])
+                            for item in span.get("attributes", [])
+                        }
+                        yield span
+
+
+def stage_name(span: dict[str, Any]) -> str:
+    """The span name; model calls are split by agent.
+
+    AgentTool runs its sub-agent in a runner of its own, whose ``invocation``
+    span is reported as ``invocation [sub-agent]`` so that ``invocation``
+    only covers whole top-level runs.
+    """
+    agent = span["attributes"].get("gen_ai.agent.name")
+    if span["name"] == "call_llm" and agent:
+        return f"call_llm [{agent}]"
+    if span["name"] == "invocation" and span.get("parentSpanId"):
+        return "invocation [sub-agent]"
+    return span["name"]
+
+
+def _percentile(values: list[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+
+def stage_report(spans: Sequence[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Per-stage count, p50/p95 latency, share of wall-clock and usage.
+
+    The wall-clock total is the time spent in root spans, i.e. top-level
+    runs, so nested spans are never counted twice.
+    """
+    durations: dict[str, list[float]] = defaultdict(list)
+    totals: dict[str, dict[str, int]] = defaultdict(lambda: defaultdict(int))
+    wall_clock = 0.0
+    for span in spans:
+        stage = stage_name(span)
+        seconds = (
+            int(span["endTimeUnixNano"]) - int(span["startTimeUnixNano"])
+        ) / 1e9
+        durations[stage].append(seconds)
+        if not span.get("parentSpanId"):
+            wall_clock += seconds
+        attributes = span["attributes"]
+        for name in (*USAGE_FIELDS.values(), "marketing_agency.artifact.bytes"):
+            totals[stage][name] += attributes.get(name) or 0
+        if attributes.get("marketing_agency.cache.hit"):
+            totals[stage]["cache_hits"] += 1
+    report = []
+    for stage, values in durations.items():
+        total = totals[stage]
+        report.append(
+            {
+                "stage": stage,
+                "count": len(values),
+                "p50_ms": _percentile(values, 0.5) * 1000,
+                "p95_ms": _percentile(values, 0.95) * 1000,
+                "total_s": sum(values),
+                "share": sum(values) / wall_clock if wall_clock else None,
+                "input_tokens": total["gen_ai.usage.input_tokens"],
+                "output_tokens": total["gen_ai.usage.output_tokens"],
+                "cached_tokens": total["gen_ai.usage.cached_tokens"],
+                "cache_hits": total["cache_hits"],
+                "artifact_bytes": total["marketing_agency.artifact.bytes"],
+            }
+        )
+    return sorted(report, key=lambda row: -row["total_s"])
+
+
+def format_report(report: Sequence[dict[str, Any]]) -> str:
+    lines = [
+        f"{'stage':<44} {'n':>5} {'p50 ms':>9} {'p95 ms':>9} {'share':>6}"
+        f" {'in tok':>9} {'out tok':>8} {'cached':>8} {'hits':>5}"
+    ]
+    for row in report:
+        share = f"{row['share']:.0%}" if row["share"] is not None else "-"
+        lines.append(
+            f"{row['stage'][:44]:<44} {row['count']:>5} {row['p50_ms']:>9.1f}"
+            f" {row['p95_ms']:>9.1f} {share:>6} {row['input_tokens']:>9}"
+            f" {row['output_tokens']:>8} {row['cached_tokens']:>8}"
+            f" {row['cache_hits']:>5}"
+        )
+    return "\n".join(lines)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Per-stage report of a trace file")
+    parser.add_argument("trace_file")
+    parser.add_argument("--json", action="store_true", help="print JSON rows")
+    args = parser.parse_args()
+
+    report = stage_report(list(read_spans(args.trace_file)))
+    print(json.dumps(report, indent=2) if args.json else format_report(report))
+
+
+if __name__ == "__main__":
+    main()
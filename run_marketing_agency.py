@@ -8,18 +8,51 @@ The agent can help you with:
 - Website creation
 - Marketing strategy development
 - Logo design
+
+Requests can also be processed in bulk from a JSONL file, one request per
+line, e.g.:
+
+    python run_marketing_agency.py --batch requests.jsonl --concurrency 8 \
+        --out results.jsonl
+
+With ``--trace spans.jsonl`` (or TRACE_FILE) the spans of every agent, tool,
+model and Imagen call are written to that file, and a batch run ends with a
+per-stage latency report.
 """
 
+import argparse
 import asyncio
-import sys
+import logging
+import os
+from pathlib import Path
+import dotenv
+
+# Load environment variables before the agents read their configuration.
+dotenv.load_dotenv()
+
 from google.adk.runners import InMemoryRunner
 from google.adk.artifacts import InMemoryArtifactService
 from marketing_agency.agent import root_agent
+from marketing_agency.batch import run_batch
+from marketing_agency.runner_service import runner_service
+from marketing_agency.shared_libraries.pass_through import delivered_outputs
+from marketing_agency.tracing import (
+    format_report,
+    read_spans,
+    setup_tracing,
+    stage_report,
+)
 from google.genai.types import Part, UserContent
-import dotenv
 
-# Load environment variables
-dotenv.load_dotenv()
+logger = logging.getLogger("run_marketing_agency")
+
+def print_delivered_outputs(event):
+    """Prints the large sub-agent outputs that bypass the coordinator."""
+    for key, text in delivered_outputs(event).items():
+        print(f"📦 {key}:")
+        print("-" * 40)
+        print(text)
+        print("-" * 40)
 
 async def run_marketing_agent_interactive():
     """Run the marketing agent in interactive mode."""
@@ -37,12 +70,12 @@ async def run_marketing_agent_interactive():
     try:
         # 使用默认的InMemoryRunner配置
         runner = InMemoryRunner(agent=root_agent)
-        print(f"[DEBUG] Runner initialized with agent: {root_agent.name}")
+        logger.debug("Runner initialized with agent: %s", root_agent.name)
         
         session = await runner.session_service.create_session(
             app_name=runner.app_name, user_id="interactive_user"
         )
-        print(f"[DEBUG] Created session: {session.id}")
+        logger.debug("Created session: %s", session.id)
         
         while True:
             print("\n💬 You: ", end="")
@@ -67,6 +100,7 @@ async def run_marketing_agent_interactive():
                 session_id=session.id,
                 new_message=content,
             ):
+                print_delivered_outputs(event)
                 if event.content.parts and event.content.parts[0].text:
                     response_text = event.content.parts[0].text
             
@@ -126,23 +160,12 @@ async def run_single_request(user_input):
     print("🤖 Processing...\n")
     
     try:
-        # 使用默认的InMemoryRunner配置
-        runner = InMemoryRunner(agent=root_agent)
-        print(f"[DEBUG] Demo runner initialized with agent: {root_agent.name}")
-        
-        session = await runner.session_service.create_session(
-            app_name=runner.app_name, user_id="demo_user"
-        )
-        print(f"[DEBUG] Created demo session: {session.id}")
-        
+        # One-shot requests share the long-lived runner.
         content = UserContent(parts=[Part(text=user_input)])
         response_text = ""
         
-        async for event in runner.run_async(
-            user_id=session.user_id,
-            session_id=session.id,
-            new_message=content,
-        ):
+        async for event in runner_service.run(root_agent, content):
+            print_delivered_outputs(event)
             if event.content.parts and event.content.parts[0].text:
                 response_text = event.content.parts[0].text
         
@@ -155,8 +178,57 @@ async def run_single_request(user_input):
     except Exception as e:
         print(f"❌ Error: {e}")
 
-if __name__ == "__main__":
-    if len(sys.argv) > 1 and sys.argv[1] == '--interactive':
+def main():
+    parser = argparse.ArgumentParser(description="Marketing Agency AI runner")
+    parser.add_argument("--interactive", action="store_true")
+    parser.add_argument("--batch", type=Path, help="JSONL file of requests")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--out", type=Path, default=Path("results.jsonl"))
+    parser.add_argument(
+        "--artifacts-dir", type=Path, help="where to save generated files"
+    )
+    parser.add_argument(
+        "--trace",
+        type=Path,
+        default=os.getenv("TRACE_FILE"),
+        help="append OTLP/JSON spans to this file",
+    )
+    parser.add_argument("--verbose", action="store_true", help="debug logging")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.WARNING)
+    # Batch progress is reported at INFO.
+    logging.getLogger("marketing_agency.batch").setLevel(logging.INFO)
+    tracer_provider = None
+    if args.trace:
+        tracer_provider = setup_tracing(
+            str(args.trace.expanduser()),
+            keep_payloads=os.getenv("TRACE_KEEP_PAYLOADS", "0") == "1",
+        )
+
+    if args.batch:
+        counts = asyncio.run(
+            run_batch(
+                root_agent,
+                args.batch,
+                args.out,
+                concurrency=args.concurrency,
+                artifacts_dir=args.artifacts_dir,
+            )
+        )
+        print(
+            f"✅ {counts['ok']} done, {counts['error']} failed, "
+            f"{counts['skipped']} already in {args.out}"
+        )
+        if tracer_provider is not None:
+            tracer_provider.force_flush()
+            report = stage_report(list(read_spans(str(args.trace.expanduser()))))
+            print(format_report(report))
+    elif args.interactive:
         asyncio.run(run_marketing_agent_interactive())
     else:
-        run_sample_demo()
\ No newline at end of file
+        run_sample_demo()
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,149 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Shared fakes for the tests: a scripted model and a runner helper"""
+
+import asyncio
+from typing import Any, AsyncGenerator, NamedTuple, Optional, Union
+
+from google.adk.agents import BaseAgent, RunConfig
+from google.adk.events import Event
+from google.adk.models import BaseLlm, LlmRequest, LlmResponse
+from google.adk.runners import InMemoryRunner, Runner
+from google.adk.sessions import Session
+from google.genai.types import (
+    Content,
+    FunctionCall,
+    GenerateContentResponseUsageMetadata,
+    Part,
+    UserContent,
+)
+
+
+def _function_responses(contents: list[Content]) -> list[Any]:
+    return [
+        part.function_response
+        for content in contents
+        for part in content.parts or []
+        if part.function_response
+    ]
+
+
+def _is_user_text(content: Content) -> bool:
+    return content.role == "user" and any(part.text for part in content.parts or [])
+
+
+class ScriptedLlm(BaseLlm):
+    """Fake model that makes scripted tool calls, then answers.
+
+    For every user turn it makes the ``calls`` in order, as ``(name, args)``
+    pairs where ``args=None`` passes the user text as ``request``. Then it
+    answers with ``reply``, or with the last tool result if ``reply`` is None.
+    Each request is recorded (contents and config) in ``requests``.
+    """
+
+    reply: Optional[str] = "ok"
+    calls: list = []
+    delay: float = 0.0
+    fail: bool = False
+    usage: Optional[GenerateContentResponseUsageMetadata] = None
+    requests: list = []
+
+    @property
+    def tool_results(self) -> list[Any]:
+        """The tool results this model was answered with, in order."""
+        return [
+            response.response
+            for request in self.requests
+            for response in _function_responses(request.contents[-1:])
+        ]
+
+    def _next_part(self, contents: list[Content]) -> Part:
+        turn = len(contents)
+        while turn and not _is_user_text(contents[turn - 1]):
+            turn -= 1
+        user_text = contents[turn - 1].parts[0].text if turn else ""
+        results = _function_responses(contents[turn:])
+        if len(results) < len(self.calls):
+            name, args = self.calls[len(results)]
+            args = {"request": user_text} if args is None else args
+            return Part(function_call=FunctionCall(name=name, args=args))
+        if self.reply is None and results:
+            return Part(text=str(results[-1].response.get("result")))
+        return Part(text=self.reply or "")
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        self.requests.append(
+            LlmRequest(
+                contents=[c.model_copy(deep=True) for c in llm_request.contents],
+                config=llm_request.config.model_copy(deep=True),
+            )
+        )
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("503 overloaded")
+        part = self._next_part(llm_request.contents)
+        yield LlmResponse(
+            content=Content(role="model", parts=[part]), usage_metadata=self.usage
+        )
+
+
+class Run(NamedTuple):
+    events: list[Event]
+    text: str
+    session: Session
+    artifacts: list[str]
+
+
+async def run_agent(
+    agent: Union[BaseAgent, Runner],
+    text: str = "hi",
+    *,
+    session_id: Optional[str] = None,
+    user_id: str = "test_user",
+    state: Optional[dict[str, Any]] = None,
+    run_config: Optional[RunConfig] = None,
+) -> Run:
+    """Sends ``text`` to an agent (or runner) and collects the outcome.
+
+    ``text`` of the result is the last text any agent answered; the session is
+    re-read after the run. Pass ``session_id`` to continue a session.
+    """
+    runner = agent if isinstance(agent, Runner) else InMemoryRunner(agent=agent)
+    if session_id is None:
+        session = await runner.session_service.create_session(
+            app_name=runner.app_name, user_id=user_id, state=state
+        )
+        session_id = session.id
+    events = []
+    reply = ""
+    async for event in runner.run_async(
+        user_id=user_id,
+        session_id=session_id,
+        new_message=UserContent(parts=[Part(text=text)]),
+        run_config=run_config or RunConfig(),
+    ):
+        events.append(event)
+        if event.content and event.content.parts and event.content.parts[0].text:
+            reply = event.content.parts[0].text
+    session = await runner.session_service.get_session(
+        app_name=runner.app_name, user_id=user_id, session_id=session_id
+    )
+    artifacts = await runner.artifact_service.list_artifact_keys(
+        app_name=runner.app_name, user_id=user_id, session_id=session_id
+    )
+    return Run(events, reply, session, artifacts)
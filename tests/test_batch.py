@@ -0,0 +1,204 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test cases for the JSONL batch runner"""
+
+import asyncio
+import json
+from typing import AsyncGenerator
+
+import pytest
+from conftest import ScriptedLlm
+from google.adk.agents import LlmAgent
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.artifacts import InMemoryArtifactService
+from google.adk.models import BaseLlm, LlmRequest, LlmResponse
+from google.adk.runners import Runner
+from google.adk.sessions import InMemorySessionService
+from google.genai import types
+from marketing_agency.batch import run_batch, run_request
+from marketing_agency.shared_libraries.handoff import HandoffAgentTool
+
+pytest_plugins = ("pytest_asyncio",)
+
+
+class EchoLlm(BaseLlm):
+    """Echoes the request after a short delay and tracks concurrency."""
+
+    in_flight: int = 0
+    max_in_flight: int = 0
+    seen: list = []
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        text = llm_request.contents[-1].parts[0].text
+        self.seen.append(text)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.05)
+        self.in_flight -= 1
+        if text == "boom":
+            raise RuntimeError("model unavailable")
+        yield LlmResponse(
+            content=types.Content(role="model", parts=[types.Part(text=text.upper())]),
+            usage_metadata=types.GenerateContentResponseUsageMetadata(
+                prompt_token_count=10, candidates_token_count=2, total_token_count=12
+            ),
+        )
+
+
+async def _save_logo(callback_context: CallbackContext):
+    await callback_context.save_artifact(
+        "logo.png", types.Part.from_bytes(data=b"png", mime_type="image/png")
+    )
+
+
+def _agent() -> LlmAgent:
+    return LlmAgent(
+        name="echo_agent",
+        model=EchoLlm(model="fake"),
+        instruction="Echo.",
+        after_agent_callback=_save_logo,
+    )
+
+
+def _write_jsonl(path, records):
+    path.write_text("".join(json.dumps(record) + "\n" for record in records))
+
+
+def _read_jsonl(path):
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+@pytest.mark.asyncio
+async def test_batch_runs_requests_concurrently(tmp_path):
+    requests = tmp_path / "requests.jsonl"
+    _write_jsonl(
+        requests,
+        [{"id": f"r{i}", "request": f"brief {i}"} for i in range(6)]
+        + [{"request_id": "user-001", "title": "Logo", "body": "for Brew"}],
+    )
+    agent = _agent()
+
+    counts = await run_batch(
+        agent,
+        requests,
+        tmp_path / "results.jsonl",
+        concurrency=3,
+        artifacts_dir=tmp_path / "artifacts",
+    )
+
+    results = {r["id"]: r for r in _read_jsonl(tmp_path / "results.jsonl")}
+    assert counts == {"skipped": 0, "ok": 7, "error": 0}
+    assert agent.model.max_in_flight == 3
+    assert results["r4"]["response"] == "BRIEF 4"
+    assert results["user-001"]["response"] == "LOGO\n\nFOR BREW"
+    assert results["r0"]["tokens"] == {"prompt": 10, "candidates": 2, "total": 12}
+    assert results["r0"]["latency_s"] > 0
+    assert results["r0"]["artifacts"] == ["logo.png"]
+    assert (tmp_path / "artifacts" / "r0" / "logo.png").read_bytes() == b"png"
+
+
+@pytest.mark.asyncio
+async def test_batch_resumes_partial_output(tmp_path):
+    requests = tmp_path / "requests.jsonl"
+    _write_jsonl(
+        requests,
+        [
+            {"id": "done", "request": "done"},
+            {"id": "failed", "request": "failed"},
+            {"id": "torn", "request": "torn"},
+            {"id": "bad", "request": "boom"},
+        ],
+    )
+    results = tmp_path / "results.jsonl"
+    results.write_text(
+        json.dumps({"id": "done", "status": "ok", "response": "DONE"})
+        + "\n"
+        + json.dumps({"id": "failed", "status": "error", "error": "timeout"})
+        + '\n{"id": "torn", "status": "o'
+    )
+    agent = _agent()
+
+    counts = await run_batch(agent, requests, results, concurrency=2)
+
+    assert counts == {"skipped": 1, "ok": 2, "error": 1}
+    assert sorted(agent.model.seen) == ["boom", "failed", "torn"]
+    lines = results.read_text().splitlines()
+    assert lines[2] == '{"id": "torn", "status": "o'
+    finished = {r["id"]: r["status"] for r in map(json.loads, lines[3:])}
+    assert finished == {"failed": "ok", "torn": "ok", "bad": "error"}
+
+
+class FlakySessionService(InMemorySessionService):
+    """Fails to create the first session."""
+
+    failures = 1
+
+    async def create_session(self, **kwargs):
+        if self.failures:
+            self.failures -= 1
+            raise RuntimeError("database is locked")
+        return await super().create_session(**kwargs)
+
+
+@pytest.mark.asyncio
+async def test_session_errors_fail_only_their_request(tmp_path):
+    requests = tmp_path / "requests.jsonl"
+    _write_jsonl(requests, [{"id": "a", "request": "a"}, {"id": "b", "request": "b"}])
+    agent = _agent()
+    runner = Runner(
+        app_name="batch",
+        agent=agent,
+        session_service=FlakySessionService(),
+        artifact_service=InMemoryArtifactService(),
+    )
+
+    counts = await run_batch(
+        agent, requests, tmp_path / "results.jsonl", concurrency=1, runner=runner
+    )
+
+    assert counts == {"skipped": 0, "ok": 1, "error": 1}
+    results = _read_jsonl(tmp_path / "results.jsonl")
+    assert results[0]["error"] == "RuntimeError: database is locked"
+    assert results[1]["response"] == "B"
+
+
+@pytest.mark.asyncio
+async def test_requests_leave_no_artifacts_behind():
+    coordinator = LlmAgent(
+        name="coordinator",
+        model=ScriptedLlm(model="fake", calls=[("sub", None)], reply="done"),
+        tools=[
+            HandoffAgentTool(
+                agent=LlmAgent(
+                    name="sub",
+                    model=ScriptedLlm(model="fake"),
+                    after_agent_callback=_save_logo,
+                )
+            )
+        ],
+    )
+    runner = Runner(
+        app_name="batch",
+        agent=coordinator,
+        session_service=InMemorySessionService(),
+        artifact_service=InMemoryArtifactService(),
+    )
+
+    results = [await run_request(runner, f"r{i}", "logo") for i in range(5)]
+
+    assert [result["artifacts"] for result in results] == [["logo.png"]] * 5
+    assert runner.artifact_service.artifacts == {}
@@ -0,0 +1,71 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test cases for the brand package pipeline"""
+
+import time
+
+import pytest
+from conftest import ScriptedLlm, run_agent
+from google.adk.agents import LlmAgent
+from marketing_agency.sub_agents.brand_package.agent import (
+    create_brand_package_agent,
+)
+
+pytest_plugins = ("pytest_asyncio",)
+
+STAGE_DELAY = 0.5
+
+
+def _agent(name: str, reply: str, delay: float = 0.0) -> LlmAgent:
+    return LlmAgent(
+        name=name,
+        model=ScriptedLlm(model="fake", reply=reply, delay=delay),
+        instruction="fake",
+        output_key=f"{name}_output",
+    )
+
+
+@pytest.mark.asyncio
+async def test_brand_package_runs_asset_stages_concurrently():
+    """The three asset stages should overlap instead of running in sequence."""
+    package = create_brand_package_agent(
+        _agent("domain", "1. BrewBean.com\n2. beanbrew.net"),
+        [
+            _agent("website", "<html>site</html>", STAGE_DELAY),
+            _agent("marketing", "strategy", STAGE_DELAY),
+            _agent("logo", "logo saved", STAGE_DELAY),
+        ],
+    )
+    start = time.perf_counter()
+    run = await run_agent(package, "Coffee shop called Brew & Bean")
+    elapsed = time.perf_counter() - start
+
+    assert elapsed < 2 * STAGE_DELAY
+    assert run.session.state["selected_domain"] == "brewbean.com"
+    assert run.session.state["brand_package_output"] == run.text
+    for text in ("brewbean.com", "<html>site</html>", "strategy", "logo saved"):
+        assert text in run.text
+
+
+@pytest.mark.asyncio
+async def test_brand_package_stops_without_a_domain():
+    assets = [_agent("website", "<html>site</html>"), _agent("logo", "logo saved")]
+    package = create_brand_package_agent(
+        _agent("domain", "Sorry, I could not think of any names."), assets
+    )
+    run = await run_agent(package, "Coffee shop")
+
+    assert [event.author for event in run.events] == ["domain", "domain_select_agent"]
+    assert run.text.startswith("No domain could be selected")
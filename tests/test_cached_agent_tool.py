@@ -0,0 +1,198 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test cases for the memoizing AgentTool"""
+
+import pytest
+from conftest import ScriptedLlm, run_agent
+from google.adk.agents import LlmAgent
+from google.adk.agents.callback_context import CallbackContext
+from google.genai.types import Part
+from marketing_agency.shared_libraries.cache_backends import (
+    DiskCacheBackend,
+    LRUCacheBackend,
+)
+from marketing_agency.shared_libraries.cached_agent_tool import CachedAgentTool
+from marketing_agency.shared_libraries.semantic_cache import SemanticIndex
+
+pytest_plugins = ("pytest_asyncio",)
+
+
+async def _save_plan(callback_context: CallbackContext):
+    await callback_context.save_artifact(
+        "plan.txt", Part.from_bytes(data=b"plan", mime_type="text/plain")
+    )
+
+
+def _coordinator(tool: CachedAgentTool) -> LlmAgent:
+    return LlmAgent(
+        name="coordinator",
+        model=ScriptedLlm(model="fake", calls=[(tool.name, None)], reply=None),
+        instruction="fake",
+        tools=[tool],
+    )
+
+
+def _sub_agent(instruction: str = "Write a marketing plan") -> LlmAgent:
+    return LlmAgent(
+        name="marketing_create_agent",
+        model=ScriptedLlm(model="fake", reply="marketing plan"),
+        instruction=instruction,
+        output_key="marketing_create_output",
+        after_agent_callback=_save_plan,
+    )
+
+
+async def _ask(tool: CachedAgentTool, text: str):
+    run = await run_agent(_coordinator(tool), text)
+    return run.text, run.session.state, run.artifacts
+
+
+@pytest.mark.asyncio
+async def test_repeated_request_is_served_from_cache():
+    agent = _sub_agent()
+    tool = CachedAgentTool(agent=agent, backend=LRUCacheBackend())
+
+    first = await _ask(tool, "Marketing plan for Brew & Bean")
+    second = await _ask(tool, "  marketing plan for BREW & Bean!  ")
+
+    assert len(agent.model.requests) == 1
+    assert tool.stats() == {
+        "hits": 1,
+        "semantic_hits": 0,
+        "misses": 1,
+        "hit_rate": 0.5,
+    }
+    assert first == second
+    assert second[1]["marketing_create_output"] == "marketing plan"
+    assert second[2] == ["plan.txt"]
+
+
+@pytest.mark.asyncio
+async def test_reworded_request_is_served_from_semantic_cache():
+    agent = _sub_agent()
+    tool = CachedAgentTool(
+        agent=agent, backend=LRUCacheBackend(), semantic_index=SemanticIndex()
+    )
+
+    first = await _ask(
+        tool,
+        "Marketing strategy for Brew & Bean coffee shop in Zurich, "
+        "targeting students",
+    )
+    second = await _ask(
+        tool,
+        "Marketing strategy for the Brew and Bean coffee shop in Zürich "
+        "targeting students and remote workers",
+    )
+    await _ask(tool, "Marketing strategy for Alps Bike Tours in Davos")
+
+    assert first == second
+    assert len(agent.model.requests) == 2
+    assert tool.stats()["semantic_hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_zero_ttl_disables_caching():
+    agent = _sub_agent()
+    tool = CachedAgentTool(agent=agent, backend=LRUCacheBackend(), ttl=0)
+
+    await _ask(tool, "Marketing plan for Brew & Bean")
+    await _ask(tool, "Marketing plan for Brew & Bean")
+
+    assert tool.ttl == 0
+    assert len(agent.model.requests) == 2
+
+
+def _render_logo() -> dict:
+    """Renders the logo."""
+    return {"status": "failed", "error": "No images generated"}
+
+
+@pytest.mark.asyncio
+async def test_failed_runs_are_not_cached():
+    agent = LlmAgent(
+        name="logo_create_agent",
+        model=ScriptedLlm(
+            model="fake", calls=[("_render_logo", {})], reply="No logo this time"
+        ),
+        instruction="Create a logo",
+        tools=[_render_logo],
+    )
+    tool = CachedAgentTool(agent=agent, backend=LRUCacheBackend())
+
+    first = await _ask(tool, "Logo for Brew & Bean")
+    await _ask(tool, "Logo for Brew & Bean")
+
+    assert first[0] == "No logo this time"
+    assert tool.stats()["hits"] == 0
+    assert len(agent.model.tool_results) == 2
+
+
+@pytest.mark.asyncio
+async def test_prompt_change_invalidates_cache(tmp_path):
+    backend = DiskCacheBackend(tmp_path)
+    old = _sub_agent("Write a marketing plan")
+    await _ask(CachedAgentTool(agent=old, backend=backend), "Brew & Bean")
+    await _ask(CachedAgentTool(agent=old, backend=backend), "Brew & Bean")
+    assert len(old.model.requests) == 1
+
+    new = _sub_agent("Write a detailed marketing plan")
+    await _ask(CachedAgentTool(agent=new, backend=backend), "Brew & Bean")
+    assert len(new.model.requests) == 1
+    assert len(list((tmp_path / "marketing_create_agent").glob("*.json"))) == 1
+
+
+@pytest.mark.asyncio
+async def test_full_disk_namespace_keeps_its_prompt_version(tmp_path):
+    backend = DiskCacheBackend(tmp_path, max_entries=2)
+    agent = _sub_agent()
+    tool = CachedAgentTool(agent=agent, backend=backend)
+    for brand in ("Brew & Bean", "Alps Bike Tours", "Gourmet Garden"):
+        await _ask(tool, brand)
+    assert len(agent.model.requests) == 3
+
+    # A restarted process still finds the two newest results.
+    await _ask(CachedAgentTool(agent=agent, backend=backend), "Gourmet Garden")
+    assert len(agent.model.requests) == 3
+
+
+def test_lru_backend_expires_entries():
+    now = [0.0]
+    backend = LRUCacheBackend(max_entries=2, clock=lambda: now[0])
+    backend.set("a", "k1", 1, ttl=10)
+    backend.set("a", "k2", 2, ttl=100)
+    backend.set("a", "k3", 3, ttl=100)
+    assert backend.get("a", "k1") is None
+    now[0] = 50
+    assert backend.get("a", "k2") == 2
+    now[0] = 200
+    assert backend.get("a", "k3") is None
+
+
+def test_semantic_index_pins_domains_and_evicts():
+    index = SemanticIndex(max_entries=2)
+    index.add("brewbean", "Website for Brew & Bean, domain brewbean.com")
+    index.add("bakery", "Website for Zurich Artisan Bakery, zurichbakery.ch")
+
+    assert index.search("Website for the Brew & Bean, domain brewbean.com")[0] == (
+        "brewbean"
+    )
+    assert index.search("Website for Brew & Bean, domain brewandbean.com") is None
+
+    index.add("bikes", "Website for Alps Bike Tours, alpsbiketours.ch")
+    assert len(index) == 2
+    assert index.search("Website for Zurich Artisan Bakery, zurichbakery.ch") is None
+    index.discard("brewbean")
+    assert index.search("Website for Alps Bike Tours, alpsbiketours.ch")[0] == "bikes"
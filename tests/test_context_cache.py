@@ -0,0 +1,217 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test cases for context caching of agent instructions"""
+
+import asyncio
+from typing import AsyncGenerator, Optional
+
+import pytest
+from conftest import run_agent
+from google.adk.agents import LlmAgent
+from google.adk.agents.run_config import RunConfig, StreamingMode
+from google.adk.models import BaseLlm, LlmRequest, LlmResponse
+from google.genai import types
+from google.genai.types import Content, Part
+from marketing_agency.shared_libraries import context_cache
+from marketing_agency.shared_libraries.context_cache import (
+    ContextCache,
+    InMemoryContextCacheBackend,
+    estimate_tokens,
+)
+
+pytest_plugins = ("pytest_asyncio",)
+
+INSTRUCTION = "Write a detailed marketing strategy. " * 200
+
+
+class CachingLlm(BaseLlm):
+    """Fake model that resolves cached content like the Gemini API does."""
+
+    backend: Optional[InMemoryContextCacheBackend] = None
+    requests: list = []
+    fail: bool = False
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        config = llm_request.config
+        self.requests.append(config.model_copy())
+        if self.fail:
+            raise RuntimeError("503 overloaded")
+        cached_tokens = 0
+        instruction = config.system_instruction
+        if config.cached_content:
+            cached = self.backend.resolve(config.cached_content)
+            assert cached is not None, "expired or unknown cached content"
+            assert instruction is None and config.tools is None
+            instruction = cached.system_instruction
+            cached_tokens = estimate_tokens(str(instruction))
+        prompt_tokens = estimate_tokens(str(instruction)) + 10
+        if stream:
+            yield LlmResponse(
+                content=Content(role="model", parts=[Part(text="pl")]),
+                partial=True,
+            )
+        yield LlmResponse(
+            content=Content(role="model", parts=[Part(text="plan")]),
+            usage_metadata=types.GenerateContentResponseUsageMetadata(
+                prompt_token_count=prompt_tokens,
+                cached_content_token_count=cached_tokens,
+            ),
+        )
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _agent(cache: ContextCache, instruction: str = INSTRUCTION) -> LlmAgent:
+    return LlmAgent(
+        name="marketing_create_agent",
+        model=CachingLlm(model="fake-model", backend=cache.backend),
+        instruction=instruction,
+        before_model_callback=cache.before_model,
+        after_model_callback=cache.after_model,
+    )
+
+
+async def _run(
+    agent: LlmAgent, text: str = "Brew & Bean", streaming: bool = False
+) -> None:
+    mode = StreamingMode.SSE if streaming else StreamingMode.NONE
+    await run_agent(agent, text, run_config=RunConfig(streaming_mode=mode))
+
+
+@pytest.mark.asyncio
+async def test_instruction_is_cached_once_and_refreshed():
+    clock = Clock()
+    backend = InMemoryContextCacheBackend(clock=clock)
+    cache = ContextCache(backend, ttl=600, refresh_margin=60, clock=clock)
+    agent = _agent(cache)
+
+    await _run(agent)
+    await _run(agent, "Alps Bike Tours", streaming=True)
+    assert backend.creates == 1
+    assert all(config.cached_content for config in agent.model.requests)
+
+    clock.now += 580
+    await _run(agent)
+    assert (backend.creates, backend.refreshes) == (1, 1)
+
+    clock.now += 1000
+    await _run(agent)
+    assert backend.creates == 2
+
+    stats = cache.stats()["marketing_create_agent"]
+    assert stats["requests"] == stats["cached_requests"] == 4
+    assert stats["cached_tokens"] >= 4 * estimate_tokens(INSTRUCTION)
+    assert 0.9 < stats["token_savings"] < 1
+    # Only the streamed run shows when its first chunk arrived.
+    assert stats["prefill_samples"] == 1
+    assert stats["avg_prefill_seconds"] > 0
+
+
+@pytest.mark.asyncio
+async def test_short_instruction_is_sent_inline():
+    backend = InMemoryContextCacheBackend()
+    cache = ContextCache(backend)
+    agent = _agent(cache, instruction="Be brief.")
+
+    await _run(agent)
+
+    assert backend.creates == 0
+    assert agent.model.requests[0].cached_content is None
+    assert "Be brief." in agent.model.requests[0].system_instruction
+    assert cache.stats()["marketing_create_agent"]["cached_tokens"] == 0
+
+
+@pytest.mark.asyncio
+async def test_backend_failure_falls_back_to_inline_instruction():
+    class FailingBackend(InMemoryContextCacheBackend):
+        async def create(self, model, config):
+            self.creates += 1
+            raise RuntimeError("Cached content is too small")
+
+    clock = Clock()
+    backend = FailingBackend()
+    cache = ContextCache(backend, retry_backoff=60, clock=clock)
+    agent = _agent(cache)
+
+    await _run(agent)
+    await _run(agent)
+    assert backend.creates == 1
+    assert all(
+        config.system_instruction and not config.cached_content
+        for config in agent.model.requests
+    )
+
+    # Retried once the backoff has passed, then after twice as long.
+    clock.now += 61
+    await _run(agent)
+    assert backend.creates == 2
+    clock.now += 61
+    await _run(agent)
+    assert backend.creates == 2
+    clock.now += 60
+    await _run(agent)
+    assert backend.creates == 3
+
+
+def test_context_caching_is_off_by_default(monkeypatch):
+    monkeypatch.delenv("CONTEXT_CACHE_BACKEND", raising=False)
+    assert ContextCache.from_env().backend is None
+
+
+@pytest.mark.asyncio
+async def test_failed_model_call_does_not_leak_its_start_time(monkeypatch):
+    cache = ContextCache(InMemoryContextCacheBackend())
+    agent = _agent(cache)
+    agent.model.fail = True
+    with pytest.raises(RuntimeError):
+        await _run(agent)
+    assert len(cache._started) == 1
+
+    monkeypatch.setattr(context_cache, "_STARTED_MAX_AGE", -1.0)
+    agent.model.fail = False
+    await _run(agent)
+    assert not cache._started
+
+
+def test_cache_is_shared_across_event_loops():
+    class SlowBackend(InMemoryContextCacheBackend):
+        async def create(self, model, config):
+            await asyncio.sleep(0.01)
+            return await super().create(model, config)
+
+    clock = Clock()
+    backend = SlowBackend(clock=clock)
+    cache = ContextCache(backend, ttl=600, clock=clock)
+    agent = _agent(cache)
+
+    async def concurrent_requests() -> None:
+        await asyncio.gather(_run(agent), _run(agent, "Alps Bike Tours"))
+
+    for _ in range(2):
+        asyncio.run(concurrent_requests())
+        # Expired, so the next loop creates the cached content again.
+        clock.now += 1000
+
+    assert backend.creates == 2
+    # The expired cache name is no longer kept for ``inline``.
+    assert len(cache._inline) == 1
@@ -0,0 +1,321 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test cases for the domain_create tools"""
+
+import asyncio
+import importlib
+import textwrap
+import time
+
+import httpx
+import pytest
+from marketing_agency.sub_agents.domain_create import (
+    candidates,
+    index,
+    resolvers,
+    tools,
+)
+from marketing_agency.sub_agents.domain_create.verdict_cache import VerdictCache
+
+pytest_plugins = ("pytest_asyncio",)
+
+ZONE_FILE = textwrap.dedent(
+    """
+    $ORIGIN com.
+    $TTL 86400
+    @   IN  SOA ns.com. admin.com. (
+                2024010101 ; serial
+    7200 3600 ; refresh and retry, not indented
+                1209600 86400 )
+    ecotech     NS  ns1.example.net.
+                NS  ns2.example.net. ; same owner
+    greentech   IN  NS  ns1.example.net.
+    brewbean.io. NS ns1.example.net. ; absolute name
+    """
+)
+
+
+class SlowResolver(resolvers.DomainResolver):
+    """Every lookup takes the same time, like a remote RDAP query."""
+
+    delay = 0.2
+
+    async def check(self, domain):
+        await asyncio.sleep(self.delay)
+        return resolvers.TAKEN if "taken" in domain else resolvers.AVAILABLE
+
+
+@pytest.fixture(autouse=True)
+def verdict_cache(monkeypatch):
+    cache = VerdictCache()
+    monkeypatch.setattr(tools, "verdict_cache", cache)
+    return cache
+
+
+@pytest.fixture
+def zone_resolver(monkeypatch, tmp_path):
+    path = tmp_path / "com.zone"
+    path.write_text(ZONE_FILE)
+    resolver = resolvers.ZoneFileResolver(path)
+    monkeypatch.setattr(tools, "resolver", resolver)
+    return resolver
+
+
+def test_read_zone_file(zone_resolver):
+    assert zone_resolver.registered == {
+        "ecotech.com",
+        "greentech.com",
+        "brewbean.io",
+    }
+
+
+@pytest.mark.asyncio
+async def test_check_domains_groups_verdicts(zone_resolver):
+    result = await tools.check_domains(
+        ["EcoTech.com", "https://www.ecotechly.com/", "brewbean.io", "not a domain"]
+    )
+    assert result["available"] == ["ecotechly.com"]
+    assert result["taken"] == ["ecotech.com", "brewbean.io"]
+    assert result["invalid"] == ["not a domain"]
+
+
+@pytest.mark.asyncio
+async def test_check_domains_checks_batch_concurrently(monkeypatch):
+    monkeypatch.setattr(tools, "resolver", SlowResolver(concurrency=50))
+    candidates = [f"brand{i}.com" for i in range(40)] + ["taken.com"]
+
+    start = time.perf_counter()
+    result = await tools.check_domains(candidates)
+
+    assert time.perf_counter() - start < 3 * SlowResolver.delay
+    assert len(result["available"]) == 40
+    assert result["taken"] == ["taken.com"]
+
+
+def _rdap_transport(requests: list):
+    bootstrap = {
+        "services": [
+            [["com", "net"], ["http://rdap.example/", "https://rdap.example/"]],
+        ]
+    }
+    throttled = []
+
+    def handle(request: httpx.Request) -> httpx.Response:
+        requests.append(str(request.url))
+        if request.url.path == "/rdap/dns.json":
+            return httpx.Response(200, json=bootstrap)
+        domain = request.url.path.rsplit("/", 1)[-1]
+        if domain == "busy.com" and not throttled:
+            throttled.append(domain)
+            return httpx.Response(429, headers={"Retry-After": "0.1"})
+        status = 404 if domain.startswith("free") else 200
+        return httpx.Response(status, json={})
+
+    return httpx.MockTransport(handle)
+
+
+@pytest.mark.asyncio
+async def test_rdap_resolver_uses_the_iana_bootstrap():
+    requests = []
+    resolver = resolvers.RdapResolver(transport=_rdap_transport(requests))
+
+    verdicts = await resolver.check_batch(
+        ["freebrew.com", "taken.net", "busy.com", "freebrew.ch"]
+    )
+
+    assert verdicts == {
+        "freebrew.com": resolvers.AVAILABLE,
+        "taken.net": resolvers.TAKEN,
+        "busy.com": resolvers.TAKEN,
+        # .ch is not in the bootstrap data: no server to ask.
+        "freebrew.ch": resolvers.UNKNOWN,
+    }
+    assert "https://rdap.example/domain/freebrew.com" in requests
+    assert requests.count("https://rdap.example/domain/busy.com") == 2
+    assert not any("freebrew.ch" in url for url in requests)
+
+    await resolver.check_batch(["free.com"])
+    assert requests.count(resolvers.RDAP_BOOTSTRAP_URL) == 1
+
+
+def test_retry_after_seconds():
+    assert resolvers.retry_after_seconds("3") == 3.0
+    assert resolvers.retry_after_seconds("Thu, 01 Jan 1970 00:00:00 GMT") == 0.0
+    assert resolvers.retry_after_seconds("soon") is None
+    assert resolvers.retry_after_seconds(None) is None
+
+
+def test_tools_import_does_not_build_the_backends(monkeypatch):
+    monkeypatch.setenv("DOMAIN_RESOLVER", "carrier-pigeon")
+    monkeypatch.setenv("DOMAIN_INDEX_PATH", "/nonexistent/registered.idx")
+    reloaded = importlib.reload(tools)
+
+    assert reloaded.resolver is None
+    with pytest.raises(ValueError, match="carrier-pigeon"):
+        reloaded._get_resolver()
+
+
+def test_domain_index_lookup(tmp_path):
+    registered = [f"brand{i}.com" for i in range(1000)]
+    index_path = tmp_path / "registered.idx"
+    index.build_index(registered, index_path)
+
+    with index.DomainIndex(index_path) as domain_index:
+        assert len(domain_index) == 1000
+        assert all(domain in domain_index for domain in registered)
+        misses = [f"fresh{i}.com" for i in range(1000)]
+        false_positives = sum(domain in domain_index for domain in misses)
+        assert false_positives < 50
+        assert domain_index.bloom_rejections >= 950
+
+
+@pytest.mark.asyncio
+async def test_check_domains_skips_remote_for_indexed(monkeypatch, tmp_path):
+    index_path = tmp_path / "registered.idx"
+    index.build_index(["ecotech.com"], index_path)
+    slow = SlowResolver()
+    checked = []
+    original_check = slow.check
+
+    async def recording_check(domain):
+        checked.append(domain)
+        return await original_check(domain)
+
+    slow.check = recording_check
+    monkeypatch.setattr(tools, "resolver", slow)
+    monkeypatch.setattr(tools, "registered_index", index.DomainIndex(index_path))
+
+    result = await tools.check_domains(["ecotech.com", "ecotechly.com"])
+
+    assert result["taken"] == ["ecotech.com"]
+    assert result["available"] == ["ecotechly.com"]
+    assert checked == ["ecotechly.com"]
+
+
+@pytest.mark.asyncio
+async def test_check_domains_reuses_cached_verdicts(monkeypatch, verdict_cache):
+    monkeypatch.setattr(tools, "resolver", SlowResolver())
+    await tools.check_domains(["eco.com", "taken.com"])
+
+    start = time.perf_counter()
+    result = await tools.check_domains(["eco.com", "taken.com", "green.com"])
+
+    assert time.perf_counter() - start < 2 * SlowResolver.delay
+    assert result["available"] == ["eco.com", "green.com"]
+    assert verdict_cache.stats()["hits"] == 2
+    assert verdict_cache.stats()["misses"] == 3
+
+
+def test_verdict_cache_ttls(tmp_path):
+    now = [1000.0]
+    path = str(tmp_path / "verdicts.db")
+    cache = VerdictCache(
+        positive_ttl=100, negative_ttl=10, path=path, clock=lambda: now[0]
+    )
+    cache.put_many(
+        {
+            "taken.com": resolvers.TAKEN,
+            "free.com": resolvers.AVAILABLE,
+            "flaky.com": resolvers.UNKNOWN,
+        }
+    )
+    assert cache.get_many(["taken.com", "free.com", "flaky.com"]) == {
+        "taken.com": resolvers.TAKEN,
+        "free.com": resolvers.AVAILABLE,
+    }
+
+    now[0] += 50
+    assert cache.get_many(["taken.com", "free.com"]) == {
+        "taken.com": resolvers.TAKEN
+    }
+
+    restarted = VerdictCache(path=path, clock=lambda: now[0])
+    assert restarted.get_many(["taken.com"]) == {"taken.com": resolvers.TAKEN}
+
+
+def test_verdict_cache_deletes_expired_rows(tmp_path):
+    now = [1000.0]
+    path = str(tmp_path / "verdicts.db")
+    cache = VerdictCache(
+        positive_ttl=100, negative_ttl=10, path=path, clock=lambda: now[0]
+    )
+    cache.put_many({"taken.com": resolvers.TAKEN, "free.com": resolvers.AVAILABLE})
+
+    def stored(cache):
+        rows = cache._db.execute("SELECT domain FROM verdicts").fetchall()
+        return sorted(domain for (domain,) in rows)
+
+    now[0] += 50
+    cache.put_many({"new.com": resolvers.TAKEN})
+    assert stored(cache) == ["new.com", "taken.com"]
+
+    now[0] += 60
+    restarted = VerdictCache(path=path, clock=lambda: now[0])
+    assert stored(restarted) == ["new.com"]
+
+
+def test_verdict_cache_is_bounded():
+    now = [1000.0]
+    cache = VerdictCache(negative_ttl=10, max_entries=2, clock=lambda: now[0])
+    cache.put_many({"a.com": resolvers.TAKEN, "b.com": resolvers.AVAILABLE})
+    assert cache.get_many(["a.com"]) == {"a.com": resolvers.TAKEN}
+    cache.put_many({"c.com": resolvers.TAKEN})
+    # b.com was the least recently used.
+    assert cache.get_many(["a.com", "b.com", "c.com"]) == {
+        "a.com": resolvers.TAKEN,
+        "c.com": resolvers.TAKEN,
+    }
+
+    cache.put_many({"b.com": resolvers.AVAILABLE})
+    now[0] += 50
+    assert cache.get_many(["b.com"]) == {}
+    assert cache.stats()["entries"] == 1
+
+
+def test_suggest_domains_ranks_generated_candidates():
+    result = tools.suggest_domains(["eco", "tech", "green"], top_k=20)
+
+    assert result["considered"] > 1000
+    assert len(result["candidates"]) == 20
+    assert len(set(result["candidates"])) == 20
+    assert all(tools.normalize_domain(d) == d for d in result["candidates"])
+    assert result["candidates"][0].endswith(".com")
+
+
+def test_suggest_domains_without_usable_labels():
+    assert tools.suggest_domains(["internationalizationservices"]) == {
+        "status": "success",
+        "candidates": [],
+        "considered": 0,
+    }
+
+
+def test_normalize_keywords_folds_accents_and_drops_tlds():
+    assert candidates.normalize_keywords(["Café Nest", "ecotech.com"]) == [
+        "cafe",
+        "nest",
+        "ecotech",
+    ]
+
+
+def test_score_labels_prefers_pronounceable_short_names():
+    keywords = ["brew", "bean"]
+    labels = ["brewbean", "xqzbrewbeanxqzkw", "brewbeanstudioworks", "coffee"]
+    scores = candidates.score_labels(labels, keywords)
+
+    assert scores[0] == scores.max()
+    assert scores[0] > scores[1]
+    assert scores[0] > scores[2]
+    assert scores[0] > scores[3]
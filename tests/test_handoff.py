@@ -0,0 +1,100 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test cases for handing state to sub-agents instead of re-typed text"""
+
+import pytest
+from conftest import ScriptedLlm, run_agent
+from google.adk.agents import LlmAgent
+from google.adk.tools.base_tool import BaseTool
+from marketing_agency.shared_libraries.cache_backends import LRUCacheBackend
+from marketing_agency.shared_libraries.cached_agent_tool import CachedAgentTool
+from marketing_agency.shared_libraries.handoff import (
+    BRIEF_KEY,
+    SELECTED_DOMAIN_KEY,
+    expand_references,
+    save_brief,
+)
+
+pytest_plugins = ("pytest_asyncio",)
+
+
+def _brief_call(brief: str, domain: str) -> tuple[str, dict]:
+    return ("save_brief", {"brief": brief, "selected_domain": domain})
+
+
+async def _run(tool: BaseTool, calls: list, state: dict = None) -> None:
+    coordinator = LlmAgent(
+        name="marketing_coordinator",
+        model=ScriptedLlm(model="fake", calls=calls, reply="done"),
+        tools=[save_brief, tool],
+    )
+    await run_agent(coordinator, "go", state=state)
+
+
+def _website_tool(model: ScriptedLlm) -> CachedAgentTool:
+    return CachedAgentTool(
+        agent=LlmAgent(name="website_create_agent", model=model),
+        backend=LRUCacheBackend(),
+        handoff_keys=(BRIEF_KEY, SELECTED_DOMAIN_KEY),
+    )
+
+
+def test_expand_references():
+    state = {"domain_create_output": "1. a.com", "user:lang": "de"}
+    assert expand_references("{domain_create_output} / {user:lang}", state) == (
+        "1. a.com / de"
+    )
+    assert expand_references("[{missing?}]", state) == "[]"
+    assert expand_references("{missing} body { color: red; }", state) == (
+        "{missing} body { color: red; }"
+    )
+
+
+@pytest.mark.asyncio
+async def test_sub_agent_gets_brief_and_domain_from_state():
+    model = ScriptedLlm(model="fake", reply="site")
+    await _run(
+        _website_tool(model),
+        [
+            _brief_call("Gourmet Garden, organic farm-to-table", "GourmetGarden.com"),
+            (
+                "website_create_agent",
+                {"request": "Create the website. Options were: {domain_list?}"},
+            ),
+        ],
+        state={"domain_list": "gourmetgarden.com, eatgarden.com"},
+    )
+
+    [request] = [request.contents[-1].parts[0].text for request in model.requests]
+    assert request.startswith(
+        "Create the website. Options were: gourmetgarden.com, eatgarden.com"
+    )
+    assert "[brand_brief]\nGourmet Garden, organic farm-to-table" in request
+    assert "[selected_domain]\ngourmetgarden.com" in request
+
+
+@pytest.mark.asyncio
+async def test_cache_key_includes_the_handed_off_state():
+    model = ScriptedLlm(model="fake", reply="site")
+    tool = _website_tool(model)
+    website = ("website_create_agent", {"request": "Create the website."})
+
+    await _run(tool, [_brief_call("Brew & Bean coffee", "brewbean.com"), website])
+    await _run(tool, [_brief_call("Alps Bike Tours", "alpsbike.ch"), website])
+    await _run(tool, [_brief_call("Alps Bike Tours", "alpsbike.ch"), website])
+
+    assert tool.stats()["misses"] == 2
+    assert tool.stats()["hits"] == 1
+    assert len(model.requests) == 2
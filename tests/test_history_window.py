@@ -0,0 +1,91 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test cases for the coordinator history window"""
+
+import pytest
+from conftest import ScriptedLlm, run_agent
+from google.adk.agents import LlmAgent
+from google.adk.runners import InMemoryRunner
+from google.adk.tools.agent_tool import AgentTool
+from google.genai.types import Content
+from marketing_agency.shared_libraries.history_window import (
+    HistoryWindow,
+    content_tokens,
+)
+
+pytest_plugins = ("pytest_asyncio",)
+
+WEBSITE = "<html>" + "<p>Fresh bread daily.</p>" * 400 + "</html>"
+
+
+def _responses(contents: list[Content]) -> list[str]:
+    return [
+        part.function_response.response["result"]
+        for content in contents
+        for part in content.parts
+        if part.function_response
+    ]
+
+
+@pytest.mark.asyncio
+async def test_older_tool_results_are_replaced_by_excerpts():
+    window = HistoryWindow(
+        keep_turns=2,
+        max_chars=500,
+        excerpt_chars=50,
+        state_keys={"website_create_agent": "website_create_output"},
+    )
+    model = ScriptedLlm(
+        model="fake",
+        calls=[("website_create_agent", None)],
+        reply="Here is your website.",
+    )
+    website_agent = LlmAgent(
+        name="website_create_agent",
+        model=ScriptedLlm(model="fake", reply=WEBSITE),
+        output_key="website_create_output",
+    )
+    coordinator = LlmAgent(
+        name="marketing_coordinator",
+        model=model,
+        before_model_callback=window,
+        tools=[AgentTool(agent=website_agent)],
+    )
+    runner = InMemoryRunner(agent=coordinator)
+    session = await runner.session_service.create_session(
+        app_name=runner.app_name, user_id="test_user"
+    )
+    for turn in range(4):
+        await run_agent(runner, f"website v{turn}", session_id=session.id)
+
+    last_prompt = model.requests[-1].contents
+    results = _responses(last_prompt)
+    assert len(results) == 4
+    for old in results[:2]:
+        assert old.startswith(WEBSITE[:50])
+        assert "state key 'website_create_output'" in old
+    assert results[2:] == [WEBSITE, WEBSITE]
+
+    stats = window.stats()
+    assert stats["requests"] == 8
+    assert stats["tokens_after"] < stats["tokens_before"]
+    assert stats["recent"][-1]["after"] == content_tokens(last_prompt)
+    assert stats["recent"][-1]["before"] >= len(WEBSITE)
+
+    # The session keeps the full results.
+    stored = await runner.session_service.get_session(
+        app_name=runner.app_name, user_id="test_user", session_id=session.id
+    )
+    assert _responses([event.content for event in stored.events]) == [WEBSITE] * 4
@@ -0,0 +1,64 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Import side effects of the package"""
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Prints the names of the loaded modules once the imports in ``code`` ran.
+_REPORT = "\nimport json, sys\nprint(json.dumps(sorted(sys.modules)))\n"
+
+
+def _modules_after(code: str) -> set[str]:
+    # No credentials or project settings, as on a fresh CI worker.
+    env = {"PATH": os.environ.get("PATH", ""), "PYTHONPATH": str(ROOT)}
+    result = subprocess.run(
+        [sys.executable, "-c", code + _REPORT],
+        capture_output=True,
+        text=True,
+        env=env,
+        cwd=ROOT,
+        check=False,
+    )
+    assert result.returncode == 0, result.stderr[-2000:]
+    return set(json.loads(result.stdout.splitlines()[-1]))
+
+
+def test_package_import_does_not_load_adk_or_the_agents():
+    modules = _modules_after(
+        "import marketing_agency\n"
+        "import marketing_agency.sub_agents.logo_create.cache\n"
+    )
+
+    assert not {m for m in modules if m.startswith(("google.adk", "google.genai"))}
+    assert not {m for m in modules if m.split(".")[-1] == "agent"}
+
+
+def test_agents_build_offline_without_clients():
+    modules = _modules_after(
+        "from marketing_agency import root_agent\n"
+        "from marketing_agency.sub_agents.domain_create import tools\n"
+        "from marketing_agency.sub_agents.logo_create import agent as logo\n"
+        "assert root_agent.name == 'marketing_coordinator'\n"
+        "assert logo.client is None\n"
+        "assert tools.resolver is None and tools.verdict_cache is None\n"
+    )
+
+    assert "marketing_agency.agent" in modules
@@ -0,0 +1,250 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test cases for the logo_create tools"""
+
+import asyncio
+import io
+import os
+import time
+from types import SimpleNamespace
+
+import pytest
+from marketing_agency.sub_agents.logo_create import agent as logo_agent
+from marketing_agency.sub_agents.logo_create import derivatives
+from marketing_agency.sub_agents.logo_create.cache import ImageCache
+
+pytest_plugins = ("pytest_asyncio",)
+
+RENDER_DELAY = 0.5
+
+
+class FakeModels:
+    """Stands in for ``client.models`` / ``client.aio.models``."""
+
+    def __init__(self, image_bytes=b"\x89PNG fake"):
+        self.image_bytes = image_bytes
+        self.calls = []
+
+    def _response(self, config):
+        count = config.get("number_of_images", 1)
+        return SimpleNamespace(
+            generated_images=[
+                SimpleNamespace(
+                    image=SimpleNamespace(image_bytes=self.image_bytes + bytes([i]))
+                )
+                for i in range(count)
+            ]
+        )
+
+    def generate_images(self, model, prompt, config):
+        # The blocking client: if the tool used it, the event loop would stall.
+        self.calls.append((model, prompt, config))
+        time.sleep(RENDER_DELAY)
+        return self._response(config)
+
+
+class FakeAsyncModels(FakeModels):
+
+    async def generate_images(self, model, prompt, config):
+        self.calls.append((model, prompt, config))
+        await asyncio.sleep(RENDER_DELAY)
+        return self._response(config)
+
+
+class FakeToolContext:
+    """Minimal async artifact API of ``ToolContext``."""
+
+    def __init__(self):
+        self.artifacts = {}
+
+    async def save_artifact(self, filename, artifact):
+        self.artifacts[filename] = artifact
+        return 0
+
+    async def list_artifacts(self):
+        return list(self.artifacts)
+
+
+@pytest.fixture
+def image_cache(monkeypatch, tmp_path):
+    cache = ImageCache(tmp_path / "logos")
+    monkeypatch.setattr(logo_agent, "image_cache", cache)
+    return cache
+
+
+@pytest.fixture
+def fake_client(monkeypatch, image_cache):
+    client = SimpleNamespace(models=FakeModels(), aio=SimpleNamespace())
+    client.aio.models = FakeAsyncModels()
+    monkeypatch.setattr(logo_agent, "client", client)
+    return client
+
+
+@pytest.mark.asyncio
+async def test_generate_image_does_not_block_event_loop(fake_client):
+    """Other sessions keep making progress while an image renders."""
+    ticks = []
+
+    async def other_session():
+        start = time.perf_counter()
+        while time.perf_counter() - start < RENDER_DELAY:
+            ticks.append(time.perf_counter())
+            await asyncio.sleep(0.01)
+
+    tool_context = FakeToolContext()
+    result, _ = await asyncio.gather(
+        logo_agent.generate_image("a coffee bean logo", tool_context),
+        other_session(),
+    )
+
+    assert result["status"] == "success"
+    assert result["filenames"] == list(tool_context.artifacts)
+    assert not fake_client.models.calls
+    # With a blocking call the other session would only tick once.
+    assert len(ticks) > 10
+    assert max(b - a for a, b in zip(ticks, ticks[1:])) < RENDER_DELAY / 2
+
+
+@pytest.mark.asyncio
+async def test_generate_image_variants_in_one_call(fake_client):
+    """All variants come from one Imagen call and get distinct names."""
+    tool_context = FakeToolContext()
+    result = await logo_agent.generate_image(
+        "a coffee bean logo", tool_context, number_of_variants=3
+    )
+
+    assert result["status"] == "success"
+    assert len(fake_client.aio.models.calls) == 1
+    assert fake_client.aio.models.calls[0][2] == {"number_of_images": 3}
+    assert len(set(result["filenames"])) == 3
+    assert sorted(result["filenames"]) == sorted(tool_context.artifacts)
+    assert all(name.startswith("logo-") for name in result["filenames"])
+
+    again = await logo_agent.generate_image(
+        "a coffee bean logo", tool_context, number_of_variants=1
+    )
+    assert again["filenames"][0] == result["filenames"][0]
+
+
+@pytest.mark.asyncio
+async def test_generate_image_served_from_cache(fake_client, image_cache):
+    """A repeated prompt is answered from disk without calling Imagen."""
+    first = await logo_agent.generate_image("a coffee bean logo", FakeToolContext())
+    tool_context = FakeToolContext()
+    start = time.perf_counter()
+    second = await logo_agent.generate_image("a coffee bean logo", tool_context)
+
+    assert time.perf_counter() - start < RENDER_DELAY / 5
+    assert len(fake_client.aio.models.calls) == 1
+    assert second["cache_hit"] and not first["cache_hit"]
+    assert second["filenames"] == first["filenames"] == list(tool_context.artifacts)
+    assert image_cache.stats()["hits"] == 1
+
+    bypass = await logo_agent.generate_image(
+        "a coffee bean logo", FakeToolContext(), use_cache=False
+    )
+    assert not bypass["cache_hit"]
+    assert len(fake_client.aio.models.calls) == 2
+
+
+def test_request_slots_work_across_event_loops(fake_client):
+    # More requests than slots, so some of them wait on the semaphore.
+    count = logo_agent.MAX_CONCURRENT_IMAGE_REQUESTS + 1
+
+    async def logos():
+        return await asyncio.gather(
+            *(
+                logo_agent.generate_image(
+                    f"logo {i}", FakeToolContext(), use_cache=False
+                )
+                for i in range(count)
+            )
+        )
+
+    for _ in range(2):
+        results = asyncio.run(logos())
+        assert [result["status"] for result in results] == ["success"] * count
+
+
+def test_image_cache_evicts_least_recently_used(tmp_path):
+    cache = ImageCache(tmp_path, max_bytes=250)
+    cache.put("a", [b"a" * 100])
+    cache.put("b", [b"b" * 100])
+    # Explicit mtimes, so the order does not depend on timestamp resolution.
+    os.utime(tmp_path / "a", (100, 100))
+    os.utime(tmp_path / "b", (200, 200))
+    assert cache.get("a") == [b"a" * 100]
+    cache.put("c", [b"c" * 100])
+
+    assert cache.get("b") is None
+    assert cache.get("a") and cache.get("c")
+    assert cache.stats()["evictions"] == 1
+
+
+@pytest.mark.asyncio
+async def test_cache_failure_does_not_fail_generation(fake_client, monkeypatch):
+    def broken_put(key, images):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(logo_agent.image_cache, "put", broken_put)
+    result = await logo_agent.generate_image("a coffee bean logo", FakeToolContext())
+
+    assert result["status"] == "success"
+    assert len(result["filenames"]) == 1
+
+
+def test_image_cache_disabled(tmp_path):
+    cache = ImageCache(tmp_path, enabled=False)
+    cache.put("a", [b"a"])
+    assert cache.get("a") is None
+    assert not any(tmp_path.iterdir())
+
+
+def _png(size=1024):
+    image_module = pytest.importorskip("PIL.Image")
+    buffer = io.BytesIO()
+    image_module.new("RGBA", (size, size), (200, 120, 40, 255)).save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+def test_render_derivatives_sizes():
+    image_module = pytest.importorskip("PIL.Image")
+    outputs = derivatives.render_derivatives(_png())
+
+    assert set(outputs) == set(derivatives.DERIVATIVES)
+    for suffix, (size, image_format) in derivatives.DERIVATIVES.items():
+        data, mime_type = outputs[suffix]
+        rendered = image_module.open(io.BytesIO(data))
+        assert rendered.format == image_format
+        assert mime_type == derivatives.MIME_TYPES[image_format]
+        if size:
+            assert rendered.size == (size, size)
+
+
+@pytest.mark.asyncio
+async def test_generate_image_saves_derivatives_once(fake_client):
+    fake_client.aio.models.image_bytes = _png(256)
+    tool_context = FakeToolContext()
+    result = await logo_agent.generate_image(
+        "a coffee bean logo", tool_context, number_of_variants=2
+    )
+
+    assert len(fake_client.aio.models.calls) == 1
+    for image in result["images"]:
+        stem = image["filename"].removesuffix(".png")
+        assert image["derivatives"] == [
+            f"{stem}-{suffix}" for suffix in derivatives.DERIVATIVES
+        ]
+        assert all(name in tool_context.artifacts for name in image["derivatives"])
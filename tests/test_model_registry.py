@@ -0,0 +1,131 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test cases for the model registry and the Flash/Pro router"""
+
+import pytest
+from conftest import ScriptedLlm
+from google.adk.models import BaseLlm, LlmRequest
+from google.genai import types
+from marketing_agency.shared_libraries import model_registry
+from marketing_agency.shared_libraries.context_cache import (
+    ContextCache,
+    InMemoryContextCacheBackend,
+)
+from marketing_agency.shared_libraries.model_registry import RoutedLlm, model_for
+
+pytest_plugins = ("pytest_asyncio",)
+
+
+def _request(text: str, instruction: str = "Be helpful.") -> LlmRequest:
+    return LlmRequest(
+        model="flash",
+        contents=[types.UserContent(parts=[types.Part(text=text)])],
+        config=types.GenerateContentConfig(system_instruction=instruction),
+    )
+
+
+async def _generate(model: BaseLlm, llm_request: LlmRequest) -> list[str]:
+    return [
+        response.content.parts[0].text
+        async for response in model.generate_content_async(llm_request)
+    ]
+
+
+def test_model_for_reads_tiers_and_overrides(monkeypatch):
+    monkeypatch.setenv("MODEL_TIER_PRO", "gemini-2.5-pro")
+    assert model_for("website_create_agent") == "gemini-2.5-pro"
+    assert model_for("domain_create_agent") == model_registry.DEFAULT_MODELS["flash"]
+    assert isinstance(model_for("marketing_create_agent"), RoutedLlm)
+
+    monkeypatch.setenv("DOMAIN_CREATE_AGENT_MODEL", "pro")
+    monkeypatch.setenv("WEBSITE_CREATE_AGENT_MODEL", "gemini-2.0-flash")
+    assert model_for("domain_create_agent") == "gemini-2.5-pro"
+    assert model_for("website_create_agent") == "gemini-2.0-flash"
+
+
+@pytest.mark.asyncio
+async def test_router_sends_simple_requests_to_fast_model():
+    fast = ScriptedLlm(model="flash", reply="fast")
+    strong = ScriptedLlm(model="pro", reply="strong")
+    router = RoutedLlm(model="flash", fast=fast, strong=strong)
+
+    assert await _generate(router, _request("Brew & Bean, a coffee shop")) == [
+        "fast"
+    ]
+    assert await _generate(
+        router, _request("A detailed marketing plan with a budget split")
+    ) == ["strong"]
+    assert router.stats() == {"fast": 1, "strong": 1}
+
+
+def _after_tool_call(text: str) -> LlmRequest:
+    llm_request = _request(text)
+    llm_request.contents += [
+        types.ModelContent(
+            parts=[
+                types.Part.from_function_call(name="google_search", args={"q": text})
+            ]
+        ),
+        types.UserContent(
+            parts=[
+                types.Part.from_function_response(
+                    name="google_search", response={"result": "x" * 5000}
+                )
+            ]
+        ),
+    ]
+    return llm_request
+
+
+def test_tool_responses_are_routed_by_the_user_request():
+    assert model_registry.is_simple_request(_after_tool_call("Brew & Bean"))
+    assert not model_registry.is_simple_request(
+        _after_tool_call("A detailed marketing plan for Brew & Bean")
+    )
+
+
+@pytest.mark.asyncio
+async def test_router_escalates_on_error_and_empty_answer():
+    strong = ScriptedLlm(model="pro", reply="strong")
+    failing = RoutedLlm(
+        model="flash", fast=ScriptedLlm(model="flash", fail=True), strong=strong
+    )
+    empty = RoutedLlm(
+        model="flash", fast=ScriptedLlm(model="flash", reply=" "), strong=strong
+    )
+
+    assert await _generate(failing, _request("Brew & Bean")) == ["strong"]
+    assert await _generate(empty, _request("Brew & Bean")) == ["strong"]
+    assert failing.stats() == empty.stats() == {"fast": 1, "escalated": 1}
+
+
+@pytest.mark.asyncio
+async def test_escalation_sends_cached_instruction_inline():
+    cache = ContextCache(InMemoryContextCacheBackend(), min_tokens=0)
+    strong = ScriptedLlm(model="pro", reply="strong")
+    router = RoutedLlm(
+        model="flash",
+        fast=ScriptedLlm(model="flash", fail=True),
+        strong=strong,
+        context_cache=cache,
+    )
+    llm_request = _request("Brew & Bean", instruction="Write a marketing plan.")
+    llm_request.config.cached_content = await cache.handle_for(llm_request)
+    llm_request.config.system_instruction = None
+
+    await _generate(router, llm_request)
+
+    assert strong.requests[0].config.cached_content is None
+    assert strong.requests[0].config.system_instruction == "Write a marketing plan."
@@ -0,0 +1,98 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test cases for passing large sub-agent results through to the client"""
+
+import pytest
+from conftest import ScriptedLlm, run_agent
+from google.adk.agents import LlmAgent
+from google.adk.tools.base_tool import BaseTool
+from marketing_agency.shared_libraries.cache_backends import LRUCacheBackend
+from marketing_agency.shared_libraries.cached_agent_tool import CachedAgentTool
+from marketing_agency.shared_libraries.pass_through import (
+    PassThroughAgentTool,
+    delivered_outputs,
+)
+
+pytest_plugins = ("pytest_asyncio",)
+
+WEBSITE = "<html>" + "<section>Gourmet Garden</section>" * 300 + "</html>"
+
+
+def _coordinator(tool: BaseTool) -> tuple[LlmAgent, ScriptedLlm]:
+    model = ScriptedLlm(
+        model="fake", calls=[(tool.name, None)], reply="Your website is ready."
+    )
+    return LlmAgent(name="marketing_coordinator", model=model, tools=[tool]), model
+
+
+def _website_agent(reply: str = WEBSITE) -> LlmAgent:
+    return LlmAgent(
+        name="website_create_agent",
+        model=ScriptedLlm(model="fake", reply=reply),
+        output_key="website_create_output",
+    )
+
+
+async def _run(agent: LlmAgent, text: str = "Gourmet Garden"):
+    run = await run_agent(agent, text)
+    return run.events, run.artifacts
+
+
+@pytest.mark.asyncio
+async def test_large_result_reaches_client_but_not_model():
+    coordinator, model = _coordinator(
+        PassThroughAgentTool(agent=_website_agent(), min_chars=1000)
+    )
+    events, artifacts = await _run(coordinator)
+
+    [reference] = model.tool_results
+    assert reference["pass_through"] is True
+    assert reference["characters"] == len(WEBSITE)
+    assert reference["artifacts"] == ["website_create_output.md"]
+    assert reference["state_key"] == "website_create_output"
+    assert reference["excerpt"] == WEBSITE[:200]
+    assert "website_create_output.md" in artifacts
+
+    delivered = {}
+    for event in events:
+        delivered.update(delivered_outputs(event))
+    assert delivered == {"website_create_output": WEBSITE}
+
+
+@pytest.mark.asyncio
+async def test_small_result_is_returned_as_is():
+    coordinator, model = _coordinator(
+        PassThroughAgentTool(agent=_website_agent("short"), min_chars=1000)
+    )
+    _, artifacts = await _run(coordinator)
+
+    assert model.tool_results == [{"result": "short"}]
+    assert artifacts == []
+
+
+@pytest.mark.asyncio
+async def test_cached_tool_replays_the_reference_and_artifact():
+    tool = CachedAgentTool(
+        agent=_website_agent(), backend=LRUCacheBackend(), pass_through_chars=1000
+    )
+    coordinator, model = _coordinator(tool)
+    await _run(coordinator)
+    events, artifacts = await _run(coordinator)
+
+    assert tool.stats()["hits"] == 1
+    assert model.tool_results[0] == model.tool_results[1]
+    assert model.tool_results[1]["pass_through"] is True
+    assert "website_create_output.md" in artifacts
+    assert any(delivered_outputs(event) for event in events)
@@ -0,0 +1,76 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test cases for the shared runner service"""
+
+import pytest
+from conftest import ScriptedLlm
+from google.adk.agents import LlmAgent
+from google.adk.agents.callback_context import CallbackContext
+from google.genai import types
+from marketing_agency.runner_service import RunnerService
+
+pytest_plugins = ("pytest_asyncio",)
+
+
+async def _save_draft(callback_context: CallbackContext):
+    drafts = callback_context.state.get("user:drafts", 0) + 1
+    callback_context.state["user:drafts"] = drafts
+    callback_context.state["draft"] = f"v{drafts}"
+    await callback_context.save_artifact(
+        "draft.txt", types.Part.from_bytes(data=b"v1", mime_type="text/plain")
+    )
+
+
+def _agent() -> LlmAgent:
+    return LlmAgent(
+        name="history_agent",
+        model=ScriptedLlm(model="fake"),
+        instruction="Answer.",
+        after_agent_callback=_save_draft,
+    )
+
+
+async def _ask(service: RunnerService, agent: LlmAgent, text: str) -> list:
+    return [
+        event
+        async for event in service.run(
+            agent, types.UserContent(parts=[types.Part(text=text)])
+        )
+    ]
+
+
+@pytest.mark.asyncio
+async def test_requests_share_the_runner_but_nothing_else():
+    service = RunnerService()
+    agent = _agent()
+    runner = service.runner_for(agent)
+
+    first = await _ask(service, agent, "first")
+    second = await _ask(service, agent, "second")
+
+    assert service.runner_for(agent) is runner
+    # Neither request saw the other one's history or user state.
+    assert [len(request.contents) for request in agent.model.requests] == [1, 1]
+    drafts = [
+        event.actions.state_delta["draft"]
+        for event in first + second
+        if "draft" in event.actions.state_delta
+    ]
+    assert drafts == ["v1", "v1"]
+
+    # Sessions and artifacts are deleted after each request.
+    assert runner.session_service.sessions[runner.app_name] == {}
+    assert not runner.session_service.user_state[runner.app_name]
+    assert not runner.artifact_service.artifacts
@@ -0,0 +1,222 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test cases for the HTTP/SSE server and its admission control"""
+
+import asyncio
+import json
+from typing import AsyncGenerator
+
+import httpx
+import pytest
+from google.adk.agents import LlmAgent
+from google.adk.models import BaseLlm, LlmRequest, LlmResponse
+from google.genai import types
+from marketing_agency.server import AdmissionController, create_app
+
+pytest_plugins = ("pytest_asyncio",)
+
+gate = {"open": None}
+
+
+class GatedLlm(BaseLlm):
+    """Answers once the test opens the gate."""
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        if gate["open"] is not None:
+            await gate["open"].wait()
+        yield LlmResponse(
+            content=types.Content(role="model", parts=[types.Part(text="done")])
+        )
+
+
+def _client(admission: AdmissionController) -> httpx.AsyncClient:
+    agent = LlmAgent(name="gated_agent", model=GatedLlm(model="fake"))
+    app = create_app(agent, admission=admission)
+    return httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://test"
+    )
+
+
+def _post(client: httpx.AsyncClient, user_id: str):
+    return client.post("/run_sse", json={"user_id": user_id, "message": "hi"})
+
+
+async def _until(condition) -> None:
+    for _ in range(200):
+        if condition():
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError("condition not reached")
+
+
+@pytest.fixture
+def closed_gate():
+    gate["open"] = asyncio.Event()
+    yield gate["open"]
+    gate["open"].set()
+    gate["open"] = None
+
+
+@pytest.mark.asyncio
+async def test_run_sse_streams_events():
+    async with _client(AdmissionController()) as client:
+        response = await _post(client, "alice")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    assert response.headers["x-session-id"]
+    events = [
+        json.loads(line[len("data: "):])
+        for line in response.text.splitlines()
+        if line.startswith("data: ")
+    ]
+    assert events[-1]["content"]["parts"][0]["text"] == "done"
+
+
+@pytest.mark.asyncio
+async def test_unknown_session_is_404():
+    async with _client(AdmissionController()) as client:
+        response = await client.post(
+            "/run_sse",
+            json={"user_id": "alice", "session_id": "missing", "message": "hi"},
+        )
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_full_queue_is_rejected_with_retry_after(closed_gate):
+    admission = AdmissionController(max_concurrency=1, per_user=1, queue_size=1)
+    async with _client(admission) as client:
+        running = asyncio.create_task(_post(client, "alice"))
+        await _until(lambda: admission.in_flight == 1)
+        waiting = asyncio.create_task(_post(client, "bob"))
+        await _until(lambda: admission.queued == 1)
+
+        rejected = await _post(client, "carol")
+        assert rejected.status_code == 429
+        assert int(rejected.headers["retry-after"]) >= 1
+
+        closed_gate.set()
+        assert (await running).status_code == 200
+        assert (await waiting).status_code == 200
+    assert admission.stats()["in_flight"] == 0
+
+
+@pytest.mark.asyncio
+async def test_per_user_cap_does_not_block_other_users(closed_gate):
+    admission = AdmissionController(max_concurrency=4, per_user=1, queue_size=4)
+    async with _client(admission) as client:
+        first = asyncio.create_task(_post(client, "alice"))
+        await _until(lambda: admission.in_flight == 1)
+        second = asyncio.create_task(_post(client, "alice"))
+        await _until(lambda: admission.queued == 1)
+        other = asyncio.create_task(_post(client, "bob"))
+        await _until(lambda: admission.in_flight == 2)
+        assert admission.queued == 1
+
+        closed_gate.set()
+        responses = await asyncio.gather(first, second, other)
+    assert [response.status_code for response in responses] == [200, 200, 200]
+
+
+@pytest.mark.asyncio
+async def test_queue_timeout_is_rejected(closed_gate):
+    admission = AdmissionController(
+        max_concurrency=1, per_user=1, queue_size=1, queue_timeout=0.05
+    )
+    async with _client(admission) as client:
+        running = asyncio.create_task(_post(client, "alice"))
+        await _until(lambda: admission.in_flight == 1)
+        assert (await _post(client, "bob")).status_code == 429
+        closed_gate.set()
+        await running
+
+
+@pytest.mark.asyncio
+async def test_drain_waits_for_runs_and_rejects_new_ones(closed_gate):
+    admission = AdmissionController()
+    async with _client(admission) as client:
+        running = asyncio.create_task(_post(client, "alice"))
+        await _until(lambda: admission.in_flight == 1)
+        drain = asyncio.create_task(admission.drain(timeout=5))
+        await _until(lambda: admission.draining)
+
+        assert (await _post(client, "bob")).status_code == 503
+        assert (await client.get("/healthz")).status_code == 503
+        assert not drain.done()
+
+        closed_gate.set()
+        assert await drain
+        assert (await running).status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_disconnect_before_the_stream_starts_releases_the_slot():
+    admission = AdmissionController()
+    agent = LlmAgent(name="gated_agent", model=GatedLlm(model="fake"))
+    app = create_app(agent, admission=admission)
+    body = json.dumps({"user_id": "alice", "message": "hi"}).encode()
+    messages = [{"type": "http.request", "body": body, "more_body": False}]
+    started = asyncio.Event()
+
+    async def receive():
+        if messages:
+            return messages.pop(0)
+        # The client goes away while the response headers are being sent.
+        await started.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            started.set()
+            await asyncio.sleep(10)
+
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "POST",
+        "scheme": "http",
+        "path": "/run_sse",
+        "raw_path": b"/run_sse",
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"content-type", b"application/json")],
+        "client": ("test", 1),
+        "server": ("test", 80),
+    }
+    await asyncio.wait_for(app(scope, receive, send), 5)
+
+    assert admission.in_flight == 0
+    assert await admission.drain(timeout=1)
+
+
+def test_queued_requests_work_on_every_event_loop():
+    # Built outside any loop, as main() does before uvicorn starts.
+    admission = AdmissionController(max_concurrency=1, queue_timeout=5)
+
+    async def queue_one() -> None:
+        await admission.acquire("a")
+        waiter = asyncio.create_task(admission.acquire("b"))
+        await _until(lambda: admission.queued == 1)
+        await admission.release("a", 0.1)
+        await waiter
+        await admission.release("b", 0.1)
+
+    for _ in range(2):
+        asyncio.run(queue_one())
+    assert admission.stats()["in_flight"] == 0
@@ -0,0 +1,196 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test cases for the SQLite session service"""
+
+import asyncio
+import sqlite3
+
+import pytest
+from conftest import ScriptedLlm
+from google.adk.agents import LlmAgent
+from google.adk.artifacts import InMemoryArtifactService
+from google.adk.events import Event, EventActions
+from google.adk.runners import Runner
+from google.adk.sessions.base_session_service import GetSessionConfig
+from google.genai import types
+from marketing_agency.runner_service import one_shot_session
+from marketing_agency.sqlite_session_service import (
+    SNAPSHOT_AUTHOR,
+    SqliteSessionService,
+)
+
+pytest_plugins = ("pytest_asyncio",)
+
+APP = "app"
+USER = "user"
+
+
+def _event(author: str, text: str, **state_delta) -> Event:
+    return Event(
+        invocation_id="inv",
+        author=author,
+        content=types.Content(
+            role="user" if author == "user" else "model",
+            parts=[types.Part(text=text)],
+        ),
+        actions=EventActions(state_delta=state_delta),
+    )
+
+
+@pytest.mark.asyncio
+async def test_sessions_survive_a_restart(tmp_path):
+    path = str(tmp_path / "sessions.db")
+    service = SqliteSessionService(path, batch_size=100, flush_interval=60)
+    session = await service.create_session(
+        app_name=APP, user_id=USER, state={"user:lang": "en"}
+    )
+    await service.append_event(session, _event("user", "hi"))
+    await service.append_event(
+        session,
+        _event("agent", "hello", domain_create_output="a.com", **{"app:n": 1}),
+    )
+    service.close()
+
+    reopened = SqliteSessionService(path)
+    loaded = await reopened.get_session(
+        app_name=APP, user_id=USER, session_id=session.id
+    )
+    assert [event.content.parts[0].text for event in loaded.events] == [
+        "hi",
+        "hello",
+    ]
+    assert loaded.state == {
+        "domain_create_output": "a.com",
+        "app:n": 1,
+        "user:lang": "en",
+    }
+    listed = await reopened.list_sessions(app_name=APP, user_id=USER)
+    assert [s.id for s in listed.sessions] == [session.id]
+
+    await reopened.delete_session(app_name=APP, user_id=USER, session_id=session.id)
+    assert not await reopened.get_session(
+        app_name=APP, user_id=USER, session_id=session.id
+    )
+
+
+@pytest.mark.asyncio
+async def test_recent_events_window_is_read_from_the_database(tmp_path):
+    service = SqliteSessionService(str(tmp_path / "sessions.db"))
+    session = await service.create_session(app_name=APP, user_id=USER)
+    for i in range(5):
+        await service.append_event(session, _event("user", f"m{i}"))
+
+    loaded = await service.get_session(
+        app_name=APP,
+        user_id=USER,
+        session_id=session.id,
+        config=GetSessionConfig(num_recent_events=2),
+    )
+    assert [event.content.parts[0].text for event in loaded.events] == [
+        "m3",
+        "m4",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_old_turns_are_compacted_into_a_snapshot(tmp_path):
+    service = SqliteSessionService(
+        str(tmp_path / "sessions.db"), compact_after=3, keep_turns=1
+    )
+    session = await service.create_session(app_name=APP, user_id=USER)
+    await service.append_event(session, _event("user", "domains please"))
+    await service.append_event(
+        session, _event("agent", "a.com", domain_create_output="a.com")
+    )
+    await service.append_event(session, _event("user", "website please"))
+    await service.append_event(
+        session, _event("agent", "<html>", website_create_output="<html>")
+    )
+    await service.append_event(session, _event("user", "and a logo"))
+
+    loaded = await service.get_session(
+        app_name=APP, user_id=USER, session_id=session.id
+    )
+    assert service.compactions == 1
+    assert [event.author for event in loaded.events] == [
+        SNAPSHOT_AUTHOR,
+        "user",
+        "agent",
+        "user",
+    ]
+    snapshot = loaded.events[0].content.parts[0].text
+    assert "[domain_create_output]\na.com" in snapshot
+    assert "[website_create_output]\n<html>" in snapshot
+    assert loaded.state["website_create_output"] == "<html>"
+
+
+@pytest.mark.asyncio
+async def test_idle_writes_are_flushed_by_the_timer(tmp_path):
+    path = str(tmp_path / "sessions.db")
+    service = SqliteSessionService(path, batch_size=100, flush_interval=0.05)
+    session = await service.create_session(app_name=APP, user_id=USER)
+    await service.append_event(session, _event("user", "hi"))
+
+    await asyncio.sleep(0.3)
+    with sqlite3.connect(path) as reader:
+        assert reader.execute("SELECT COUNT(*) FROM events").fetchone() == (1,)
+
+
+@pytest.mark.asyncio
+async def test_short_sessions_are_not_rescanned_every_turn(tmp_path):
+    service = SqliteSessionService(
+        str(tmp_path / "sessions.db"), compact_after=4, keep_turns=1
+    )
+    compactions = []
+    compact = service.compact
+    service.compact = lambda *key, **kwargs: compactions.append(key) or compact(
+        *key, **kwargs
+    )
+    session = await service.create_session(app_name=APP, user_id=USER)
+    for i in range(6):
+        await service.append_event(session, _event("user", f"q{i}"))
+        await service.append_event(session, _event("agent", f"a{i}"))
+
+    # Only turns that start on more than four events read the event list.
+    assert len(compactions) == 2
+    assert service.compactions == 2
+
+
+@pytest.mark.asyncio
+async def test_runner_and_one_shot_sessions_on_sqlite(tmp_path):
+    service = SqliteSessionService(str(tmp_path / "sessions.db"))
+    model = ScriptedLlm(model="fake")
+    runner = Runner(
+        app_name=APP,
+        agent=LlmAgent(name="history_agent", model=model),
+        session_service=service,
+        artifact_service=InMemoryArtifactService(),
+    )
+
+    for _ in range(2):
+        async with one_shot_session(runner) as session:
+            replies = [
+                event.content.parts[0].text
+                async for event in runner.run_async(
+                    user_id=session.user_id,
+                    session_id=session.id,
+                    new_message=types.UserContent(parts=[types.Part(text="hi")]),
+                )
+            ]
+            assert replies == ["ok"]
+            assert len(model.requests[-1].contents) == 1
+
+    listed = await service.list_sessions(app_name=APP, user_id=session.user_id)
+    assert listed.sessions == []
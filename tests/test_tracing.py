@@ -0,0 +1,158 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test cases for span export and the per-stage report"""
+
+import json
+
+import pytest
+from conftest import ScriptedLlm, run_agent
+from google.adk.agents import LlmAgent
+from google.adk.runners import InMemoryRunner
+from google.genai.types import GenerateContentResponseUsageMetadata
+from marketing_agency.shared_libraries.cache_backends import LRUCacheBackend
+from marketing_agency.shared_libraries.cached_agent_tool import CachedAgentTool
+from marketing_agency.tracing import (
+    JsonFileSpanExporter,
+    format_report,
+    read_spans,
+    stage_report,
+)
+from opentelemetry import trace
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+
+pytest_plugins = ("pytest_asyncio",)
+
+
+def _usage(prompt: int, output: int, cached: int = 0):
+    return GenerateContentResponseUsageMetadata(
+        prompt_token_count=prompt,
+        candidates_token_count=output,
+        cached_content_token_count=cached,
+    )
+
+
+def _tracer_provider() -> TracerProvider:
+    """The process-wide SDK provider; it can only be set once."""
+    provider = trace.get_tracer_provider()
+    if not isinstance(provider, TracerProvider):
+        provider = TracerProvider()
+        trace.set_tracer_provider(provider)
+    return provider
+
+
+def _span(name: str, millis: int, parent: str = "", **attributes) -> dict:
+    span = {
+        "name": name,
+        "startTimeUnixNano": "0",
+        "endTimeUnixNano": str(millis * 1_000_000),
+        "attributes": attributes,
+    }
+    if parent:
+        span["parentSpanId"] = parent
+    return span
+
+
+@pytest.mark.asyncio
+async def test_agent_run_is_exported_as_otlp_json(tmp_path):
+    path = str(tmp_path / "spans.jsonl")
+    _tracer_provider().add_span_processor(
+        SimpleSpanProcessor(JsonFileSpanExporter(path))
+    )
+    tool = CachedAgentTool(
+        agent=LlmAgent(
+            name="website_create_agent",
+            model=ScriptedLlm(
+                model="fake", reply="<html></html>", usage=_usage(120, 40)
+            ),
+        ),
+        backend=LRUCacheBackend(),
+    )
+    coordinator = LlmAgent(
+        name="marketing_coordinator",
+        model=ScriptedLlm(
+            model="fake",
+            calls=[("website_create_agent", {"request": "site"})],
+            reply="Your website is ready.",
+            usage=_usage(1000, 10, cached=800),
+        ),
+        tools=[tool],
+    )
+    runner = InMemoryRunner(agent=coordinator)
+    for _ in range(2):
+        await run_agent(runner, "Gourmet Garden")
+
+    with open(path, encoding="utf-8") as trace_file:
+        request = json.loads(trace_file.readline())
+    assert request["resourceSpans"][0]["scopeSpans"][0]["spans"][0]["traceId"]
+
+    spans = list(read_spans(path))
+    llm_calls = [span for span in spans if span["name"] == "call_llm"]
+    assert all(
+        "gcp.vertex.agent.llm_request" not in span["attributes"] for span in spans
+    )
+    website_call = next(
+        span
+        for span in llm_calls
+        if span["attributes"].get("gen_ai.agent.name") == "website_create_agent"
+    )
+    assert website_call["attributes"]["gen_ai.usage.input_tokens"] == 120
+    assert website_call["attributes"]["gen_ai.usage.output_tokens"] == 40
+    tool_calls = [
+        span for span in spans if span["name"] == "execute_tool website_create_agent"
+    ]
+    hits = [span["attributes"]["marketing_agency.cache.hit"] for span in tool_calls]
+    assert hits == [False, True]
+
+    report = {row["stage"]: row for row in stage_report(spans)}
+    assert report["call_llm [marketing_coordinator]"]["count"] == 4
+    assert report["call_llm [marketing_coordinator]"]["cached_tokens"] == 3200
+    assert report["call_llm [website_create_agent]"]["count"] == 1
+    assert report["execute_tool website_create_agent"]["cache_hits"] == 1
+    # The nested runner of the cache miss is not a top-level run.
+    assert report["invocation"]["count"] == 2
+    assert report["invocation"]["share"] == pytest.approx(1.0)
+    assert report["invocation [sub-agent]"]["count"] == 1
+    assert report["invocation [sub-agent]"]["share"] < 1.0
+
+
+def test_stage_report_percentiles():
+    spans = [_span("invocation", 1000), _span("invocation", 300, parent="a")]
+    spans += [
+        _span(
+            "call_llm", millis, parent="b", **{"gen_ai.agent.name": "logo_create_agent"}
+        )
+        for millis in range(10, 201, 10)
+    ]
+    spans.append(
+        _span(
+            "imagen.generate_images",
+            600,
+            parent="c",
+            **{"marketing_agency.artifact.bytes": 5},
+        )
+    )
+
+    report = {row["stage"]: row for row in stage_report(spans)}
+    llm = report["call_llm [logo_create_agent]"]
+    assert llm["count"] == 20
+    assert llm["p50_ms"] == pytest.approx(100)
+    assert llm["p95_ms"] == pytest.approx(190)
+    assert llm["share"] == pytest.approx(2.1)
+    assert report["invocation"]["count"] == 1
+    assert report["invocation"]["p95_ms"] == pytest.approx(1000)
+    assert report["invocation [sub-agent]"]["share"] == pytest.approx(0.3)
+    assert report["imagen.generate_images"]["artifact_bytes"] == 5
+    assert "call_llm [logo_create_agent]" in format_report(list(report.values()))
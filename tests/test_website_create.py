@@ -0,0 +1,332 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test cases for the website_create output handling"""
+
+import gzip
+import hashlib
+import json
+import pathlib
+from typing import AsyncGenerator
+
+import pytest
+from conftest import ScriptedLlm, run_agent
+from google.adk.agents import LlmAgent, RunConfig
+from google.adk.agents.run_config import StreamingMode
+from google.adk.artifacts import InMemoryArtifactService
+from google.adk.models import BaseLlm, LlmRequest, LlmResponse
+from google.adk.runners import Runner
+from google.adk.sessions import InMemorySessionService
+from google.genai.types import Content, Part
+from marketing_agency.shared_libraries.cache_backends import LRUCacheBackend
+from marketing_agency.shared_libraries.cached_agent_tool import CachedAgentTool
+from marketing_agency.sub_agents.website_create import optimizer
+from marketing_agency.sub_agents.website_create.streaming import (
+    WebsiteArtifactWriter,
+    WebsiteFileSplitter,
+)
+
+pytest_plugins = ("pytest_asyncio",)
+
+SITE = """Here is your website.
+
+### index.html
+```html
+<!DOCTYPE html>
+<html><body><h1>Brew &amp; Bean</h1></body></html>
+```
+
+**style.css**
+```css
+body { margin: 0; }
+```
+
+File: script.js
+```javascript
+console.log("hi");
+```
+
+Replace the placeholders with your content.
+"""
+
+EXPECTED = {
+    "index.html": (
+        "<!DOCTYPE html>\n<html><body><h1>Brew &amp; Bean</h1></body></html>\n"
+    ),
+    "style.css": "body { margin: 0; }\n",
+    "script.js": 'console.log("hi");\n',
+}
+
+
+def _split(chunks):
+    files = {}
+    splitter = WebsiteFileSplitter(lambda name, content: files.update({name: content}))
+    for chunk in chunks:
+        splitter.feed(chunk)
+    splitter.close()
+    return files
+
+
+@pytest.mark.parametrize("size", [1, 7, 64, len(SITE)])
+def test_splitter_handles_any_chunking(size):
+    chunks = [SITE[i : i + size] for i in range(0, len(SITE), size)]
+    assert _split(chunks) == EXPECTED
+
+
+def test_splitter_keeps_truncated_file():
+    assert _split(["### index.html\n```html\n<html>\n<body>"]) == {
+        "index.html": "<html>\n<body>\n"
+    }
+
+
+class StreamingFakeLlm(BaseLlm):
+    """Streams a fixed text in chunks and records what it emitted."""
+
+    text: str
+    chunk_size: int = 40
+    log: list = []
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        if stream:
+            for i in range(0, len(self.text), self.chunk_size):
+                self.log.append(("chunk", i))
+                yield LlmResponse(
+                    content=Content(
+                        role="model",
+                        parts=[Part(text=self.text[i : i + self.chunk_size])],
+                    ),
+                    partial=True,
+                )
+        yield LlmResponse(content=Content(role="model", parts=[Part(text=self.text)]))
+
+
+class RecordingArtifactService(InMemoryArtifactService):
+
+    log: list = []
+
+    async def save_artifact(self, *, filename, **kwargs):
+        self.log.append(("save", filename))
+        return await super().save_artifact(filename=filename, **kwargs)
+
+
+async def _run(streaming_mode):
+    model = StreamingFakeLlm(model="fake", text=SITE)
+    agent = LlmAgent(
+        name="website_create_agent",
+        model=model,
+        instruction="fake",
+        output_key="website_create_output",
+        after_model_callback=WebsiteArtifactWriter(),
+    )
+    artifacts = RecordingArtifactService()
+    log = artifacts.log = model.log
+    runner = Runner(
+        app_name="test",
+        agent=agent,
+        artifact_service=artifacts,
+        session_service=InMemorySessionService(),
+    )
+    run = await run_agent(
+        runner,
+        "Brew & Bean website",
+        run_config=RunConfig(streaming_mode=streaming_mode),
+    )
+    session = run.session
+
+    async def load(name):
+        part = await artifacts.load_artifact(
+            app_name="test", user_id="test_user", session_id=session.id, filename=name
+        )
+        return part.inline_data.data
+
+    assert session.state["website_build_report"]
+    saved = {}
+    for name in session.state["website_files"]:
+        saved[name.removeprefix("website/")] = (await load(name)).decode()
+        assert gzip.decompress(await load(name + ".gz")) == await load(name)
+    manifest = json.loads(await load(session.state["website_manifest"]))
+    return saved, manifest, log
+
+
+@pytest.mark.asyncio
+async def test_streamed_files_are_saved_before_generation_ends():
+    saved, _, log = await _run(StreamingMode.SSE)
+
+    assert saved == EXPECTED
+    first_save = log.index(("save", "website/index.html"))
+    last_chunk = max(i for i, entry in enumerate(log) if entry[0] == "chunk")
+    assert first_save < last_chunk
+    saves = [name for kind, name in log if kind == "save"]
+    source_saves = [
+        name for name in saves if "/dist/" not in name and not name.endswith(".gz")
+    ]
+    assert source_saves == [
+        f"website/{name}" for name in EXPECTED
+    ] + ["website/manifest.json"]
+
+
+@pytest.mark.asyncio
+async def test_coordinator_tool_streams_the_website():
+    model = StreamingFakeLlm(model="fake", text=SITE, log=[])
+    writer = WebsiteArtifactWriter()
+    website = LlmAgent(
+        name="website_create_agent",
+        model=model,
+        instruction="fake",
+        output_key="website_create_output",
+        after_model_callback=writer,
+        after_agent_callback=writer.after_agent,
+    )
+    coordinator = LlmAgent(
+        name="marketing_coordinator",
+        model=ScriptedLlm(
+            model="fake",
+            calls=[("website_create_agent", {"request": "site"})],
+            reply="Your website is ready.",
+        ),
+        tools=[
+            CachedAgentTool(
+                agent=website,
+                backend=LRUCacheBackend(),
+                run_config=RunConfig(streaming_mode=StreamingMode.SSE),
+            )
+        ],
+    )
+    artifacts = RecordingArtifactService()
+    log = artifacts.log = model.log
+    runner = Runner(
+        app_name="test",
+        agent=coordinator,
+        artifact_service=artifacts,
+        session_service=InMemorySessionService(),
+    )
+    await run_agent(runner, "Brew & Bean website")
+
+    assert any(kind == "chunk" for kind, _ in log)
+    first_save = log.index(("save", "website/index.html"))
+    last_chunk = max(i for i, entry in enumerate(log) if entry[0] == "chunk")
+    assert first_save < last_chunk
+    assert writer._splitters == {}
+
+
+@pytest.mark.asyncio
+async def test_non_streamed_files_are_saved():
+    saved, _, _ = await _run(StreamingMode.NONE)
+    assert saved == EXPECTED
+
+
+@pytest.mark.asyncio
+async def test_manifest_describes_every_file():
+    _, manifest, _ = await _run(StreamingMode.NONE)
+
+    assert [entry["path"] for entry in manifest["files"]] == list(EXPECTED)
+    for entry in manifest["files"]:
+        content = EXPECTED[entry["path"]].encode()
+        assert entry["size"] == len(content)
+        assert entry["sha256"] == hashlib.sha256(content).hexdigest()
+        assert entry["gzip_artifact"] == entry["artifact"] + ".gz"
+    assert manifest["total_size"] == sum(len(c) for c in EXPECTED.values())
+    assert manifest["files"][0]["mime_type"] == "text/html"
+
+
+DEMO_SITE = {
+    path.name: path.read_text(encoding="utf-8")
+    for path in (pathlib.Path(__file__).parent.parent / "demo_html").iterdir()
+}
+
+
+def test_optimize_site_minifies_and_hashes_assets():
+    result = optimizer.optimize_site(DEMO_SITE)
+    report = {entry["path"]: entry for entry in result["report"]}
+
+    css_name = report["style.css"]["output"]
+    js_name = report["script.js"]["output"]
+    assert css_name.startswith("style.") and css_name != "style.css"
+    assert js_name.startswith("script.") and js_name != "script.js"
+    assert report["style.css"]["saved_bytes"] > 3000
+    assert report["script.js"]["saved_bytes"] > 500
+    for page in ("index.html", "about.html", "contact.html", "gallery.html"):
+        html = result["files"][page]
+        assert f'href="{css_name}"' in html
+        assert 'rel="stylesheet" href="style.css"' not in html
+        assert "<!--" not in html
+        # Minification alone must shrink the page; growth is only inlined CSS.
+        assert (
+            report[page]["optimized_size"] - report[page]["inlined_css_size"]
+            < report[page]["original_size"]
+        )
+
+
+def test_critical_css_keeps_only_above_the_fold_rules():
+    css = (
+        ".hero { color: red; }\n.footer-note { color: blue; }\n"
+        "@media (max-width: 600px) { .hero { color: green; } .modal { x: y; } }"
+    )
+    html = (
+        '<html><head></head><body><section class="hero">Hi</section>'
+        '<footer class="footer-note"></footer></body></html>'
+    )
+    assert optimizer.critical_css(css, html) == (
+        ".hero{color:red}@media (max-width: 600px){.hero{color:green}}"
+    )
+
+
+def test_minify_js_keeps_strings():
+    js = 'var url = "http://example.com"; // comment\n  /* block */ f();\n'
+    assert optimizer.minify_js(js) == 'var url = "http://example.com";\nf();'
+
+
+def test_minify_js_keeps_template_literals():
+    js = "const html = `\n  <li>\n    ${item.name}  // not a comment\n  </li>`;\n"
+    assert optimizer.minify_js(js) == js.strip()
+
+
+def test_minify_js_keeps_regex_literals():
+    js = (
+        "if (/https?:\\/\\//.test(url)) {\n"
+        "  parts = url.split(/[/ ]+/); // comment\n"
+        "  half = total / 2 / count;\n"
+        "}\n"
+    )
+    assert optimizer.minify_js(js) == (
+        "if(/https?:\\/\\//.test(url)){\n"
+        "parts = url.split(/[/ ]+/);\n"
+        "half = total / 2 / count;\n"
+        "}"
+    )
+
+
+def test_minify_css_keeps_quoted_values():
+    css = (
+        'body > p::before { content: "a ,  b > c"; }\n'
+        ".hero { background: url( img/a.png ), url('img/b c.png'); }"
+    )
+    assert optimizer.minify_css(css) == (
+        'body>p::before{content:"a ,  b > c"}'
+        ".hero{background:url( img/a.png ),url('img/b c.png')}"
+    )
+
+
+def test_above_the_fold_ends_after_the_header():
+    html = "<body><header>Top</header><main>" + "x" * 5000
+    assert optimizer._above_the_fold(html) == "<body><header>Top</header>"
+
+
+@pytest.mark.asyncio
+async def test_optimize_site_async_matches_sync():
+    assert await optimizer.optimize_site_async(DEMO_SITE) == optimizer.optimize_site(
+        DEMO_SITE
+    )
@@ -11,8 +11,8 @@
 
 import asyncio
 import textwrap
-from google.adk.runners import InMemoryRunner
 from marketing_agency.agent import root_agent
+from marketing_agency.runner_service import runner_service
 from google.genai.types import Part, UserContent
 import dotenv
 
@@ -46,22 +46,13 @@ async def 运行营销代理演示():
     print("=" * 60)
     
     try:
-        runner = InMemoryRunner(agent=root_agent)
-        session = await runner.session_service.create_session(
-            app_name=runner.app_name, user_id="中文演示用户"
-        )
-        
         content = UserContent(parts=[Part(text=用户输入)])
         响应文本 = ""
         
         print("🤖 营销代理正在处理您的请求...")
         print("⏳ 这可能需要几分钟时间...\n")
         
-        async for event in runner.run_async(
-            user_id=session.user_id,
-            session_id=session.id,
-            new_message=content,
-        ):
+        async for event in runner_service.run(root_agent, content):
             if event.content.parts and event.content.parts[0].text:
                 响应文本 = event.content.parts[0].text
                 print(f"📝 收到响应片段: {len(响应文本)} 字符")
@@ -98,19 +89,10 @@ async def 测试简单域名请求():
     print("=" * 40)
     
     try:
-        runner = InMemoryRunner(agent=root_agent)
-        session = await runner.session_service.create_session(
-            app_name=runner.app_name, user_id="域名测试用户"
-        )
-        
         content = UserContent(parts=[Part(text=用户输入)])
         响应文本 = ""
         
-        async for event in runner.run_async(
-            user_id=session.user_id,
-            session_id=session.id,
-            new_message=content,
-        ):
+        async for event in runner_service.run(root_agent, content):
             if event.content.parts and event.content.parts[0].text:
                 响应文本 = event.content.parts[0].text
         